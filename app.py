@@ -17,8 +17,13 @@ try:
     from dash import Dash, html, dcc, callback, Output, Input, State, no_update
     import dash_bootstrap_components as dbc
     from openai import OpenAI
+    import httpx
     from databricks.sdk import WorkspaceClient
+    from databricks.sdk.config import Config
     import mlflow
+    import orjson
+    import plotly.io as pio
+    from flask.json.provider import DefaultJSONProvider
     print("✅ Core dependencies imported")
     
     print("📦 Importing dashboard modules...")
@@ -75,6 +80,26 @@ app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 
 # Suppress callback exceptions for dynamically generated components
 app.config.suppress_callback_exceptions = True
+
+# Dash serializes callback responses through plotly's JSON encoder - pin it to orjson, and
+# use orjson for the plain Flask routes (e.g. the AI progress stream) as well.
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (types orjson can't handle use the default provider)"""
+    
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+pio.json.config.default_engine = 'orjson'
+app.server.json_provider_class = OrjsonProvider
+app.server.json = OrjsonProvider(app.server)
+print("✅ orjson JSON encoding enabled")
 print("✅ Dash app created with Databricks One styling")
 
 # Configuration - Update these values for your environment
@@ -94,9 +119,15 @@ for key in ['DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET']:
 
 try:
     print("🔧 Initializing OpenAI client...")
+    # One client shared by every callback. Serving-endpoint connections are kept alive
+    # for 5 minutes (httpx default is 5s) so analyses triggered minutes apart reuse the
+    # pooled TLS connection instead of paying a new handshake per LLM call
     llm_client = OpenAI(
         api_key=DATABRICKS_TOKEN,
-        base_url=f"{DATABRICKS_HOST}/serving-endpoints"
+        base_url=f"{DATABRICKS_HOST}/serving-endpoints",
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300)
+        )
     )
     print("✅ OpenAI client initialized")
     
@@ -115,20 +146,26 @@ try:
         print(f"⚠️ Could not enable MLflow OpenAI autologging: {e}")
     
     print("🔧 Initializing Databricks client...")
-    workspace_client = WorkspaceClient(
+    # Single shared client for every page/callback. The SDK keeps one pooled
+    # requests session per client, so size the pool for concurrent permission
+    # tests and bursty dashboard retrieves instead of re-handshaking TLS.
+    workspace_client = WorkspaceClient(config=Config(
         host=DATABRICKS_HOST,
-        token=DATABRICKS_TOKEN
-    )
+        token=DATABRICKS_TOKEN,
+        max_connection_pools=16,
+        max_connections_per_pool=32,
+        http_timeout_seconds=30
+    ))
     print("✅ Databricks client initialized")
 
     print("🔧 Initializing Dashboard Manager...")
     dashboard_manager = DashboardManager(workspace_client, WAREHOUSE_ID, "/Shared")
     print("✅ Dashboard Manager initialized")
     
-    # Global progress tracking for AI dashboard generation
-    import threading
-    ai_progress_store = {}
-    ai_results_store = {}
+    # Global progress tracking for AI dashboard generation (bounded, entries expire)
+    from utils import SessionStore
+    ai_progress_store = SessionStore()
+    ai_results_store = SessionStore()
     print("✅ Progress tracking initialized")
     
     print("=" * 60)
@@ -154,14 +191,21 @@ app.layout = html.Div([
     dcc.Store(id='original-dataset'),  # Store for original dataset (no filters)
     dcc.Store(id='filtered-dataset'),  # Store for dataset with WHERE filters applied
     dcc.Store(id='uc-dataset-store'),  # Store for Unity Catalog table dataset
+    dcc.Store(id='uc-columns-cache', storage_type='memory'),  # Columns of the displayed UC table, reused on confirm
     dcc.Store(id='dashboard-config'),
     dcc.Store(id='deployed-dashboard-id'),
     dcc.Store(id='selected-widgets', data=[]),  # Store for widget selection
     dcc.Store(id='ai-generation-session', data=None),  # Store for tracking active AI generation
     dcc.Store(id='ai-last-update', data=None),  # Track last update to prevent unnecessary re-renders
+    dcc.Store(id='ai-progress-snapshot', data=None),  # Latest AI generation progress (steps, reasoning), rendered clientside
+    dcc.Store(id='ai-widget-delta', data=None),  # Newly added widget rationales (session, running total, items) appended clientside
+    dcc.Store(id='ai-steps-cursor', data=None),  # Progress steps the poll has put into ai-progress-snapshot (later ticks patch in only new ones)
+    dcc.Store(id='ai-poll-backoff', data=None),  # Idle-tick count driving the adaptive ai-progress-interval
     dcc.Store(id='infusion-design-data', data=None),  # Store for design infusion extracted data
-    dcc.Store(id='current-dashboard-config', data=None),  # Store current dashboard config for infusion (NEW DASHBOARD PAGE)
+    dcc.Store(id='current-dashboard-config', data=None),  # Reference to the server-side cached dashboard config for infusion (NEW DASHBOARD PAGE)
     dcc.Store(id='current-dashboard-name', data=None),  # Store current dashboard name for infusion (NEW DASHBOARD PAGE)
+    dcc.Store(id='new-dashboard-embed-refresh', data=None),  # Embed URL + refresh stamp to reload the preview iframe after infusion (NEW DASHBOARD PAGE)
+    dcc.Store(id='new-dashboard-design-job', data=None),  # ID of the streaming design/refine LLM job (NEW DASHBOARD PAGE)
     dcc.Store(id='active-page', data='new-dashboard'),  # Store for active page
     
     # NEW DASHBOARD INTELLIGENT INFUSION STORES
@@ -183,7 +227,7 @@ app.layout = html.Div([
     dcc.Store(id='original-design-prompt', data=None),  # Store original prompt for refinement
     dcc.Store(id='previous-design-data', data=None),  # Store previous design for refinement
     
-    dcc.Interval(id='ai-progress-interval', interval=500, disabled=True, n_intervals=0, max_intervals=300),  # Poll every 500ms, max 2.5 mins
+    dcc.Interval(id='ai-progress-interval', interval=500, disabled=True, n_intervals=0, max_intervals=-1),  # Fallback poll (progress streams over SSE) and final-results fetch; backs off to 5s while idle, stopped via disabled
     
     # Layout with fixed sidebar
     dbc.Row([
@@ -338,6 +382,10 @@ app.layout = html.Div([
                   children=html.Div(id='new-dashboard-design-reasoning-display', className="mt-3")
               ),
               
+              # Streaming LLM response (outside dcc.Loading so polling doesn't flash the spinner)
+              html.Div(id='new-dashboard-design-stream', className="mt-3"),
+              dcc.Interval(id='new-dashboard-design-stream-interval', interval=250, disabled=True),
+              
               # Validation Section (NEW - shown after design generation)
               html.Div(
                   id='new-dashboard-design-validation-section',
@@ -594,7 +642,7 @@ def navigate_pages(new_clicks, existing_clicks, active_page):
                 'w-100 text-start mb-2 nav-link-btn'
             )
         
-        trigger_id = callback_context.triggered[0]['prop_id'].split('.')[0]
+        trigger_id = callback_context.triggered_id
         print(f"🔄 Navigation: User clicked {trigger_id}")
         
         if trigger_id == 'nav-new-dashboard':
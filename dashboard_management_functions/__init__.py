@@ -6,7 +6,7 @@ deployment, management, generation (AI and manual), and design infusion.
 """
 
 from .dashboard_manager import DashboardManager
-from .ai_dashboard_generator import generate_dashboard_background
+from .ai_dashboard_generator import generate_dashboard_background, GenState
 from .design_infusion import (
     extract_design_from_image, 
     generate_design_from_prompt,
@@ -19,6 +19,7 @@ from .design_infusion import (
 __all__ = [
     'DashboardManager',
     'generate_dashboard_background',
+    'GenState',
     'extract_design_from_image',
     'generate_design_from_prompt',
     'analyze_dashboard_layout',
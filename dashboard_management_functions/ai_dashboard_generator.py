@@ -11,6 +11,11 @@ import random
 import string
 import time
 import sys
+import threading
+from collections import deque
+from itertools import count, islice
+from dataclasses import dataclass, field
+from typing import Optional
 import mlflow
 from dash import html
 import dash_bootstrap_components as dbc
@@ -24,6 +29,136 @@ from widgets import (
     create_pie_chart_widget
 )
 
+# Only the most recent progress steps / widget rationales are kept (and shipped to the browser) per session
+MAX_PROGRESS_STEPS = 200
+MAX_WIDGET_DETAILS = 100
+
+# Source of GenState.generation - unique per state object, even within one session
+_GENERATIONS = count(1)
+
+
+@dataclass(slots=True)
+class GenState:
+    """
+    Progress of one AI dashboard generation, shared by the worker thread and its readers
+    
+    Slotted: one instance per session lives in ai_progress_store, so there is no
+    per-instance __dict__ and only the fields below can be set.
+    """
+    status: str = 'initializing'
+    steps: deque = field(default_factory=deque)
+    reasoning: str = ''
+    widget_details: deque = field(default_factory=deque)
+    version: int = 0  # Bumped on every write so readers can skip unchanged state
+    cleanup_time: Optional[float] = None  # Set by the poller once results have been handed to the UI
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    totals: dict = field(init=False, repr=False, compare=False)
+    changed: threading.Condition = field(init=False, repr=False, compare=False)
+    generation: int = field(init=False, compare=False)  # Tells a replaced state apart from its successor
+    
+    def __post_init__(self):
+        self.steps = deque(self.steps, maxlen=MAX_PROGRESS_STEPS)
+        self.widget_details = deque(self.widget_details, maxlen=MAX_WIDGET_DETAILS)
+        # Items appended over the whole run (the deques only keep the most recent ones)
+        self.totals = {'steps': len(self.steps), 'widget_details': len(self.widget_details)}
+        # Wakes progress stream readers on every write (shares the state's lock)
+        self.changed = threading.Condition(self.lock)
+        self.generation = next(_GENERATIONS)
+    
+    def add(self, key, value):
+        """
+        Append to the steps or widget_details list and bump the version
+        
+        Args:
+            key: 'steps' or 'widget_details'
+            value: Text to append
+        """
+        with self.changed:
+            getattr(self, key).append(value)
+            self.totals[key] += 1
+            self.version += 1
+            self.changed.notify_all()
+    
+    def update(self, **fields):
+        """Set status and/or reasoning and bump the version"""
+        with self.changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self.changed.notify_all()
+    
+    def _snapshot_locked(self, include_widget_details=True):
+        snapshot = {
+            'status': self.status,
+            'steps': list(self.steps),
+            'steps_total': self.totals['steps'],
+            'reasoning': self.reasoning,
+            'widget_details_total': self.totals['widget_details'],
+            'version': self.version,
+            'generation': self.generation
+        }
+        if include_widget_details:
+            snapshot['widget_details'] = list(self.widget_details)
+        return snapshot
+    
+    def snapshot(self, include_widget_details=True):
+        """
+        Consistent copy of the fields the progress display renders
+        
+        Args:
+            include_widget_details: Also copy the widget_details list (callers that fetch
+                only new rationales through items_since skip it)
+        
+        Returns:
+            dict: status, steps, steps_total, reasoning, widget_details, widget_details_total, version and generation
+        """
+        with self.lock:
+            return self._snapshot_locked(include_widget_details)
+    
+    def items_since(self, key, seen_total):
+        """
+        Items appended to a list after a reader had seen seen_total of them
+        
+        Only the producer's running total is compared, so an unchanged list costs one
+        integer comparison and no copy.
+        
+        Args:
+            key: 'steps' or 'widget_details'
+            seen_total: Running total the reader last received (0 for nothing yet)
+            
+        Returns:
+            tuple: (new items, current total, reset) - reset means the items are the whole
+            (capped) list and replace what the reader has
+        """
+        with self.lock:
+            total = self.totals[key]
+            new_count = total - seen_total
+            if new_count <= 0:
+                return [], total, False
+            items = getattr(self, key)
+            if seen_total == 0 or new_count > len(items):
+                return list(items), total, True
+            return list(islice(items, len(items) - new_count, None)), total, False
+    
+    def wait_for_change(self, version, timeout):
+        """
+        Block until the version moves past the given one
+        
+        Args:
+            version: Last version the caller has seen (None for "anything")
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            dict: Snapshot (as returned by snapshot()), or None if nothing changed before the timeout
+        """
+        with self.changed:
+            if self.version == version:
+                self.changed.wait(timeout)
+            if self.version == version:
+                return None
+            return self._snapshot_locked()
+
+
 def create_spacer_widget():
     """Create an empty text widget to use as visual spacer"""
     return {
@@ -33,6 +168,75 @@ def create_spacer_widget():
         }
     }
 
+# Static styles of the generated-dashboard preview card (shared across all previews)
+_PREVIEW_META_STYLE = {'fontSize': '13px', 'color': '#6c757d'}
+_PREVIEW_LINK_STYLE = {'fontSize': '13px', 'color': '#0066cc', 'fontWeight': '500'}
+_PREVIEW_GENIE_LABEL_STYLE = {'fontSize': '13px', 'color': '#6c757d', 'marginRight': '5px'}
+_PREVIEW_SWITCH_STYLE = {'transform': 'scale(0.8)', 'verticalAlign': 'middle'}
+_PREVIEW_IFRAME_STYLE = {
+    'width': '100%',
+    'height': '800px',
+    'border': '1px solid #ddd',
+    'borderRadius': '5px'
+}
+
+
+def build_generated_dashboard_preview(dashboard_name, dashboard_id, dashboard_url, embed_url, genie_enabled):
+    """
+    Build the preview card shown on the New Dashboard page for a generated dashboard
+    
+    Args:
+        dashboard_name: Dashboard display name
+        dashboard_id: Dashboard ID
+        dashboard_url: Workspace URL of the dashboard (opened by the "URL" link)
+        embed_url: Embed URL loaded in the iframe
+        genie_enabled: Initial value of the Genie AI switch
+        
+    Returns:
+        dbc.Card: Preview card with URL | ID | Genie toggle, infusion/delete buttons and iframe
+    """
+    return dbc.Card([
+        dbc.CardHeader([
+            dbc.Row([
+                dbc.Col([
+                    html.H4(f"Generated Dashboard: {dashboard_name}"),
+                    # URL, ID, and Genie Toggle
+                    html.Div([
+                        html.A(
+                            "URL",
+                            href=dashboard_url,
+                            target="_blank",
+                            className="text-decoration-none me-3",
+                            style=_PREVIEW_LINK_STYLE
+                        ),
+                        html.Span(" | ", style=_PREVIEW_META_STYLE),
+                        html.Span(f"ID: {dashboard_id}", className="me-3", style=_PREVIEW_META_STYLE),
+                        html.Span(" | ", style=_PREVIEW_META_STYLE),
+                        html.Span("Genie AI: ", style=_PREVIEW_GENIE_LABEL_STYLE),
+                        dbc.Switch(
+                            id='new-dashboard-genie-toggle',
+                            value=genie_enabled,
+                            className="d-inline-block",
+                            style=_PREVIEW_SWITCH_STYLE
+                        )
+                    ], style={'marginTop': '5px'})
+                ], width=7),
+                dbc.Col([
+                    dbc.Button("Apply Infusion", id="apply-infusion-btn", color="primary", size="sm", className="me-2"),
+                    dbc.Button("Delete Dashboard", id="delete-dashboard-btn", color="danger", size="sm")
+                ], width=5, className="text-end")
+            ], align="center")
+        ]),
+        dbc.CardBody([
+            html.Iframe(
+                id='new-dashboard-iframe',
+                src=embed_url,
+                style=_PREVIEW_IFRAME_STYLE
+            )
+        ])
+    ])
+
+
 # Prevent direct execution
 if __name__ == "__main__":
     print("=" * 70)
@@ -74,8 +278,8 @@ def generate_dashboard_background(
         dataset: Dataset configuration dict
         llm_client: OpenAI client instance
         dashboard_manager: DashboardManager instance
-        ai_progress_store: Shared dict for progress tracking
-        ai_results_store: Shared dict for results
+        ai_progress_store: Shared SessionStore of session_id -> GenState for progress tracking
+        ai_results_store: Shared SessionStore for results
         infusion_data: Optional design infusion data with uiSettings
         
     Returns:
@@ -100,12 +304,11 @@ def generate_dashboard_background(
         time.sleep(0.2)
         
         # Step 1: Analyzing request
-        ai_progress_store[session_id] = {
-            'status': 'running',
-            'steps': ['Step 1: Analyzing your request with AI...'],
-            'reasoning': '',
-            'widget_details': []
-        }
+        ai_progress_store[session_id] = GenState(
+            status='running',
+            steps=['Step 1: Analyzing your request with AI...'],
+            version=1  # The initializing entry written by the callback is version 0
+        )
         time.sleep(0.3)
         
         # Check if this is a metric view (has asset_name instead of queryLines)
@@ -387,7 +590,7 @@ EXAMPLES:
 - User-first: What does the user need to see FIRST?"""
         
         # Update progress: calling LLM
-        ai_progress_store[session_id]['steps'].append('🤖 Step 2: Calling LLM to analyze requirements...')
+        ai_progress_store[session_id].add('steps', '🤖 Step 2: Calling LLM to analyze requirements...')
         time.sleep(0.3)
         
         response = llm_client.chat.completions.create(
@@ -416,8 +619,8 @@ EXAMPLES:
         })
         
         # Update progress: received AI response
-        ai_progress_store[session_id]['steps'].append('Step 3: Received AI analysis')
-        ai_progress_store[session_id]['reasoning'] = reasoning
+        ai_progress_store[session_id].add('steps', 'Step 3: Received AI analysis')
+        ai_progress_store[session_id].update(reasoning=reasoning)
         time.sleep(0.4)
         
         # Step 4: Build dashboard layout
@@ -430,9 +633,9 @@ EXAMPLES:
         filter_config = ai_suggestion.get('filter')
         has_filter = False
         if filter_config and isinstance(filter_config, dict):
-            ai_progress_store[session_id]['steps'].append('Step 4: Creating filter widget...')
+            ai_progress_store[session_id].add('steps', 'Step 4: Creating filter widget...')
             if filter_config.get('reason'):
-                ai_progress_store[session_id]['widget_details'].append(f"Filter: {filter_config.get('reason')}")
+                ai_progress_store[session_id].add('widget_details', f"Filter: {filter_config.get('reason')}")
             time.sleep(0.3)
             
             filter_column = filter_config.get('column', all_columns[0])
@@ -446,13 +649,13 @@ EXAMPLES:
             })
             has_filter = True
             widget_list.append(f"Filter on {filter_column}")
-            ai_progress_store[session_id]['steps'].append(f'Filter widget created for {filter_column}')
+            ai_progress_store[session_id].add('steps', f'Filter widget created for {filter_column}')
         
         # Step 5: Create counter widgets if suggested
         counters_config = ai_suggestion.get('counters', [])
         counter_rows = 0
         if counters_config and isinstance(counters_config, list) and len(counters_config) > 0:
-            ai_progress_store[session_id]['steps'].append(f'Step 5: Creating {len(counters_config)} counter widget(s)...')
+            ai_progress_store[session_id].add('steps', f'Step 5: Creating {len(counters_config)} counter widget(s)...')
             time.sleep(0.3)
             
             counter_width = 2  # Each counter takes 2 units of width
@@ -461,7 +664,7 @@ EXAMPLES:
             
             for idx, counter in enumerate(counters_config):
                 if counter.get('reason'):
-                    ai_progress_store[session_id]['widget_details'].append(f"Counter: {counter.get('reason')}")
+                    ai_progress_store[session_id].add('widget_details', f"Counter: {counter.get('reason')}")
                 
                 counter_widget = create_counter_widget(
                     value_column=counter.get('value_column', all_columns[0]),
@@ -494,7 +697,7 @@ EXAMPLES:
                 
                 label = counter.get('label', f"{counter.get('aggregation')} of {counter.get('value_column')}")
                 widget_list.append(f"Counter: {label}")
-                ai_progress_store[session_id]['steps'].append(f'Counter created: {label}')
+                ai_progress_store[session_id].add('steps', f'Counter created: {label}')
             
             # Calculate how many rows of counters we have
             if num_counters == 3:
@@ -520,9 +723,9 @@ EXAMPLES:
         # Step 6: Prepare table widget if suggested (will be added at the bottom)
         table_config = ai_suggestion.get('table')
         if table_config and isinstance(table_config, dict):
-            ai_progress_store[session_id]['steps'].append('Step 6: Preparing table widget...')
+            ai_progress_store[session_id].add('steps', 'Step 6: Preparing table widget...')
             if table_config.get('reason'):
-                ai_progress_store[session_id]['widget_details'].append(f"Table: {table_config.get('reason')}")
+                ai_progress_store[session_id].add('widget_details', f"Table: {table_config.get('reason')}")
             time.sleep(0.3)
             
             table_columns = table_config.get('columns', all_columns[:5])
@@ -546,7 +749,7 @@ EXAMPLES:
                 "columns_count": len(table_columns)
             }
             widget_list.append(f"Table with {len(table_columns)} columns")
-            ai_progress_store[session_id]['steps'].append(f'Table widget prepared with {len(table_columns)} columns')
+            ai_progress_store[session_id].add('steps', f'Table widget prepared with {len(table_columns)} columns')
         
         # Collect all chart/pivot widgets first to determine layout strategy
         chart_widgets = []  # Will store (widget, type, description)
@@ -554,9 +757,9 @@ EXAMPLES:
         # Step 8: Create bar chart widget if suggested
         bar_config = ai_suggestion.get('bar_chart')
         if bar_config and isinstance(bar_config, dict):
-            ai_progress_store[session_id]['steps'].append('Step 7: Creating bar chart widget...')
+            ai_progress_store[session_id].add('steps', 'Step 7: Creating bar chart widget...')
             if bar_config.get('reason'):
-                ai_progress_store[session_id]['widget_details'].append(f"Bar Chart: {bar_config.get('reason')}")
+                ai_progress_store[session_id].add('widget_details', f"Bar Chart: {bar_config.get('reason')}")
             time.sleep(0.3)
             
             # Handle color_column - ensure it's None if null or invalid
@@ -575,14 +778,14 @@ EXAMPLES:
             description = f"Bar chart: {bar_config.get('aggregation', 'COUNT')} of {bar_config.get('x_column', 'N/A')} by {bar_config.get('y_column', 'N/A')}"
             chart_widgets.append((bar_chart_widget, 'bar', description))
             widget_list.append(description)
-            ai_progress_store[session_id]['steps'].append(f"Bar chart created: {bar_config.get('aggregation', 'COUNT')} by {bar_config.get('y_column', 'N/A')}")
+            ai_progress_store[session_id].add('steps', f"Bar chart created: {bar_config.get('aggregation', 'COUNT')} by {bar_config.get('y_column', 'N/A')}")
         
         # Step 9: Create line chart widget if suggested
         line_config = ai_suggestion.get('line_chart')
         if line_config and isinstance(line_config, dict):
-            ai_progress_store[session_id]['steps'].append('Step 8: Creating line chart widget...')
+            ai_progress_store[session_id].add('steps', 'Step 8: Creating line chart widget...')
             if line_config.get('reason'):
-                ai_progress_store[session_id]['widget_details'].append(f"Line Chart: {line_config.get('reason')}")
+                ai_progress_store[session_id].add('widget_details', f"Line Chart: {line_config.get('reason')}")
             time.sleep(0.3)
             
             # Handle color_column - ensure it's None if null or invalid
@@ -602,14 +805,14 @@ EXAMPLES:
             description = f"Line chart: {line_config.get('aggregation', 'COUNT')} of {line_config.get('y_column', 'N/A')} over {line_config.get('x_column', 'N/A')}"
             chart_widgets.append((line_chart_widget, 'line', description))
             widget_list.append(description)
-            ai_progress_store[session_id]['steps'].append(f"Line chart created: {line_config.get('aggregation', 'COUNT')} over time")
+            ai_progress_store[session_id].add('steps', f"Line chart created: {line_config.get('aggregation', 'COUNT')} over time")
         
         # Step 10: Create pie chart widget if suggested
         pie_config = ai_suggestion.get('pie_chart')
         if pie_config and isinstance(pie_config, dict):
-            ai_progress_store[session_id]['steps'].append('Step 9: Creating pie chart widget...')
+            ai_progress_store[session_id].add('steps', 'Step 9: Creating pie chart widget...')
             if pie_config.get('reason'):
-                ai_progress_store[session_id]['widget_details'].append(f"Pie Chart: {pie_config.get('reason')}")
+                ai_progress_store[session_id].add('widget_details', f"Pie Chart: {pie_config.get('reason')}")
             time.sleep(0.3)
             
             pie_chart_widget = create_pie_chart_widget(
@@ -622,14 +825,14 @@ EXAMPLES:
             description = f"Pie chart: {pie_config.get('aggregation', 'COUNT')} of {pie_config.get('value_column', 'N/A')} by {pie_config.get('category_column', 'N/A')}"
             chart_widgets.append((pie_chart_widget, 'pie', description))
             widget_list.append(description)
-            ai_progress_store[session_id]['steps'].append(f"Pie chart created: {pie_config.get('title', 'distribution')}")
+            ai_progress_store[session_id].add('steps', f"Pie chart created: {pie_config.get('title', 'distribution')}")
         
         # Step 11: Create pivot widget if suggested
         pivot_config = ai_suggestion.get('pivot')
         if pivot_config and isinstance(pivot_config, dict):
-            ai_progress_store[session_id]['steps'].append('Step 10: Creating pivot table widget...')
+            ai_progress_store[session_id].add('steps', 'Step 10: Creating pivot table widget...')
             if pivot_config.get('reason'):
-                ai_progress_store[session_id]['widget_details'].append(f"Pivot: {pivot_config.get('reason')}")
+                ai_progress_store[session_id].add('widget_details', f"Pivot: {pivot_config.get('reason')}")
             time.sleep(0.3)
             
             pivot_widget = create_pivot_widget(
@@ -643,13 +846,13 @@ EXAMPLES:
             description = f"Pivot: {pivot_config.get('aggregation', 'SUM')} of {pivot_config.get('value_column', 'N/A')} by {row_cols}"
             chart_widgets.append((pivot_widget, 'pivot', description))
             widget_list.append(description)
-            ai_progress_store[session_id]['steps'].append(f"Pivot created: {pivot_config.get('aggregation', 'SUM')} by {row_cols}")
+            ai_progress_store[session_id].add('steps', f"Pivot created: {pivot_config.get('aggregation', 'SUM')} by {row_cols}")
         
         # Position all charts using smart layout
         num_charts = len(chart_widgets)
         if num_charts == 3:
             # Hero layout for 3 charts: First chart full width, others split below
-            ai_progress_store[session_id]['steps'].append(f'Using hero layout for 3 charts...')
+            ai_progress_store[session_id].add('steps', f'Using hero layout for 3 charts...')
             
             # First chart: Full width (x=0, width=6)
             layout.append({
@@ -675,7 +878,7 @@ EXAMPLES:
             current_y += 6
         elif num_charts == 4:
             # 4 charts: 2 rows of 2, with spacer between rows
-            ai_progress_store[session_id]['steps'].append(f'Using 2x2 grid layout with spacer for 4 charts...')
+            ai_progress_store[session_id].add('steps', f'Using 2x2 grid layout with spacer for 4 charts...')
             
             # First row: 2 charts
             for idx in range(2):
@@ -703,7 +906,7 @@ EXAMPLES:
             current_y += 6
         elif num_charts > 4:
             # 5+ charts: Standard grid (2 per row) with spacers between rows
-            ai_progress_store[session_id]['steps'].append(f'Using grid layout for {num_charts} charts...')
+            ai_progress_store[session_id].add('steps', f'Using grid layout for {num_charts} charts...')
             for idx, (chart_widget, chart_type, desc) in enumerate(chart_widgets):
                 x_pos = (idx % 2) * 3  # Alternates x=0, x=3
                 y_pos = current_y
@@ -723,7 +926,7 @@ EXAMPLES:
                         current_y += 1
         elif num_charts > 0:
             # 1-2 charts: side by side (no spacer needed between them)
-            ai_progress_store[session_id]['steps'].append(f'Using side-by-side layout for {num_charts} chart(s)...')
+            ai_progress_store[session_id].add('steps', f'Using side-by-side layout for {num_charts} chart(s)...')
             for idx, (chart_widget, chart_type, desc) in enumerate(chart_widgets):
                 x_pos = (idx % 2) * 3  # Alternates x=0, x=3
                 layout.append({
@@ -734,7 +937,7 @@ EXAMPLES:
         
         # Step 11: Add table widget at the bottom if it was prepared
         if table_widget_data:
-            ai_progress_store[session_id]['steps'].append('Step 11: Adding table widget at bottom...')
+            ai_progress_store[session_id].add('steps', 'Step 11: Adding table widget at bottom...')
             
             # Add spacer before table (if there are charts above)
             if num_charts > 0:
@@ -749,26 +952,26 @@ EXAMPLES:
                 "position": {"x": 0, "y": current_y, "width": 6, "height": 8}
             })
             current_y += 8  # Update y position after table
-            ai_progress_store[session_id]['steps'].append(f'Table widget added at bottom with {table_widget_data["columns_count"]} columns')
+            ai_progress_store[session_id].add('steps', f'Table widget added at bottom with {table_widget_data["columns_count"]} columns')
             time.sleep(0.3)
         
         # Check if at least one widget was created
         if not layout:
-            ai_progress_store[session_id]['steps'].append('❌ No widgets were suggested by AI')
+            ai_progress_store[session_id].add('steps', '❌ No widgets were suggested by AI')
             ai_results_store[session_id] = {
                 'status': dbc.Alert("⚠️ AI did not suggest any widgets for this request. Please try rephrasing your prompt.", color="warning"),
                 'progress': "",
                 'preview': "",
                 'dashboard_id': None
             }
-            ai_progress_store[session_id]['status'] = 'error'
+            ai_progress_store[session_id].update(status='error')
             return {
                 "status": "no_widgets_suggested",
                 "error": "AI did not suggest any widgets"
             }
         
         # Step 12: Build dashboard configuration
-        ai_progress_store[session_id]['steps'].append('🔧 Step 12: Building dashboard configuration...')
+        ai_progress_store[session_id].add('steps', '🔧 Step 12: Building dashboard configuration...')
         time.sleep(0.3)
         
         dashboard_config = {
@@ -784,7 +987,7 @@ EXAMPLES:
         # Add uiSettings from design infusion if available
         if infusion_data and isinstance(infusion_data, dict) and 'uiSettings' in infusion_data:
             dashboard_config['uiSettings'] = infusion_data['uiSettings']
-            ai_progress_store[session_id]['steps'].append('Applied design infusion theme')
+            ai_progress_store[session_id].add('steps', 'Applied design infusion theme')
             time.sleep(0.2)
         
         # Step 13: Generate random dashboard name or use AI suggestion
@@ -793,11 +996,11 @@ EXAMPLES:
         random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
         dashboard_name = f"{dashboard_name} ({random_suffix})"
         
-        ai_progress_store[session_id]['steps'].append(f'📝 Dashboard name: {dashboard_name}')
+        ai_progress_store[session_id].add('steps', f'📝 Dashboard name: {dashboard_name}')
         time.sleep(0.3)
         
         # Step 14: Deploy dashboard
-        ai_progress_store[session_id]['steps'].append('🚀 Step 13: Deploying dashboard to Databricks...')
+        ai_progress_store[session_id].add('steps', '🚀 Step 13: Deploying dashboard to Databricks...')
         time.sleep(0.3)
         
         print(f"⏳ Creating dashboard '{dashboard_name}'...")
@@ -806,11 +1009,11 @@ EXAMPLES:
         elapsed = time.time() - start_time
         print(f"✅ Dashboard created in {elapsed:.2f}s (ID: {dashboard_id})")
         
-        ai_progress_store[session_id]['steps'].append(f'Step 13.1: Dashboard created (ID: {dashboard_id})')
+        ai_progress_store[session_id].add('steps', f'Step 13.1: Dashboard created (ID: {dashboard_id})')
         time.sleep(0.2)
         
         print(f"⏳ Generating embed URL...")
-        ai_progress_store[session_id]['steps'].append('Step 13.2: Generating embed URL...')
+        ai_progress_store[session_id].add('steps', 'Step 13.2: Generating embed URL...')
         start_time = time.time()
         embed_url = dashboard_manager.get_embed_url(dashboard_id)
         elapsed = time.time() - start_time
@@ -820,7 +1023,7 @@ EXAMPLES:
         workspace_url = dashboard_manager.workspace_client.config.host
         dashboard_url = f"{workspace_url}/dashboardsv3/{dashboard_id}"
         
-        ai_progress_store[session_id]['steps'].append('Step 13.3: Creating preview card...')
+        ai_progress_store[session_id].add('steps', 'Step 13.3: Creating preview card...')
         print(f"⏳ Creating preview card...")
         
         # Create preview
@@ -833,51 +1036,9 @@ EXAMPLES:
             genie_initial_state = genie_space.get('isEnabled', False)
         print(f"   Initial Genie Space state: {genie_initial_state}")
         
-        preview_card = dbc.Card([
-            dbc.CardHeader([
-                dbc.Row([
-                    dbc.Col([
-                        html.H4(f"Generated Dashboard: {dashboard_name}"),
-                        # URL, ID, and Genie Toggle
-                        html.Div([
-                            html.A(
-                                "URL",
-                                href=dashboard_url,
-                                target="_blank",
-                                className="text-decoration-none me-3",
-                                style={'fontSize': '13px', 'color': '#0066cc', 'fontWeight': '500'}
-                            ),
-                            html.Span(" | ", style={'fontSize': '13px', 'color': '#6c757d'}),
-                            html.Span(f"ID: {dashboard_id}", className="me-3", style={'fontSize': '13px', 'color': '#6c757d'}),
-                            html.Span(" | ", style={'fontSize': '13px', 'color': '#6c757d'}),
-                            html.Span("Genie AI: ", style={'fontSize': '13px', 'color': '#6c757d', 'marginRight': '5px'}),
-                            dbc.Switch(
-                                id='new-dashboard-genie-toggle',
-                                value=genie_initial_state,
-                                className="d-inline-block",
-                                style={'transform': 'scale(0.8)', 'verticalAlign': 'middle'}
-                            )
-                        ], style={'marginTop': '5px'})
-                    ], width=7),
-                    dbc.Col([
-                        dbc.Button("Apply Infusion", id="apply-infusion-btn", color="primary", size="sm", className="me-2"),
-                        dbc.Button("Delete Dashboard", id="delete-dashboard-btn", color="danger", size="sm")
-                    ], width=5, className="text-end")
-                ], align="center")
-            ]),
-            dbc.CardBody([
-                html.Iframe(
-                    id='new-dashboard-iframe',
-                    src=embed_url,
-                    style={
-                        'width': '100%',
-                        'height': '800px',
-                        'border': '1px solid #ddd',
-                        'borderRadius': '5px'
-                    }
-                )
-            ])
-        ])
+        preview_card = build_generated_dashboard_preview(
+            dashboard_name, dashboard_id, dashboard_url, embed_url, genie_initial_state
+        )
         print(f"✅ Preview card created successfully")
         
         # Build success message
@@ -915,8 +1076,8 @@ EXAMPLES:
         
         # THEN mark as complete (polling callback will now find all data ready)
         print(f"⏳ Marking session {session_id} as completed...")
-        ai_progress_store[session_id]['status'] = 'completed'
-        ai_progress_store[session_id]['steps'].append('Step 14: Dashboard deployed successfully!')
+        ai_progress_store[session_id].update(status='completed')
+        ai_progress_store[session_id].add('steps', 'Step 14: Dashboard deployed successfully!')
         print(f"✅ Session marked as completed. Dashboard URL: {dashboard_url}")
         
         # Log final results to MLflow trace
@@ -939,7 +1100,7 @@ EXAMPLES:
         }
         
     except json.JSONDecodeError as e:
-        ai_progress_store[session_id]['steps'].append(f'❌ Failed to parse AI response: {str(e)}')
+        ai_progress_store[session_id].add('steps', f'❌ Failed to parse AI response: {str(e)}')
         error_msg = dbc.Alert([
             html.Strong("❌ Failed to parse AI response"),
             html.Br(),
@@ -951,7 +1112,7 @@ EXAMPLES:
             'preview': "",
             'dashboard_id': None
         }
-        ai_progress_store[session_id]['status'] = 'error'
+        ai_progress_store[session_id].update(status='error')
         # Log error to MLflow trace
         mlflow.set_tags({
             "status": "failed_json_parse",
@@ -966,7 +1127,7 @@ EXAMPLES:
         }
         
     except Exception as e:
-        ai_progress_store[session_id]['steps'].append(f'❌ Error: {str(e)}')
+        ai_progress_store[session_id].add('steps', f'❌ Error: {str(e)}')
         error_msg = dbc.Alert([
             html.Strong("❌ Failed to generate dashboard"),
             html.Br(),
@@ -978,7 +1139,7 @@ EXAMPLES:
             'preview': "",
             'dashboard_id': None
         }
-        ai_progress_store[session_id]['status'] = 'error'
+        ai_progress_store[session_id].update(status='error')
         # Log error to MLflow trace
         mlflow.set_tags({
             "status": "failed",
@@ -3,11 +3,16 @@ Dashboard Creation Module
 Handles the creation and configuration of Databricks dashboards
 """
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.dashboards import LakeviewAPI
 
 
+# Shared pool for Lakeview reads that can overlap with local work (e.g. etag lookup during update)
+_LAKEVIEW_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='lakeview')
+
+
 class DashboardCreator:
     """Creates and configures Databricks dashboard structures"""
     
@@ -62,11 +67,13 @@ class DashboardCreator:
         Returns:
             Dashboard ID (same as input)
         """
+        # Fetch the dashboard etag (required for update) while the config is serialized
+        dashboard_future = _LAKEVIEW_EXECUTOR.submit(self.client.lakeview.get, dashboard_id)
+        
         # Convert config to JSON string
         dashboard_json_text = json.dumps(config)
         
-        # First, get the dashboard to retrieve its etag (required for update)
-        dashboard = self.client.lakeview.get(dashboard_id)
+        dashboard = dashboard_future.result()
         
         # Debug: Check if genieSpace is in the config
         if 'genieSpace' in config:
@@ -17,6 +17,8 @@ class DashboardDeployer:
             workspace_client: Databricks WorkspaceClient instance
         """
         self.client = workspace_client
+        # "<host>/embed/dashboardsv3/" - resolved from the client config on first use
+        self._embed_url_prefix = None
     
     def publish_dashboard(self, dashboard_id: str, embed_credentials: bool = False) -> None:
         """
@@ -51,10 +53,11 @@ class DashboardDeployer:
         Returns:
             Embedded iframe URL
         """
-        workspace_url = self.client.config.host
+        if self._embed_url_prefix is None:
+            workspace_url = self.client.config.host
+            self._embed_url_prefix = f"{workspace_url}/embed/dashboardsv3/"
         org_id = "0"  # Default for most cases
-        embed_url = f"{workspace_url}/embed/dashboardsv3/{dashboard_id}?o={org_id}"
-        return embed_url
+        return f"{self._embed_url_prefix}{dashboard_id}?o={org_id}"
     
     def deploy_dashboard(self, dashboard_id: str) -> str:
         """
@@ -5,15 +5,224 @@ Extracts design elements (colors and fonts) from uploaded images using Vision LL
 Includes intelligent analysis and iterative refinement capabilities.
 """
 
+import base64
+import hashlib
+import io
 import json
+import threading
+from collections import OrderedDict
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the handlers below catch both
+import orjson
+from PIL import Image
 from dash import html
 import dash_bootstrap_components as dbc
 
+# Long edge (px) and JPEG quality of the image sent to the vision LLM; colors and fonts
+# survive the downscale, while a full-resolution screenshot mostly adds latency and tokens
+VISION_IMAGE_MAX_SIDE = 1280
+VISION_IMAGE_JPEG_QUALITY = 80
+
+# Timeout (seconds) for a design LLM request; a stalled request fails instead of holding
+# a worker thread forever
+DESIGN_LLM_TIMEOUT_SECONDS = 180
+
+# Chart palette used when the LLM returns no visualizationColors (image / text-prompt flows)
+DEFAULT_VISUALIZATION_COLORS = (
+    "#077A9D", "#FFAB00", "#00A972", "#FF3621", "#8BCAE7",
+    "#AB4057", "#99DDB4", "#FCA4A1", "#919191", "#BF7080"
+)
+
+# Larger fallback palette for the analysis / refinement flows
+ANALYSIS_VISUALIZATION_COLORS = (
+    "#077A9D", "#FFAB00", "#00A972", "#FF3621", "#8BCAE7",
+    "#9B59B6", "#E74C3C", "#3498DB", "#2ECC71", "#F39C12",
+    "#1ABC9C", "#E67E22", "#95A5A6", "#34495E", "#C0392B",
+    "#16A085", "#27AE60", "#2980B9", "#8E44AD", "#F1C40F",
+    "#D35400", "#C0392B", "#BDC3C7", "#7F8C8D", "#2C3E50",
+    "#E91E63", "#9C27B0", "#673AB7", "#3F51B5", "#2196F3"
+)
+
+# Fonts a Lakeview dashboard theme accepts
+DESIGN_FONT_FAMILIES = [
+    "Arial", "Brush Script MT", "Courier New", "Georgia", "Impact",
+    "Tahoma", "Times New Roman", "Trebuchet MS", "Verdana"
+]
+
+# Structured output for the image / text-prompt theme calls: the model is constrained to
+# this shape, so its reply is plain JSON (no markdown fences to strip)
+DESIGN_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "dashboard_design",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "canvasBackgroundColor": {"type": "string"},
+                "widgetBackgroundColor": {"type": "string"},
+                "widgetBorderColor": {"type": "string"},
+                "fontColor": {"type": "string"},
+                "visualizationColors": {"type": "array", "items": {"type": "string"}},
+                "fontFamily": {"type": "string", "enum": DESIGN_FONT_FAMILIES}
+            },
+            "required": [
+                "canvasBackgroundColor", "widgetBackgroundColor", "widgetBorderColor",
+                "fontColor", "visualizationColors", "fontFamily"
+            ],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+def _build_ui_settings(design, default_visualization_colors=DEFAULT_VISUALIZATION_COLORS, default_font='Times New Roman'):
+    """
+    Build the dashboard uiSettings block for a set of design elements
+    
+    Args:
+        design: Design elements returned by the LLM (canvasBackgroundColor, fontFamily, ...)
+        default_visualization_colors: Palette used when the LLM returned none
+        default_font: Font family used when the LLM returned none
+        
+    Returns:
+        dict: {"uiSettings": {...}} ready to merge into a serialized dashboard
+    """
+    return {
+        "uiSettings": {
+            "theme": {
+                "canvasBackgroundColor": {
+                    "light": design.get('canvasBackgroundColor', '#FAFAFB'),
+                    "dark": "#1F272D"
+                },
+                "widgetBackgroundColor": {
+                    "light": design.get('widgetBackgroundColor', '#FFFFFF'),
+                    "dark": "#11171C"
+                },
+                "widgetBorderColor": {
+                    "light": design.get('widgetBorderColor', '#E0E0E0')
+                },
+                "fontColor": {
+                    "light": design.get('fontColor', '#11171C'),
+                    "dark": "#E8ECF0"
+                },
+                "selectionColor": {
+                    "light": "#2272B4",
+                    "dark": "#8ACAFF"
+                },
+                "visualizationColors": design.get('visualizationColors', list(default_visualization_colors)),
+                "widgetHeaderAlignment": "LEFT",
+                "fontFamily": design.get('fontFamily', default_font)
+            },
+            "genieSpace": {
+                "isEnabled": False,
+                "enablementMode": "DISABLED"
+            },
+            "applyModeEnabled": False
+        }
+    }
+
+
+def _design_elements_panel(design, ui_settings):
+    """
+    Panel listing extracted / generated design elements and the resulting uiSettings JSON
+    
+    Args:
+        design: Design elements returned by the LLM
+        ui_settings: uiSettings block built from them
+        
+    Returns:
+        html.Div: The design elements panel
+    """
+    return html.Div([
+        html.P([
+            html.Strong("Canvas Background Color: "),
+            html.Span(design.get('canvasBackgroundColor', 'N/A'))
+        ], className="mb-2"),
+        html.P([
+            html.Strong("Widget Background Color: "),
+            html.Span(design.get('widgetBackgroundColor', 'N/A'))
+        ], className="mb-2"),
+        html.P([
+            html.Strong("Widget Border Color: "),
+            html.Span(design.get('widgetBorderColor', 'N/A'))
+        ], className="mb-2"),
+        html.P([
+            html.Strong("Font Color: "),
+            html.Span(design.get('fontColor', 'N/A'))
+        ], className="mb-2"),
+        html.P([
+            html.Strong("Visualization Colors: "),
+            html.Span(', '.join(design.get('visualizationColors', [])))
+        ], className="mb-2"),
+        html.P([
+            html.Strong("Font Family: "),
+            html.Span(design.get('fontFamily', 'N/A'))
+        ], className="mb-2"),
+        html.Hr(),
+        html.P(html.Strong("Complete uiSettings JSON:"), className="mb-2"),
+        html.Pre(
+            json.dumps(ui_settings, indent=2),
+            style={
+                'backgroundColor': '#f8f9fa',
+                'padding': '10px',
+                'borderRadius': '5px',
+                'fontSize': '12px',
+                'maxHeight': '300px',
+                'overflowY': 'auto'
+            }
+        )
+    ], style={'backgroundColor': '#f8f9fa', 'padding': '15px', 'borderRadius': '8px', 'border': '1px solid #dee2e6'})
+
+
+def _preprocess_image(image_data):
+    """
+    Downscale and JPEG-recompress an uploaded image before it goes to the vision LLM
+    
+    Args:
+        image_data: Base64 encoded image (without the data URL prefix)
+        
+    Returns:
+        tuple: (base64 image data, mime type) - the input unchanged (as image/jpeg, as before)
+        when the image can't be decoded
+    """
+    try:
+        img = Image.open(io.BytesIO(base64.b64decode(image_data)))
+        img.thumbnail((VISION_IMAGE_MAX_SIDE, VISION_IMAGE_MAX_SIDE), Image.LANCZOS)
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            # Flatten transparency onto white (JPEG has no alpha; converting would turn it black)
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel('A'))
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=VISION_IMAGE_JPEG_QUALITY)
+        processed = base64.b64encode(buffer.getvalue()).decode('ascii')
+        print(f"🖼️ Image resized to {img.size[0]}x{img.size[1]} for vision LLM ({len(image_data) // 1024} KB -> {len(processed) // 1024} KB base64)")
+        return processed, "image/jpeg"
+    except Exception as e:
+        print(f"⚠️ Could not preprocess image, sending original: {e}")
+        return image_data, "image/jpeg"
+
+
+# Designs extracted from uploaded images keyed by SHA-256 of the image data and the prompt
+# version (least recently used evicted first), so re-uploading the same image - on either
+# page - skips the vision LLM call. Only successful extractions are kept; the cached design
+# dicts are shared, so callers must not mutate them.
+# Bump VISION_PROMPT_VERSION whenever the vision prompt or DESIGN_RESPONSE_FORMAT changes.
+VISION_PROMPT_VERSION = 1
+_EXTRACTED_DESIGNS_SIZE = 32
+_EXTRACTED_DESIGNS = OrderedDict()
+_EXTRACTED_DESIGNS_LOCK = threading.Lock()
+
 
 def extract_design_from_image(contents, filename, llm_client):
     """
     Extract design elements (colors and fonts) from uploaded image using Vision LLM
     
+    Results are cached by image content, so an identical re-upload returns immediately.
+    
     Args:
         contents: Base64 encoded image data
         filename: Name of uploaded file
@@ -25,9 +234,41 @@ def extract_design_from_image(contents, filename, llm_client):
     if contents is None:
         return "", None
     
-    try:
-        import base64
+    image_data = contents.split(',', 1)[1] if ',' in contents else contents
+    key = (hashlib.sha256(image_data.encode()).digest(), VISION_PROMPT_VERSION)
+    with _EXTRACTED_DESIGNS_LOCK:
+        cached = _EXTRACTED_DESIGNS.get(key)
+        if cached is not None:
+            _EXTRACTED_DESIGNS.move_to_end(key)
+            print(f"⚡ Reusing design extracted from an identical upload ({filename})")
+            return cached
+    
+    result = _extract_design_uncached(contents, filename, llm_client)
+    design_data = result[1]
+    if design_data and 'uiSettings' in design_data:
+        with _EXTRACTED_DESIGNS_LOCK:
+            _EXTRACTED_DESIGNS[key] = result
+            while len(_EXTRACTED_DESIGNS) > _EXTRACTED_DESIGNS_SIZE:
+                _EXTRACTED_DESIGNS.popitem(last=False)
+    return result
+
+
+def _extract_design_uncached(contents, filename, llm_client):
+    """
+    Vision LLM call behind extract_design_from_image (no caching)
+    
+    Args:
+        contents: Base64 encoded image data
+        filename: Name of uploaded file
+        llm_client: OpenAI client instance
         
+    Returns:
+        tuple: (result_display, design_data)
+    """
+    if contents is None:
+        return "", None
+    
+    try:
         # Handle base64 encoding of uploaded image
         # dcc.Upload provides contents with data URL prefix (e.g., "data:image/png;base64,...")
         if ',' in contents:
@@ -37,6 +278,9 @@ def extract_design_from_image(contents, filename, llm_client):
             # If no prefix, assume it's already base64 encoded
             image_data = contents
         
+        # Shrink the image before sending it (see VISION_IMAGE_MAX_SIDE)
+        image_data, image_mime = _preprocess_image(image_data)
+        
         # Prepare the vision LLM prompt
         vision_prompt = """Analyze this image and extract the following design elements in JSON format:
 
@@ -69,9 +313,7 @@ For fontFamily, please pick the closest match from these options:
 - Verdana
 
 CRITICAL RULES FOR VISUALIZATION COLORS:
-1. NEVER use white (#FFFFFF) or very light colors (lightness > 90%) as visualization colors if the canvas and widget backgrounds are white!
-
-IMPORTANT: Return ONLY valid JSON without any markdown formatting or code blocks."""
+1. NEVER use white (#FFFFFF) or very light colors (lightness > 90%) as visualization colors if the canvas and widget backgrounds are white!"""
 
         # Call Vision LLM
         print("🔍 Calling vision LLM for image analysis...")
@@ -84,12 +326,14 @@ IMPORTANT: Return ONLY valid JSON without any markdown formatting or code blocks
                         {"type": "text", "text": vision_prompt},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
+                            # Coarse colors/fonts only - low detail keeps the image to a single tile
+                            "image_url": {"url": f"data:{image_mime};base64,{image_data}", "detail": "low"}
                         }
                     ]
                 }
             ],
-            max_tokens=500
+            max_tokens=500,
+            response_format=DESIGN_RESPONSE_FORMAT
         )
         
         # Validate response
@@ -103,94 +347,16 @@ IMPORTANT: Return ONLY valid JSON without any markdown formatting or code blocks
         llm_response = response.choices[0].message.content
         print(f"✅ Received response from vision LLM ({len(llm_response)} characters)")
         
-        # Clean up response (remove markdown code blocks if present)
-        llm_response = llm_response.strip()
-        if llm_response.startswith('```'):
-            lines = llm_response.split('\n')
-            llm_response = '\n'.join(lines[1:-1]) if len(lines) > 2 else llm_response
-        
-        extracted_data = json.loads(llm_response)
+        # Structured output (DESIGN_RESPONSE_FORMAT): the content is the JSON object itself
+        extracted_data = orjson.loads(llm_response)
         
         # Build the complete uiSettings structure
-        ui_settings = {
-            "uiSettings": {
-                "theme": {
-                    "canvasBackgroundColor": {
-                        "light": extracted_data.get('canvasBackgroundColor', '#FAFAFB'),
-                        "dark": "#1F272D"
-                    },
-                    "widgetBackgroundColor": {
-                        "light": extracted_data.get('widgetBackgroundColor', '#FFFFFF'),
-                        "dark": "#11171C"
-                    },
-                    "widgetBorderColor": {
-                        "light": extracted_data.get('widgetBorderColor', '#E0E0E0')
-                    },
-                    "fontColor": {
-                        "light": extracted_data.get('fontColor', '#11171C'),
-                        "dark": "#E8ECF0"
-                    },
-                    "selectionColor": {
-                        "light": "#2272B4",
-                        "dark": "#8ACAFF"
-                    },
-                    "visualizationColors": extracted_data.get('visualizationColors', [
-                        "#077A9D", "#FFAB00", "#00A972", "#FF3621", "#8BCAE7",
-                        "#AB4057", "#99DDB4", "#FCA4A1", "#919191", "#BF7080"
-                    ]),
-                    "widgetHeaderAlignment": "LEFT",
-                    "fontFamily": extracted_data.get('fontFamily', 'Times New Roman')
-                },
-                "genieSpace": {
-                    "isEnabled": False,
-                    "enablementMode": "DISABLED"
-                },
-                "applyModeEnabled": False
-            }
-        }
+        ui_settings = _build_ui_settings(extracted_data)
         
         # Create display with formatted JSON
         result_text = html.Div([
             html.H6("Extracted Design Elements", className="mb-3"),
-            html.Div([
-                html.P([
-                    html.Strong("Canvas Background Color: "),
-                    html.Span(extracted_data.get('canvasBackgroundColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Widget Background Color: "),
-                    html.Span(extracted_data.get('widgetBackgroundColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Widget Border Color: "),
-                    html.Span(extracted_data.get('widgetBorderColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Font Color: "),
-                    html.Span(extracted_data.get('fontColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Visualization Colors: "),
-                    html.Span(', '.join(extracted_data.get('visualizationColors', [])))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Font Family: "),
-                    html.Span(extracted_data.get('fontFamily', 'N/A'))
-                ], className="mb-2"),
-                html.Hr(),
-                html.P(html.Strong("Complete uiSettings JSON:"), className="mb-2"),
-                html.Pre(
-                    json.dumps(ui_settings, indent=2),
-                    style={
-                        'backgroundColor': '#f8f9fa',
-                        'padding': '10px',
-                        'borderRadius': '5px',
-                        'fontSize': '12px',
-                        'maxHeight': '300px',
-                        'overflowY': 'auto'
-                    }
-                )
-            ], style={'backgroundColor': '#f8f9fa', 'padding': '15px', 'borderRadius': '8px', 'border': '1px solid #dee2e6'})
+            _design_elements_panel(extracted_data, ui_settings)
         ])
         
         return result_text, ui_settings
@@ -302,8 +468,7 @@ Examples:
 - For "Van Gogh painting style": Use vibrant blues (#4169E1), yellows (#FFD700), oranges (#FF8C00), greens (#228B22), purples (#8B008B), contrasting warm colors, "Brush Script MT"
 - For "Modern minimalist": Use distinct blues (#2196F3), teals (#00BCD4), grays (#9E9E9E), blacks (#424242), with high contrast, "Arial"
 - For "Corporate professional": Use navy (#003366), teal (#00796B), orange (#F57C00), slate (#455A64), distinct professional colors, "Georgia"
-
-IMPORTANT: Return ONLY valid JSON without any markdown formatting or code blocks."""
+"""
 
         # Call LLM
         response = llm_client.chat.completions.create(
@@ -314,57 +479,18 @@ IMPORTANT: Return ONLY valid JSON without any markdown formatting or code blocks
                     "content": design_prompt
                 }
             ],
-            max_tokens=500
+            max_tokens=500,
+            response_format=DESIGN_RESPONSE_FORMAT
         )
         
         # Parse the LLM response
         llm_response = response.choices[0].message.content
         
-        # Clean up response (remove markdown code blocks if present)
-        llm_response = llm_response.strip()
-        if llm_response.startswith('```'):
-            lines = llm_response.split('\n')
-            llm_response = '\n'.join(lines[1:-1]) if len(lines) > 2 else llm_response
-        
-        extracted_data = json.loads(llm_response)
+        # Structured output (DESIGN_RESPONSE_FORMAT): the content is the JSON object itself
+        extracted_data = orjson.loads(llm_response)
         
         # Build the complete uiSettings structure
-        ui_settings = {
-            "uiSettings": {
-                "theme": {
-                    "canvasBackgroundColor": {
-                        "light": extracted_data.get('canvasBackgroundColor', '#FAFAFB'),
-                        "dark": "#1F272D"
-                    },
-                    "widgetBackgroundColor": {
-                        "light": extracted_data.get('widgetBackgroundColor', '#FFFFFF'),
-                        "dark": "#11171C"
-                    },
-                    "widgetBorderColor": {
-                        "light": extracted_data.get('widgetBorderColor', '#E0E0E0')
-                    },
-                    "fontColor": {
-                        "light": extracted_data.get('fontColor', '#11171C'),
-                        "dark": "#E8ECF0"
-                    },
-                    "selectionColor": {
-                        "light": "#2272B4",
-                        "dark": "#8ACAFF"
-                    },
-                    "visualizationColors": extracted_data.get('visualizationColors', [
-                        "#077A9D", "#FFAB00", "#00A972", "#FF3621", "#8BCAE7",
-                        "#AB4057", "#99DDB4", "#FCA4A1", "#919191", "#BF7080"
-                    ]),
-                    "widgetHeaderAlignment": "LEFT",
-                    "fontFamily": extracted_data.get('fontFamily', 'Times New Roman')
-                },
-                "genieSpace": {
-                    "isEnabled": False,
-                    "enablementMode": "DISABLED"
-                },
-                "applyModeEnabled": False
-            }
-        }
+        ui_settings = _build_ui_settings(extracted_data)
         
         # Create display with formatted JSON
         result_text = html.Div([
@@ -373,45 +499,7 @@ IMPORTANT: Return ONLY valid JSON without any markdown formatting or code blocks
                 html.Strong("AI Interpretation: "),
                 html.Span(f'Generated design based on: "{prompt_text}"')
             ], color="info", className="mb-3"),
-            html.Div([
-                html.P([
-                    html.Strong("Canvas Background Color: "),
-                    html.Span(extracted_data.get('canvasBackgroundColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Widget Background Color: "),
-                    html.Span(extracted_data.get('widgetBackgroundColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Widget Border Color: "),
-                    html.Span(extracted_data.get('widgetBorderColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Font Color: "),
-                    html.Span(extracted_data.get('fontColor', 'N/A'))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Visualization Colors: "),
-                    html.Span(', '.join(extracted_data.get('visualizationColors', [])))
-                ], className="mb-2"),
-                html.P([
-                    html.Strong("Font Family: "),
-                    html.Span(extracted_data.get('fontFamily', 'N/A'))
-                ], className="mb-2"),
-                html.Hr(),
-                html.P(html.Strong("Complete uiSettings JSON:"), className="mb-2"),
-                html.Pre(
-                    json.dumps(ui_settings, indent=2),
-                    style={
-                        'backgroundColor': '#f8f9fa',
-                        'padding': '10px',
-                        'borderRadius': '5px',
-                        'fontSize': '12px',
-                        'maxHeight': '300px',
-                        'overflowY': 'auto'
-                    }
-                )
-            ], style={'backgroundColor': '#f8f9fa', 'padding': '15px', 'borderRadius': '8px', 'border': '1px solid #dee2e6'})
+            _design_elements_panel(extracted_data, ui_settings)
         ])
         
         return result_text, ui_settings
@@ -448,20 +536,26 @@ def analyze_dashboard_layout(dashboard_config):
         if 'serialized_dashboard' in dashboard_config:
             config = dashboard_config['serialized_dashboard']
             if isinstance(config, str):
-                config = json.loads(config)
+                config = orjson.loads(config)
         else:
             config = dashboard_config
         
-        # Extract layout information
-        layout = config.get('pages', [{}])[0].get('layout', [])
+        # Extract layout information (first page)
+        try:
+            layout = config['pages'][0].get('layout', [])
+        except (KeyError, IndexError, TypeError):
+            layout = []
         
-        # Count widget types
+        # Count widget types and track the layout extent in the same pass
         widget_counts = {}
-        widget_details = []
+        max_y = 0
+        max_x = 0
         
         for item in layout:
             widget = item.get('widget', {})
             position = item.get('position', {})
+            max_y = max(max_y, position.get('y', 0) + position.get('height', 0))
+            max_x = max(max_x, position.get('x', 0) + position.get('width', 0))
             
             # Determine widget type
             widget_type = "Unknown"
@@ -481,13 +575,6 @@ def analyze_dashboard_layout(dashboard_config):
             
             # Count
             widget_counts[widget_type] = widget_counts.get(widget_type, 0) + 1
-            
-            # Store details
-            widget_details.append({
-                'type': widget_type,
-                'position': position,
-                'name': widget.get('name', 'N/A')
-            })
         
         # Extract current theme if exists
         current_theme = config.get('uiSettings', {}).get('theme', {})
@@ -500,14 +587,9 @@ def analyze_dashboard_layout(dashboard_config):
             'fontFamily': current_theme.get('fontFamily', 'Arial')
         }
         
-        # Calculate layout metrics
-        max_y = max([item.get('position', {}).get('y', 0) + item.get('position', {}).get('height', 0) for item in layout]) if layout else 0
-        max_x = max([item.get('position', {}).get('x', 0) + item.get('position', {}).get('width', 0) for item in layout]) if layout else 0
-        
         analysis = {
             'total_widgets': len(layout),
             'widget_counts': widget_counts,
-            'widget_details': widget_details,
             'current_colors': current_colors,
             'layout_dimensions': {
                 'max_y': max_y,
@@ -532,7 +614,44 @@ def analyze_dashboard_layout(dashboard_config):
         }
 
 
-def generate_design_with_analysis(prompt_text, dashboard_config, llm_client):
+def _complete_design_prompt(prompt, llm_client, chunks=None):
+    """
+    Send a design prompt to the LLM and return the raw response text.
+    
+    When chunks is a list the completion is streamed and each text delta is appended
+    to it as it arrives, so callers can show partial output while the LLM is running.
+    
+    Args:
+        prompt: Full design prompt
+        llm_client: OpenAI client instance
+        chunks: Optional list receiving streamed text deltas
+        
+    Returns:
+        str: Complete response text
+    """
+    response = llm_client.chat.completions.create(
+        model="databricks-gpt-5",
+        messages=[
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        max_tokens=1000,
+        stream=chunks is not None,
+        timeout=DESIGN_LLM_TIMEOUT_SECONDS
+    )
+    
+    if chunks is None:
+        return response.choices[0].message.content
+    
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            chunks.append(chunk.choices[0].delta.content)
+    return "".join(chunks)
+
+
+def generate_design_with_analysis(prompt_text, dashboard_config, llm_client, chunks=None):
     """
     Generate design with AI reasoning based on dashboard analysis and user prompt.
     This is a multi-step process that returns analysis and reasoning before applying.
@@ -541,6 +660,7 @@ def generate_design_with_analysis(prompt_text, dashboard_config, llm_client):
         prompt_text: User's design description
         dashboard_config: Current dashboard configuration
         llm_client: OpenAI client instance
+        chunks: Optional list receiving the LLM response as it streams
         
     Returns:
         tuple: (analysis_display, reasoning_display, design_data, analysis_text, reasoning_text)
@@ -704,72 +824,21 @@ CRITICAL RULES:
 IMPORTANT: Return ONLY valid JSON without markdown formatting."""
 
         # Call LLM for reasoning + design
-        response = llm_client.chat.completions.create(
-            model="databricks-gpt-5",
-            messages=[
-                {
-                    "role": "user",
-                    "content": reasoning_prompt
-                }
-            ],
-            max_tokens=1000
-        )
-        
-        # Parse LLM response
-        llm_response = response.choices[0].message.content.strip()
+        llm_response = _complete_design_prompt(reasoning_prompt, llm_client, chunks).strip()
         
         # Clean up markdown if present
         if llm_response.startswith('```'):
             lines = llm_response.split('\n')
             llm_response = '\n'.join(lines[1:-1]) if len(lines) > 2 else llm_response
         
-        response_data = json.loads(llm_response)
+        response_data = orjson.loads(llm_response)
         summary_text = response_data.get('summary', 'No summary provided')
         current_style_feedback = response_data.get('current_style_feedback', 'No feedback provided')
         reasoning_text = response_data.get('reasoning', 'No reasoning provided')
         design_data = response_data.get('design', {})
         
         # Build UI settings
-        ui_settings = {
-            "uiSettings": {
-                "theme": {
-                    "canvasBackgroundColor": {
-                        "light": design_data.get('canvasBackgroundColor', '#FAFAFB'),
-                        "dark": "#1F272D"
-                    },
-                    "widgetBackgroundColor": {
-                        "light": design_data.get('widgetBackgroundColor', '#FFFFFF'),
-                        "dark": "#11171C"
-                    },
-                    "widgetBorderColor": {
-                        "light": design_data.get('widgetBorderColor', '#E0E0E0')
-                    },
-                    "fontColor": {
-                        "light": design_data.get('fontColor', '#11171C'),
-                        "dark": "#E8ECF0"
-                    },
-                    "selectionColor": {
-                        "light": "#2272B4",
-                        "dark": "#8ACAFF"
-                    },
-                    "visualizationColors": design_data.get('visualizationColors', [
-                        "#077A9D", "#FFAB00", "#00A972", "#FF3621", "#8BCAE7", 
-                        "#9B59B6", "#E74C3C", "#3498DB", "#2ECC71", "#F39C12",
-                        "#1ABC9C", "#E67E22", "#95A5A6", "#34495E", "#C0392B",
-                        "#16A085", "#27AE60", "#2980B9", "#8E44AD", "#F1C40F",
-                        "#D35400", "#C0392B", "#BDC3C7", "#7F8C8D", "#2C3E50",
-                        "#E91E63", "#9C27B0", "#673AB7", "#3F51B5", "#2196F3"
-                    ]),
-                    "widgetHeaderAlignment": "LEFT",
-                    "fontFamily": design_data.get('fontFamily', 'Arial')
-                },
-                "genieSpace": {
-                    "isEnabled": False,
-                    "enablementMode": "DISABLED"
-                },
-                "applyModeEnabled": False
-            }
-        }
+        ui_settings = _build_ui_settings(design_data, ANALYSIS_VISUALIZATION_COLORS, 'Arial')
         
         # Create reasoning display with summary and collapsible details
         reasoning_display = html.Div([
@@ -872,7 +941,7 @@ IMPORTANT: Return ONLY valid JSON without markdown formatting."""
         return error_msg, "", None, None, None
 
 
-def refine_design_from_feedback(original_prompt, feedback_prompt, previous_reasoning, previous_design, dashboard_config, llm_client):
+def refine_design_from_feedback(original_prompt, feedback_prompt, previous_reasoning, previous_design, dashboard_config, llm_client, chunks=None):
     """
     Refine the design based on user feedback, incorporating previous reasoning.
     
@@ -883,6 +952,7 @@ def refine_design_from_feedback(original_prompt, feedback_prompt, previous_reaso
         previous_design: Previous design specification (dict)
         dashboard_config: Current dashboard configuration
         llm_client: OpenAI client instance
+        chunks: Optional list receiving the LLM response as it streams
         
     Returns:
         tuple: (reasoning_display, design_data, reasoning_text)
@@ -943,71 +1013,20 @@ CRITICAL RULES:
 IMPORTANT: Return ONLY valid JSON without markdown formatting."""
 
         # Call LLM
-        response = llm_client.chat.completions.create(
-            model="databricks-gpt-5",
-            messages=[
-                {
-                    "role": "user",
-                    "content": refinement_prompt
-                }
-            ],
-            max_tokens=1000
-        )
-        
-        # Parse response
-        llm_response = response.choices[0].message.content.strip()
+        llm_response = _complete_design_prompt(refinement_prompt, llm_client, chunks).strip()
         
         if llm_response.startswith('```'):
             lines = llm_response.split('\n')
             llm_response = '\n'.join(lines[1:-1]) if len(lines) > 2 else llm_response
         
-        response_data = json.loads(llm_response)
+        response_data = orjson.loads(llm_response)
         summary_text = response_data.get('summary', 'No summary provided')
         current_style_feedback = response_data.get('current_style_feedback', 'No feedback provided')
         reasoning_text = response_data.get('reasoning', 'No reasoning provided')
         design_data = response_data.get('design', {})
         
         # Build UI settings
-        ui_settings = {
-            "uiSettings": {
-                "theme": {
-                    "canvasBackgroundColor": {
-                        "light": design_data.get('canvasBackgroundColor', '#FAFAFB'),
-                        "dark": "#1F272D"
-                    },
-                    "widgetBackgroundColor": {
-                        "light": design_data.get('widgetBackgroundColor', '#FFFFFF'),
-                        "dark": "#11171C"
-                    },
-                    "widgetBorderColor": {
-                        "light": design_data.get('widgetBorderColor', '#E0E0E0')
-                    },
-                    "fontColor": {
-                        "light": design_data.get('fontColor', '#11171C'),
-                        "dark": "#E8ECF0"
-                    },
-                    "selectionColor": {
-                        "light": "#2272B4",
-                        "dark": "#8ACAFF"
-                    },
-                    "visualizationColors": design_data.get('visualizationColors', [
-                        "#077A9D", "#FFAB00", "#00A972", "#FF3621", "#8BCAE7", 
-                        "#9B59B6", "#E74C3C", "#3498DB", "#2ECC71", "#F39C12",
-                        "#1ABC9C", "#E67E22", "#95A5A6", "#34495E", "#C0392B",
-                        "#16A085", "#27AE60", "#2980B9", "#8E44AD", "#F1C40F",
-                        "#D35400", "#C0392B", "#BDC3C7", "#7F8C8D", "#2C3E50",
-                        "#E91E63", "#9C27B0", "#673AB7", "#3F51B5", "#2196F3"
-                    ]),
-                    "widgetHeaderAlignment": "LEFT",
-                    "fontFamily": design_data.get('fontFamily', 'Arial')
-                },
-                "genieSpace": {
-                    "isEnabled": False,
-                    "enablementMode": "DISABLED"
-                },
-                "applyModeEnabled": False
-            }
-        }
+        ui_settings = _build_ui_settings(design_data, ANALYSIS_VISUALIZATION_COLORS, 'Arial')
         
         # Create refined reasoning display with summary and collapsible details
         reasoning_display = html.Div([
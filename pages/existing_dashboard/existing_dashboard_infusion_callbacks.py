@@ -12,6 +12,7 @@ from dashboard_management_functions.design_infusion import (
     generate_design_with_analysis,
     refine_design_from_feedback
 )
+from utils.dashboard_config_cache import store_dashboard_config, get_cached_dashboard_config
 from .genie_space_callbacks import create_dashboard_card_with_genie_toggle
 
 
@@ -26,37 +27,17 @@ def register_existing_dashboard_infusion_callbacks(app, dashboard_manager, works
         llm_client: OpenAI LLM client for design generation
     """
     
-    @callback(
-        [Output('existing-design-analysis-display', 'children'),
-         Output('existing-design-reasoning-display', 'children'),
-         Output('existing-design-validation-section', 'style'),
-         Output('design-analysis-text', 'data'),
-         Output('design-reasoning-text', 'data'),
-         Output('design-generated-ui-settings', 'data'),
-         Output('original-design-prompt', 'data'),
-         Output('previous-design-data', 'data'),
-         Output('existing-dashboard-infusion-status', 'children'),
-         Output('existing-dashboard-preview', 'children', allow_duplicate=True),
-         Output('existing-infusion-modal', 'is_open', allow_duplicate=True),
-         Output('existing-dashboard-config', 'data', allow_duplicate=True)],
-        [Input('existing-dashboard-infusion-upload', 'contents'),
-         Input('existing-generate-design-from-prompt-btn', 'n_clicks')],
-        [State('existing-dashboard-infusion-upload', 'filename'),
-         State('existing-dashboard-infusion-prompt', 'value'),
-         State('existing-dashboard-id', 'data'),
-         State('existing-dashboard-config', 'data'),
-         State('existing-dashboard-name', 'data')],
-        prevent_initial_call=True
-    )
-    def generate_design_for_existing_dashboard(contents, prompt_btn_clicks, filename, prompt_text, dashboard_id, dashboard_config, dashboard_name):
+    def generate_design_for_existing_dashboard(contents, prompt_btn_clicks, filename, prompt_text, dashboard_id, config_ref, dashboard_name):
         """Generate design with analysis and reasoning (INTELLIGENT WORKFLOW - doesn't apply immediately)"""
         from dash import callback_context
         
+        dashboard_config = get_cached_dashboard_config(config_ref)
+        
         # Check what triggered the callback
         if not callback_context.triggered:
             return "", "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
         
-        trigger_id = callback_context.triggered[0]['prop_id'].split('.')[0]
+        trigger_id = callback_context.triggered_id
         
         # Validate that we have dashboard data
         if not dashboard_id or not dashboard_config:
@@ -137,7 +118,7 @@ def register_existing_dashboard_infusion_callbacks(app, dashboard_manager, works
                 
                 # Return: empty analysis/reasoning displays, hide validation section, 
                 # update preview, close modal (False), update config
-                return "", "", {'display': 'none'}, None, None, None, None, None, "", preview_card, False, full_updated_config
+                return "", "", {'display': 'none'}, None, None, None, None, None, "", preview_card, False, store_dashboard_config(dashboard_id, full_updated_config)
                 
             except Exception as e:
                 import traceback
@@ -231,6 +212,39 @@ def register_existing_dashboard_infusion_callbacks(app, dashboard_manager, works
         return "", "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
 
 
+    @callback(
+        [Output('existing-design-analysis-display', 'children'),
+         Output('existing-design-reasoning-display', 'children'),
+         Output('existing-design-validation-section', 'style'),
+         Output('design-analysis-text', 'data'),
+         Output('design-reasoning-text', 'data'),
+         Output('design-generated-ui-settings', 'data'),
+         Output('original-design-prompt', 'data'),
+         Output('previous-design-data', 'data'),
+         Output('existing-dashboard-infusion-status', 'children'),
+         Output('existing-dashboard-preview', 'children', allow_duplicate=True),
+         Output('existing-infusion-modal', 'is_open', allow_duplicate=True),
+         Output('existing-dashboard-config', 'data', allow_duplicate=True),
+         Output('existing-dashboard-infusion-upload', 'contents', allow_duplicate=True)],
+        [Input('existing-dashboard-infusion-upload', 'contents'),
+         Input('existing-generate-design-from-prompt-btn', 'n_clicks')],
+        [State('existing-dashboard-infusion-upload', 'filename'),
+         State('existing-dashboard-infusion-prompt', 'value'),
+         State('existing-dashboard-id', 'data'),
+         State('existing-dashboard-config', 'data'),
+         State('existing-dashboard-name', 'data')],
+        prevent_initial_call=True
+    )
+    def route_existing_dashboard_design(contents, prompt_btn_clicks, filename, prompt_text, dashboard_id, config_ref, dashboard_name):
+        """
+        Run the design workflow, then clear the upload's contents so the base64 image isn't
+        sent back to the server with every later prompt-button click (it's an Input here)
+        """
+        return generate_design_for_existing_dashboard(
+            contents, prompt_btn_clicks, filename, prompt_text, dashboard_id, config_ref, dashboard_name
+        ) + (None if contents else no_update,)
+    
+    
     @callback(
         [Output('existing-dashboard-preview', 'children', allow_duplicate=True),
          Output('existing-dashboard-id', 'data', allow_duplicate=True),
@@ -246,9 +260,10 @@ def register_existing_dashboard_infusion_callbacks(app, dashboard_manager, works
          State('existing-dashboard-name', 'data')],
         prevent_initial_call=True
     )
-    def apply_validated_design_to_existing(n_clicks, ui_settings, dashboard_id, dashboard_config, dashboard_name):
+    def apply_validated_design_to_existing(n_clicks, ui_settings, dashboard_id, config_ref, dashboard_name):
         """Apply the validated design to the existing dashboard"""
-        if not n_clicks or not ui_settings or not dashboard_id:
+        dashboard_config = get_cached_dashboard_config(config_ref)
+        if not n_clicks or not ui_settings or not dashboard_id or not dashboard_config:
             return no_update, no_update, no_update, no_update, no_update, no_update, no_update
         
         try:
@@ -302,7 +317,7 @@ def register_existing_dashboard_infusion_callbacks(app, dashboard_manager, works
             success_msg = dbc.Alert("✅ Design applied successfully!", color="success")
             
             # Close modal, clear prompt, hide validation section
-            return preview_card, updated_dashboard_id, full_updated_config, False, "", {'display': 'none'}, success_msg
+            return preview_card, updated_dashboard_id, store_dashboard_config(updated_dashboard_id, full_updated_config), False, "", {'display': 'none'}, success_msg
             
         except Exception as e:
             import traceback
@@ -338,11 +353,13 @@ def register_existing_dashboard_infusion_callbacks(app, dashboard_manager, works
          State('existing-dashboard-config', 'data')],
         prevent_initial_call=True
     )
-    def apply_design_refinement_to_existing(n_clicks, feedback, original_prompt, previous_reasoning, previous_design, dashboard_config):
+    def apply_design_refinement_to_existing(n_clicks, feedback, original_prompt, previous_reasoning, previous_design, config_ref):
         """Refine design based on user feedback"""
         if not n_clicks or not feedback or not feedback.strip():
             return no_update, no_update, no_update, no_update, no_update
         
+        dashboard_config = get_cached_dashboard_config(config_ref)
+        
         try:
             print(f"🔄 [REFINEMENT] Applying feedback: {feedback[:50]}...")
             
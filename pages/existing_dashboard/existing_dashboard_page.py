@@ -4,12 +4,73 @@ Existing Dashboard Page Layout and Callbacks
 This module contains all the UI components and callbacks for viewing and managing existing dashboards.
 """
 
-from dash import html, dcc, callback, Output, Input, State, no_update, MATCH
+import json
+import functools
+from dash import html, dcc, callback, Output, Input, State, no_update, MATCH, ctx
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 from utils.query_permission_checker import test_dashboard_queries_for_permissions
+from utils.dashboard_config_cache import store_dashboard_config, get_cached_dashboard_config
 from .genie_space_callbacks import create_dashboard_card_with_genie_toggle
 
 
+@functools.lru_cache(maxsize=32)
+def _make_warning_alert(message):
+    """
+    Build the half-width warning banner shown under the retrieve form.
+    
+    Cached by message: the component is re-serialized to JSON on every response,
+    so the same instance can safely be returned for repeated invalid inputs.
+    """
+    return dbc.Row([
+        dbc.Col([
+            dbc.Alert(message, color="warning")
+        ], width=6)
+    ])
+
+
+def _make_success_alert(dashboard_name, permissions_verified):
+    """
+    Build the half-width success banner for a retrieved dashboard.
+    
+    Args:
+        dashboard_name: Display name of the retrieved dashboard
+        permissions_verified: False while the deferred table permission check is still running
+    """
+    return dbc.Row([
+        dbc.Col([
+            dbc.Alert([
+                html.Strong("✅ Dashboard retrieved successfully!"),
+                html.Br(),
+                html.Small(f"Viewing: {dashboard_name}"),
+                html.Br(),
+                html.Small("🔒 Table permissions verified" if permissions_verified else "🔒 Verifying table permissions...")
+            ], color="success")
+        ], width=6)
+    ])
+
+
+@functools.lru_cache(maxsize=32)
+def _make_error_alert(error):
+    """
+    Build the half-width error banner shown when a dashboard can't be retrieved.
+    
+    Args:
+        error: Error message (str) raised while retrieving the dashboard
+    """
+    return dbc.Row([
+        dbc.Col([
+            dbc.Alert([
+                html.Strong("❌ Error retrieving dashboard"),
+                html.Br(),
+                html.Small(f"Error: {error}"),
+                html.Br(),
+                html.Small("Please verify the dashboard ID is correct and the dashboard exists.")
+            ], color="danger")
+        ], width=6)
+    ])
+
+
 def get_existing_dashboard_layout():
     """
     Returns the layout for the Existing Dashboard page
@@ -72,6 +133,12 @@ def get_existing_dashboard_layout():
                                 ),
                                 # Store for full unfiltered analysis
                                 dcc.Store(id='metrics-full-analysis', data=None),
+                                # Streaming analysis job key and the interval polling it
+                                dcc.Store(id='metrics-analysis-job', data=None),
+                                dcc.Interval(id='metrics-stream-interval', interval=500, n_intervals=0, disabled=True),
+                                # Partial markdown while the analysis streams in (outside the
+                                # Loading wrapper so polling doesn't flash the spinner)
+                                html.Div(id='metrics-discovery-stream'),
                                 # Loading and content display
                                 dcc.Loading(
                                     id="metrics-discovery-loading",
@@ -129,9 +196,8 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
     )
     def delete_existing_dashboard_callback(n_clicks, dashboard_id):
         """Callback to delete dashboard from Databricks (Existing Dashboard page)"""
-        # Only proceed if button was actually clicked
-        if not n_clicks or n_clicks < 1:
-            from dash.exceptions import PreventUpdate
+        # Only proceed if button was actually clicked (not a re-render of the preview card)
+        if not ctx.triggered_id or not n_clicks:
             raise PreventUpdate
         
         if not dashboard_id:
@@ -163,7 +229,9 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
          Output('metrics-panel-container', 'style'),
          Output('metrics-discovery-content', 'children', allow_duplicate=True),
          Output('metrics-full-analysis', 'data', allow_duplicate=True),
-         Output('metrics-search-input', 'value')],
+         Output('metrics-search-input', 'value'),
+         Output('metrics-analysis-job', 'data', allow_duplicate=True),
+         Output('metrics-discovery-stream', 'children', allow_duplicate=True)],
         Input('retrieve-dashboard-btn', 'n_clicks'),
         State('existing-dashboard-id-input', 'value'),
         prevent_initial_call=True,
@@ -172,7 +240,7 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
              dbc.Alert([
                  html.Div([
                      dbc.Spinner(size="sm"),
-                     html.Span("Checking permissions...", style={"marginLeft": "10px"})
+                     html.Span("Retrieving dashboard...", style={"marginLeft": "10px"})
                  ], style={"display": "flex", "alignItems": "center"})
              ], color="info"), 
              "")
@@ -191,12 +259,8 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
         ])
         
         if not n_clicks or not dashboard_id or not dashboard_id.strip():
-            warning_msg = dbc.Row([
-                dbc.Col([
-                    dbc.Alert("⚠️ Please enter a valid dashboard ID", color="warning")
-                ], width=6)
-            ])
-            return warning_msg, "", None, None, None, {'display': 'none'}, metrics_placeholder, None, ""
+            warning_msg = _make_warning_alert("⚠️ Please enter a valid dashboard ID")
+            return warning_msg, "", None, None, None, {'display': 'none'}, metrics_placeholder, None, "", None, None
         
         try:
             dashboard_id = dashboard_id.strip()
@@ -205,15 +269,16 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
             # Get dashboard configuration
             dashboard_config = dashboard_manager.get_dashboard_config(dashboard_id)
             
+            # Parse the serialized dashboard once - it is needed both for the
+            # query extraction and for the Genie Space setting below
+            serialized_dashboard = dashboard_config.get('serialized_dashboard', {})
+            if isinstance(serialized_dashboard, str):
+                serialized_dashboard = json.loads(serialized_dashboard)
+            
             # Extract SQL queries from the dashboard datasets
-            import json
             dashboard_queries = []
             try:
-                serialized = dashboard_config.get('serialized_dashboard')
-                if isinstance(serialized, str):
-                    serialized = json.loads(serialized)
-                
-                datasets = serialized.get('datasets', []) if isinstance(serialized, dict) else []
+                datasets = serialized_dashboard.get('datasets', []) if isinstance(serialized_dashboard, dict) else []
                 print(f"📊 Found {len(datasets)} datasets")
                 
                 for idx, dataset in enumerate(datasets, 1):
@@ -236,16 +301,8 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
                 print(f"⚠️ Could not extract queries: {e}")
                 dashboard_config['extracted_queries'] = []
             
-            # AUTO-TEST QUERIES: Test all queries for permissions before displaying dashboard
-            success, error_alert = test_dashboard_queries_for_permissions(
-                dashboard_queries, 
-                workspace_client, 
-                warehouse_id
-            )
-            
-            if not success:
-                # Permission check failed - return error alert
-                return error_alert, "", None, None, None
+            # Permission tests on the extracted queries run in check_existing_dashboard_permissions
+            # once the preview is on screen (triggered by the 'perm-check-trigger' interval)
             
             # Get the actual dashboard name from config
             dashboard_name = dashboard_config.get('display_name', f'Dashboard {dashboard_id[:8]}')
@@ -297,11 +354,6 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
             #         )
             
             # Extract Genie Space setting (inside uiSettings)
-            serialized_dashboard = dashboard_config.get('serialized_dashboard', {})
-            if isinstance(serialized_dashboard, str):
-                import json
-                serialized_dashboard = json.loads(serialized_dashboard)
-            
             # genieSpace is inside uiSettings, at the same level as theme
             ui_settings = serialized_dashboard.get('uiSettings', {})
             genie_space = ui_settings.get('genieSpace', {})
@@ -317,33 +369,57 @@ def register_existing_dashboard_callbacks(app, dashboard_manager, workspace_clie
                 genie_enabled=genie_enabled
             )
             
-            success_msg = dbc.Row([
-                dbc.Col([
-                    dbc.Alert([
-                html.Strong("✅ Dashboard retrieved successfully!"),
-                html.Br(),
-                html.Small(f"Viewing: {dashboard_name}")
-            ], color="success")
-                ], width=6)
-            ])
+            success_msg = _make_success_alert(dashboard_name, permissions_verified=False)
+            
+            # One-shot interval fires right after the preview mounts to start the permission check
+            permission_check_trigger = dcc.Interval(id='perm-check-trigger', interval=250, n_intervals=0, max_intervals=1)
             
-            # Store dashboard ID, config, and actual name in SEPARATE stores for existing dashboard page
+            # Keep the full config server-side; the store only carries a {dashboard_id, version} reference
+            config_ref = store_dashboard_config(dashboard_id, dashboard_config)
+            
+            # Store dashboard ID, config reference, and actual name in SEPARATE stores for existing dashboard page
             # Reset metrics panel to placeholder and clear search
-            return success_msg, preview_card, dashboard_id, dashboard_config, dashboard_name, {'display': 'block'}, metrics_placeholder, None, ""
+            return success_msg, [preview_card, permission_check_trigger], dashboard_id, config_ref, dashboard_name, {'display': 'block'}, metrics_placeholder, None, "", None, None
             
         except Exception as e:
-            error_msg = dbc.Row([
-                dbc.Col([
-                    dbc.Alert([
-                html.Strong("❌ Error retrieving dashboard"),
-                html.Br(),
-                html.Small(f"Error: {str(e)}"),
-                html.Br(),
-                html.Small("Please verify the dashboard ID is correct and the dashboard exists.")
-            ], color="danger")
-                ], width=6)
-            ])
-            return error_msg, "", None, None, None, {'display': 'none'}, metrics_placeholder, None, ""
+            error_msg = _make_error_alert(str(e))
+            return error_msg, "", None, None, None, {'display': 'none'}, metrics_placeholder, None, "", None, None
+    
+    
+    # ============================================================================
+    # DEFERRED PERMISSION CHECK CALLBACK
+    # ============================================================================
+    
+    @app.callback(
+        [Output('retrieve-dashboard-status', 'children', allow_duplicate=True),
+         Output('existing-dashboard-preview', 'children', allow_duplicate=True),
+         Output('existing-dashboard-id', 'data', allow_duplicate=True),
+         Output('existing-dashboard-config', 'data', allow_duplicate=True),
+         Output('existing-dashboard-name', 'data', allow_duplicate=True),
+         Output('metrics-panel-container', 'style', allow_duplicate=True)],
+        Input('perm-check-trigger', 'n_intervals'),
+        [State('existing-dashboard-config', 'data'),
+         State('existing-dashboard-name', 'data')],
+        prevent_initial_call=True
+    )
+    def check_existing_dashboard_permissions(n_intervals, config_ref, dashboard_name):
+        """Test the retrieved dashboard's queries for permissions after the preview is rendered"""
+        dashboard_config = get_cached_dashboard_config(config_ref)
+        if not n_intervals or not dashboard_config:
+            raise PreventUpdate
+        
+        # AUTO-TEST QUERIES: Test all queries for permissions
+        success, error_alert = test_dashboard_queries_for_permissions(
+            dashboard_config.get('extracted_queries', []),
+            workspace_client,
+            warehouse_id
+        )
+        
+        if not success:
+            # Permission check failed - remove the preview and clear the stored dashboard
+            return error_alert, "", None, None, None, {'display': 'none'}
+        
+        return _make_success_alert(dashboard_name, permissions_verified=True), no_update, no_update, no_update, no_update, no_update
     
     
     
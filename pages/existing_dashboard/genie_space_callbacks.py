@@ -9,6 +9,7 @@ import time
 import copy
 from dash import callback, Output, Input, State, no_update, html
 import dash_bootstrap_components as dbc
+from utils.dashboard_config_cache import store_dashboard_config, get_cached_dashboard_config
 
 
 def create_dashboard_card_with_genie_toggle(dashboard_id, dashboard_name, embed_url, genie_enabled):
@@ -95,8 +96,9 @@ def register_genie_space_callbacks(app, dashboard_manager):
          State('existing-dashboard-name', 'data')],
         prevent_initial_call=True
     )
-    def toggle_genie_space(genie_enabled, dashboard_id, dashboard_config, dashboard_name):
+    def toggle_genie_space(genie_enabled, dashboard_id, config_ref, dashboard_name):
         """Toggle Genie Space setting and update dashboard"""
+        dashboard_config = get_cached_dashboard_config(config_ref)
         
         print(f"🔘 Genie Space toggle callback triggered! Value: {genie_enabled}")
         print(f"   Dashboard ID: {dashboard_id}")
@@ -113,7 +115,14 @@ def register_genie_space_callbacks(app, dashboard_manager):
             serialized = dashboard_config.get('serialized_dashboard', {})
             if isinstance(serialized, str):
                 serialized = json.loads(serialized)
-            
+
+            # Skip the Databricks write when the switch already matches the stored config
+            # (e.g. programmatic value restores after the preview card is re-rendered)
+            current_enabled = serialized.get('uiSettings', {}).get('genieSpace', {}).get('isEnabled', False)
+            if current_enabled == genie_enabled:
+                print(f"⏭️ Genie Space already {'enabled' if genie_enabled else 'disabled'} - skipping update")
+                return no_update, no_update, no_update
+
             updated_config = copy.deepcopy(serialized)
             
             # genieSpace is inside uiSettings, not at top level!
@@ -156,16 +165,22 @@ def register_genie_space_callbacks(app, dashboard_manager):
             verified_genie = verified_ui_settings.get('genieSpace', {})
             print(f"✅ Verified uiSettings.genieSpace in Databricks: isEnabled={verified_genie.get('isEnabled')}, enablementMode={verified_genie.get('enablementMode')}")
             
+            # The Lakeview embed has no postMessage API for settings changes, so the iframe
+            # has to be reloaded to pick up the Genie button. Only do that (and re-run all the
+            # embedded dashboard queries) when the published dashboard actually changed.
             if verified_genie.get('isEnabled') != genie_enabled:
                 print(f"⚠️ WARNING: Expected isEnabled={genie_enabled}, but got {verified_genie.get('isEnabled')}")
-            
-            new_embed_url = dashboard_manager.get_embed_url(dashboard_id)
-            
-            # Add cache-busting parameter to force refresh
-            cache_buster = f"?_refresh={int(time.time() * 1000)}"
-            new_embed_url_with_refresh = new_embed_url + cache_buster
-            
-            print(f"🔗 New embed URL: {new_embed_url_with_refresh[:100]}...")
+                print("⏭️ Keeping current iframe - published dashboard unchanged")
+                new_embed_url_with_refresh = no_update
+            else:
+                new_embed_url = dashboard_manager.get_embed_url(dashboard_id)
+                
+                # Add cache-busting parameter to force refresh (embed URL already carries ?o=...)
+                separator = '&' if '?' in new_embed_url else '?'
+                cache_buster = f"{separator}_refresh={time.time_ns() // 1_000_000}"
+                new_embed_url_with_refresh = new_embed_url + cache_buster
+                
+                print(f"🔗 New embed URL: {new_embed_url_with_refresh[:100]}...")
             
             # Update stored config
             full_updated_config = {
@@ -177,7 +192,7 @@ def register_genie_space_callbacks(app, dashboard_manager):
             status_text = " Enabled" if genie_enabled else " Disabled"
             
             print(f"✅ Dashboard updated with Genie Space = {genie_enabled}")
-            return new_embed_url_with_refresh, status_text, full_updated_config
+            return new_embed_url_with_refresh, status_text, store_dashboard_config(dashboard_id, full_updated_config)
             
         except Exception as e:
             import traceback
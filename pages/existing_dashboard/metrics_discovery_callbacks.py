@@ -5,229 +5,192 @@ Handles callbacks for analyzing dashboard metrics and providing explanations
 of how each metric is calculated using LLM.
 """
 
-import json
+import re
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from dash import callback, Output, Input, State, no_update, html, callback_context, dcc
 import dash_bootstrap_components as dbc
+from utils.dashboard_config_cache import get_cached_dashboard_config
 
+log = logging.getLogger(__name__)
 
-def analyze_dashboard_metrics(dashboard_config, llm_client):
+
+def _canonical_json(obj):
+    """obj as key-sorted JSON bytes, so equal configs hash the same"""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+
+# LLM analysis text (least recently used evicted first), cached under two keys:
+#   - L1: hash of the serialized dashboard (exact match, checked before any parsing)
+#   - L2: 'fp:' + semantic fingerprint of the extracted widgets (survives layout-only re-saves)
+_ANALYSIS_CACHE_SIZE = 64
+_ANALYSIS_CACHE = OrderedDict()
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+# Bounded pool for the blocking LLM calls (shared by all users of the metrics panel)
+_LLM_MAX_CONCURRENCY = 4
+_LLM_TIMEOUT_SECONDS = 180
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=_LLM_MAX_CONCURRENCY, thread_name_prefix='metrics-llm')
+
+# Streaming analysis jobs, keyed like _ANALYSIS_CACHE (guarded by _ANALYSIS_CACHE_LOCK).
+# Each job holds the executor future and the markdown chunks received so far; concurrent
+# requests for the same dashboard config poll the same job (single-flight).
+_JOBS_SIZE = 16
+_JOBS = OrderedDict()
+
+
+def _config_cache_key(serialized):
+    """Stable content hash of a parsed serialized dashboard"""
+    return hashlib.blake2b(_canonical_json(serialized), digest_size=16).hexdigest()
+
+
+def _fingerprint(widget_summaries, datasets, referenced_datasets):
     """
-    Analyze dashboard widgets and explain how each metric is calculated.
+    Order-insensitive hash of everything the analysis depends on.
     
-    Args:
-        dashboard_config: Dashboard configuration dictionary
-        llm_client: OpenAI LLM client
-        
-    Returns:
-        tuple: (display_component, analysis_text)
+    Covers widget titles, types, fields and axes plus the SQL of the referenced datasets,
+    but not layout positions or page structure, so moving widgets around reuses the analysis.
     """
-    try:
-        # Extract serialized dashboard
-        if isinstance(dashboard_config, dict):
-            if 'serialized_dashboard' in dashboard_config:
-                serialized = dashboard_config['serialized_dashboard']
-            else:
-                serialized = dashboard_config
-        else:
-            serialized = dashboard_config
-        
-        # Ensure serialized is a dict (parse if it's a string)
-        if isinstance(serialized, str):
-            serialized = json.loads(serialized)
-        
-        # Debug: Print the top-level structure
-        print(f"DEBUG: Dashboard config type: {type(serialized)}")
-        print(f"DEBUG: Dashboard config keys: {list(serialized.keys()) if isinstance(serialized, dict) else 'Not a dict'}")
-        
-        # Extract all pages and datasets
-        pages = serialized.get('pages', [])
-        datasets = serialized.get('datasets', [])
-        
-        print(f"DEBUG: Found {len(pages)} pages and {len(datasets)} datasets")
-        
-        # Build analysis prompt
-        widget_summaries = []
-        
-        print(f"Analyzing dashboard: {len(pages)} pages, {len(datasets)} datasets")
+    widgets = sorted(
+        repr((w.title, w.type, sorted(map(repr, w.query_fields)), w.value_field, w.x_field, w.y_field, w.color_field))
+        for w in widget_summaries
+    )
+    queries = sorted(
+        repr((d.get('name'), d.get('queryLines') or d.get('query')))
+        for d in datasets
+        if d.get('name') in referenced_datasets
+    )
+    return 'fp:' + hashlib.blake2b(_canonical_json([widgets, queries]), digest_size=16).hexdigest()
+
+
+def _cache_analysis(cache_keys, analysis_text):
+    """Store an analysis under each of cache_keys"""
+    with _ANALYSIS_CACHE_LOCK:
+        for key in cache_keys:
+            _ANALYSIS_CACHE[key] = analysis_text
+        while len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_SIZE:
+            _ANALYSIS_CACHE.popitem(last=False)
+
+
+# Style of the analysis markdown (shared, never mutated by Dash)
+_MARKDOWN_STYLE = {
+    'height': '750px',  # Adjusted for search bar
+    'overflowY': 'auto',
+    'fontSize': '0.875rem',  # Smaller font (14px)
+    'lineHeight': '1.5',
+    'padding': '10px'
+}
+
+
+def _build_display(analysis_text):
+    """
+    Build the metrics panel component for an analysis text.
+    
+    Components are rebuilt per response rather than cached, only the text is cached.
+    """
+    # Format the display component (no duplicate header, smaller font, smaller widget titles)
+    return html.Div([
+        dcc.Markdown(analysis_text, className="metrics-analysis-content", style=_MARKDOWN_STYLE)
+    ])
+
+
+# Upper bounds on what gets sent to the LLM. Larger dashboards would take long to extract
+# and still overflow the model context, so they fail fast with an explanation instead.
+_MAX_WIDGETS = 200
+_MAX_FIELDS_PER_WIDGET = 50
+
+
+# Shared read-only defaults for missing keys (avoids allocating a fresh {} / [] per lookup)
+_ED = {}
+_EL = ()
+
+
+def _iter_widgets(pages):
+    """Yield (page_name, widget_idx, widget) for every layout item across all pages"""
+    for page_idx, page in enumerate(pages):
+        page_name = page.get('displayName', f'Page {page_idx + 1}')
+        layouts = page.get('layout') or _EL
         
-        for page_idx, page in enumerate(pages):
-            print(f"DEBUG: Page {page_idx} keys: {list(page.keys())}")
-            page_name = page.get('displayName', f'Page {page_idx + 1}')
-            layouts = page.get('layout', [])
-            
-            print(f"   Page '{page_name}': {len(layouts)} layout items")
-            
-            # Debug: check if layouts is a list or something else
-            print(f"DEBUG: Layouts type: {type(layouts)}, is list: {isinstance(layouts, list)}")
-            
-            for widget_idx, layout in enumerate(layouts):
-                # Debug: check layout structure
-                print(f"DEBUG: Layout {widget_idx} type: {type(layout)}, keys: {list(layout.keys()) if isinstance(layout, dict) else 'Not a dict'}")
-                
-                widget = layout.get('widget', {})
-                position = layout.get('position', {})
-                
-                # Debug: print widget keys to see what's available
-                widget_keys = list(widget.keys()) if isinstance(widget, dict) else []
-                print(f"      Widget {widget_idx}: has widget={widget is not None}, widget keys = {widget_keys}")
-                
-                # CRITICAL: Extract the queries array (contains actual SQL expressions)
-                widget_queries = widget.get('queries', [])
-                query_fields = []
-                for query in widget_queries:
-                    query_def = query.get('query', {})
-                    fields = query_def.get('fields', [])
-                    for field in fields:
-                        query_fields.append({
-                            'name': field.get('name'),
-                            'expression': field.get('expression')
-                        })
-                
-                print(f"      Widget {widget_idx} query fields: {query_fields}")
-                
-                # Extract widget spec (the display configuration)
-                widget_spec = widget.get('spec', {})
-                widget_type_raw = widget_spec.get('widgetType', 'unknown')
-                frame = widget_spec.get('frame', {})
-                encodings = widget_spec.get('encodings', {})
-                
-                # Get meaningful title from frame
-                widget_title = frame.get('title', f'{widget_type_raw} Widget')
-                
-                # Determine widget type and extract key information
-                if widget_type_raw == 'counter':
-                    widget_type = 'Counter (KPI)'
-                    value_field = encodings.get('value', {}).get('fieldName')
-                    widget_config = {
-                        'value_field': value_field,
-                        'query_fields': query_fields,
-                        'label': widget_title
-                    }
-                    
-                elif widget_type_raw in ['bar', 'line', 'area', 'scatter']:
-                    widget_type = f'{widget_type_raw.title()} Chart'
-                    x_field = encodings.get('x', {}).get('fieldName')
-                    y_field = encodings.get('y', {}).get('fieldName')
-                    color_field = encodings.get('color', {}).get('fieldName')
-                    
-                    widget_config = {
-                        'x_field': x_field,
-                        'y_field': y_field,
-                        'color_field': color_field,
-                        'query_fields': query_fields,
-                        'encodings': encodings
-                    }
-                    
-                elif widget_type_raw == 'table':
-                    widget_type = 'Table'
-                    widget_config = {
-                        'query_fields': query_fields
-                    }
-                    
-                elif widget_type_raw == 'filter':
-                    widget_type = 'Filter'
-                    widget_config = {
-                        'query_fields': query_fields
-                    }
-                    
-                else:
-                    # Unknown widget type
-                    widget_name = widget.get('name', f'Widget {widget_idx + 1}')
-                    print(f"      ⚠️ Unknown widget type: {widget_type_raw}. Keys: {widget_keys}, Name: {widget_name}")
-                    widget_type = f'{widget_type_raw} Widget' if widget_type_raw != 'unknown' else 'Unknown Widget'
-                    widget_config = {
-                        'query_fields': query_fields,
-                        'raw_keys': widget_keys
-                    }
-                
-                # Always add the widget
-                widget_info = {
-                    'title': widget_title,
-                    'page': page_name,
-                    'type': widget_type,
-                    'config': widget_config
-                }
-                    
-                widget_summaries.append(widget_info)
-        
-        print(f"✅ Total widgets extracted: {len(widget_summaries)}")
-        
-        # Check if no widgets found
-        if len(widget_summaries) == 0:
-            # Dump first 500 chars of serialized config for debugging
-            config_preview = str(serialized)[:500] if serialized else "None"
-            print(f"ERROR: No widgets found. Config preview: {config_preview}")
-            
-            error_msg = dbc.Alert([
-                html.Strong("⚠️ No widgets found in this dashboard"),
-                html.Br(),
-                html.Small("The dashboard configuration doesn't contain any recognizable widgets (charts, counters, tables, filters)."),
-                html.Br(),
-                html.Small("Check the app logs for the dashboard structure."),
-                html.Br(),
-                html.Small(f"Debug: Found {len(pages)} pages, {len(datasets)} datasets")
-            ], color="warning")
-            return error_msg, None
-        
-        # Extract dataset queries
-        dataset_queries = []
-        for dataset_idx, dataset in enumerate(datasets):
-            dataset_name = dataset.get('displayName', dataset.get('name', f'Dataset {dataset_idx}'))
-            query_lines = dataset.get('queryLines', [])
-            query = ''.join(query_lines) if query_lines else dataset.get('query', '')
-            
-            dataset_queries.append({
-                'index': dataset_idx,
-                'name': dataset_name,
-                'query': query
-            })
+        log.debug("Page '%s': %d layout items", page_name, len(layouts))
         
-        # Build LLM prompt focusing on widgets only
-        prompt = f"""You are a data analyst expert. Analyze these dashboard widgets and explain what each metric measures and how it is calculated.
+        for widget_idx, layout in enumerate(layouts):
+            yield page_name, widget_idx, layout.get('widget') or _ED
+
+
+@dataclass
+class WidgetInfo:
+    """Metric widget parsed out of the serialized dashboard (input of the prompt builder)"""
+    __slots__ = ('title', 'page', 'type', 'query_fields', 'value_field', 'x_field', 'y_field', 'color_field')
+    
+    title: str
+    page: str
+    type: str
+    query_fields: tuple  # (name, expression) pairs
+    value_field: object
+    x_field: object
+    y_field: object
+    color_field: object
+
+
+# Parsed widgets per serialized dashboard hash, so re-analysis (retry after an LLM error,
+# evicted analysis) skips extraction (guarded by _ANALYSIS_CACHE_LOCK)
+_PARSED_CACHE = OrderedDict()
+
+# (value_field, x_field, y_field, color_field) for widgets without display encodings
+_NO_ENCODED_FIELDS = (None, None, None, None)
+
+
+def _extract_counter(encodings):
+    return (encodings.get('value') or _ED).get('fieldName'), None, None, None
+
+
+def _extract_xy(encodings):
+    return (
+        None,
+        (encodings.get('x') or _ED).get('fieldName'),
+        (encodings.get('y') or _ED).get('fieldName'),
+        (encodings.get('color') or _ED).get('fieldName')
+    )
+
+
+def _describe_unknown(widget_type_raw, widget, widget_idx):
+    """Display type for widget types missing from _TYPE_TABLE"""
+    if log.isEnabledFor(logging.DEBUG):
+        widget_name = widget.get('name', f'Widget {widget_idx + 1}')
+        log.debug("Unknown widget type: %s. Keys: %s, Name: %s", widget_type_raw, list(widget.keys()), widget_name)
+    return f'{widget_type_raw} Widget' if widget_type_raw != 'unknown' else 'Unknown Widget'
+
+
+# Widget type -> (display type, extractor returning (value_field, x_field, y_field, color_field))
+_TYPE_TABLE = {
+    'counter': ('Counter (KPI)', _extract_counter),
+    'bar': ('Bar Chart', _extract_xy),
+    'line': ('Line Chart', _extract_xy),
+    'area': ('Area Chart', _extract_xy),
+    'scatter': ('Scatter Chart', _extract_xy),
+}
+
+
+def _is_skipped_type(widget_type_raw):
+    """Tables and filters (filter-single-select, filter-date-range-picker, ...) carry no metrics"""
+    return widget_type_raw == 'table' or widget_type_raw.startswith('filter')
+
+
+# Static parts of the metrics analysis prompt (built once at import)
+_PROMPT_HEADER = """You are a data analyst expert. Analyze these dashboard widgets and explain what each metric measures and how it is calculated.
 
 **SQL Queries Available:**
 """
-        
-        for ds in dataset_queries:
-            prompt += f"\n**Query {ds['index']}:**\n```sql\n{ds['query']}\n```\n"
-        
-        prompt += f"\n\n**Dashboard Widgets ({len(widget_summaries)} total):**\n"
-        
-        for idx, widget in enumerate(widget_summaries, 1):
-            prompt += f"\n{idx}. **{widget['title']}** ({widget['type']})\n"
-            
-            # Extract query fields (the actual SQL expressions/calculations)
-            query_fields = widget['config'].get('query_fields', [])
-            if query_fields:
-                prompt += "   **Calculations:**\n"
-                for field in query_fields:
-                    field_name = field.get('name', 'N/A')
-                    field_expr = field.get('expression', 'N/A')
-                    prompt += f"   - `{field_name}` = {field_expr}\n"
-            
-            # Add widget-specific display configuration
-            if widget['type'] == 'Counter (KPI)':
-                value_field = widget['config'].get('value_field')
-                if value_field:
-                    prompt += f"   **Displays:** {value_field}\n"
-                    
-            elif 'Chart' in widget['type']:
-                x_field = widget['config'].get('x_field')
-                y_field = widget['config'].get('y_field')
-                color_field = widget['config'].get('color_field')
-                
-                if x_field or y_field:
-                    prompt += "   **Axes:**\n"
-                    if y_field:
-                        prompt += f"   - Y-axis: {y_field}\n"
-                    if x_field:
-                        prompt += f"   - X-axis: {x_field}\n"
-                    if color_field:
-                        prompt += f"   - Color by: {color_field}\n"
-            
-            prompt += "\n"
-        
-        prompt += """
+
+_WIDGET_FMT = "\n{idx}. **{title}** ({type})\n"
+
+_PROMPT_GUIDELINES = """
 
 **Your Task:**
 For each widget above, provide a concise explanation using the **SQL expressions provided in "Calculations"**.
@@ -250,49 +213,369 @@ For each widget above, provide a concise explanation using the **SQL expressions
 - Be concise (3-4 sentences per widget max)
 - Skip filters/tables - focus only on metrics (Counters and Charts)"""
 
-        # Call LLM (using Claude Sonnet for better analytical reasoning)
-        print(f"Analyzing dashboard metrics with LLM...")
-        response = llm_client.chat.completions.create(
-            model="databricks-claude-sonnet-4",
-            messages=[
-                {"role": "system", "content": "You are a data analyst expert who explains dashboard metrics in clear, business-friendly language."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=4000
-        )
-        
-        analysis_text = response.choices[0].message.content
-        
-        print(f"✅ Metrics analysis complete!")
-        
-        # Format the display component (no duplicate header, smaller font, smaller widget titles)
-        # Height accounts for search bar above (750px)
-        display_component = html.Div([
-            dcc.Markdown(
-                analysis_text,
-                className="metrics-analysis-content",
-                style={
-                    'height': '750px',  # Adjusted for search bar
-                    'overflowY': 'auto',
-                    'fontSize': '0.875rem',  # Smaller font (14px)
-                    'lineHeight': '1.5',
-                    'padding': '10px'
-                }
-            )
-        ])
-        
-        return display_component, analysis_text
-        
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        error_display = dbc.Alert([
-            html.Strong("❌ Error analyzing metrics"),
-            html.Br(),
-            html.Small(f"Error: {str(e)}")
-        ], color="danger")
+
+_SQL_LINE_COMMENT = re.compile(r'--[^\n]*')
+_SQL_BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _minify_sql(query):
+    """Strip comments and collapse whitespace so the prompt carries fewer tokens"""
+    query = _SQL_BLOCK_COMMENT.sub(' ', query)
+    query = _SQL_LINE_COMMENT.sub('', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+def _max_tokens_for(widget_count):
+    """Completion budget scaled to the number of widgets to explain (capped at 4000)"""
+    return min(4000, 120 * widget_count + 400)
+
+
+def _build_prompt(widget_summaries, datasets, referenced_datasets=None):
+    """
+    Build the LLM prompt describing the dashboard's SQL queries and widgets.
+    
+    Args:
+        widget_summaries: List of WidgetInfo
+        datasets: Datasets from the serialized dashboard
+        referenced_datasets: Dataset names used by the widgets; other datasets are left out
+            of the prompt (all datasets are included when this is empty)
+        
+    Returns:
+        str: Prompt text
+    """
+    # Build LLM prompt focusing on widgets only
+    # (collected in a list and joined once to avoid quadratic string concatenation)
+    parts = [_PROMPT_HEADER]
+    
+    # Dataset queries are formatted straight into the prompt in one pass
+    for dataset_idx, dataset in enumerate(datasets):
+        if referenced_datasets and dataset.get('name') not in referenced_datasets:
+            continue
+        query = _minify_sql(''.join(dataset.get('queryLines') or _EL) or dataset.get('query', ''))
+        parts.append(f"\n**Query {dataset_idx}:**\n```sql\n{query}\n```\n")
+    
+    parts.append(f"\n\n**Dashboard Widgets ({len(widget_summaries)} total):**\n")
+    
+    for idx, widget in enumerate(widget_summaries, 1):
+        parts.append(_WIDGET_FMT.format_map({'idx': idx, 'title': widget.title, 'type': widget.type}))
+        
+        # Query fields (the actual SQL expressions/calculations)
+        if widget.query_fields:
+            parts.append("   **Calculations:**\n")
+            for field_name, field_expr in widget.query_fields:
+                parts.append(f"   - `{field_name}` = {field_expr}\n")
+        
+        # Add widget-specific display configuration
+        if widget.type == 'Counter (KPI)':
+            if widget.value_field:
+                parts.append(f"   **Displays:** {widget.value_field}\n")
+                
+        elif 'Chart' in widget.type:
+            x_field = widget.x_field
+            y_field = widget.y_field
+            color_field = widget.color_field
+            
+            if x_field or y_field:
+                parts.append("   **Axes:**\n")
+                if y_field:
+                    parts.append(f"   - Y-axis: {y_field}\n")
+                if x_field:
+                    parts.append(f"   - X-axis: {x_field}\n")
+                if color_field:
+                    parts.append(f"   - Color by: {color_field}\n")
+        
+        parts.append("\n")
+    
+    parts.append(_PROMPT_GUIDELINES)
+    return "".join(parts)
+
+
+def _build_streaming_display(partial_text):
+    """Build the panel component shown while the analysis is still streaming in"""
+    if not partial_text:
+        return html.Div([
+            dbc.Spinner(size="sm", color="info", spinner_class_name="me-2"),
+            html.Small("Analyzing dashboard metrics...", className="text-muted")
+        ], className="d-flex align-items-center p-2")
+    
+    return html.Div([
+        _build_display(partial_text),
+        html.Small("⏳ Still generating...", className="text-muted ms-2")
+    ])
+
+
+def _call_llm(prompt, llm_client, max_tokens=4000, chunks=None):
+    """
+    Stream the metrics analysis from the LLM and return the full markdown answer.
+    
+    Markdown deltas are appended to chunks as they arrive so the panel can render
+    partial output while the completion is still running.
+    """
+    if chunks is None:
+        chunks = []
+    
+    # Call LLM (using Claude Sonnet for better analytical reasoning)
+    response = llm_client.chat.completions.create(
+        model="databricks-claude-sonnet-4",
+        messages=[
+            {"role": "system", "content": "You are a data analyst expert who explains dashboard metrics in clear, business-friendly language."},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=max_tokens,
+        stream=True
+    )
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            chunks.append(chunk.choices[0].delta.content)
+    return "".join(chunks)
+
+
+def _run_analysis(cache_keys, prompt, llm_client, max_tokens, chunks):
+    """Executor task: stream the LLM answer into chunks and cache the final text"""
+    analysis_text = _call_llm(prompt, llm_client, max_tokens, chunks)
+    
+    if analysis_text:
+        _cache_analysis(cache_keys, analysis_text)
+    
+    return analysis_text
+
+
+def _job_in_flight(job):
+    """Whether job is still running and younger than _LLM_TIMEOUT_SECONDS (a stale job gets replaced)"""
+    return (job is not None and not job['future'].done()
+            and time.monotonic() - job['started'] <= _LLM_TIMEOUT_SECONDS)
+
+
+def _start_analysis(cache_key, fingerprint, prompt, llm_client, max_tokens):
+    """Submit a streaming analysis job for cache_key unless one is already running"""
+    with _ANALYSIS_CACHE_LOCK:
+        if _job_in_flight(_JOBS.get(cache_key)):
+            return
+        
+        chunks = []
+        _JOBS[cache_key] = {
+            'chunks': chunks,
+            'started': time.monotonic(),
+            'future': _LLM_EXECUTOR.submit(_run_analysis, (cache_key, fingerprint), prompt, llm_client, max_tokens, chunks)
+        }
+        
+        # Evict the oldest finished jobs (running jobs are always kept so pollers can finish)
+        for key in [k for k, j in _JOBS.items() if j['future'].done()]:
+            if len(_JOBS) <= _JOBS_SIZE:
+                break
+            del _JOBS[key]
+
+
+def get_analysis_progress(job_key):
+    """
+    Read the current state of a streaming analysis job.
+    
+    Args:
+        job_key: Job key returned by analyze_dashboard_metrics
+        
+    Returns:
+        tuple: (done, analysis_text, error) - analysis_text is the partial text while running
+    """
+    with _ANALYSIS_CACHE_LOCK:
+        job = _JOBS.get(job_key)
+    
+    if job is None:
+        return True, None, "Analysis job not found (evicted or app restarted)"
+    
+    future = job['future']
+    if future.done():
+        error = future.exception()
+        if error is not None:
+            return True, None, str(error)
+        return True, future.result(), None
+    
+    if time.monotonic() - job['started'] > _LLM_TIMEOUT_SECONDS:
+        return True, None, f"LLM analysis did not finish within {_LLM_TIMEOUT_SECONDS}s"
+    
+    return False, "".join(job['chunks']), None
+
+
+def _parse_widgets(pages):
+    """
+    Extract the metric widgets of a dashboard.
+    
+    Args:
+        pages: Pages from the serialized dashboard
+        
+    Returns:
+        tuple: (list of WidgetInfo, frozenset of referenced dataset names). Extraction stops
+        once more than _MAX_WIDGETS widgets were found.
+    """
+    widget_summaries = []
+    referenced_datasets = set()
+    
+    for page_name, widget_idx, widget in _iter_widgets(pages):
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Widget %d keys=%s", widget_idx, list(widget.keys()))
+        
+        # Extract widget spec (the display configuration)
+        widget_spec = widget.get('spec') or _ED
+        widget_type_raw = widget_spec.get('widgetType', 'unknown')
+        
+        # Tables and filters aren't explained by the LLM - skip them before any extraction
+        # so neither their fields nor their datasets end up in the prompt
+        if _is_skipped_type(widget_type_raw):
+            continue
+        
+        # CRITICAL: Extract the queries array (contains actual SQL expressions)
+        query_defs = [query.get('query') or _ED for query in widget.get('queries') or _EL]
+        referenced_datasets.update(query_def.get('datasetName') for query_def in query_defs)
+        # (name, expression) pairs for every field of every query
+        query_fields = [
+            (field.get('name'), field.get('expression'))
+            for query_def in query_defs
+            for field in query_def.get('fields') or _EL
+        ]
+        if len(query_fields) > _MAX_FIELDS_PER_WIDGET:
+            omitted = len(query_fields) - _MAX_FIELDS_PER_WIDGET
+            query_fields = query_fields[:_MAX_FIELDS_PER_WIDGET]
+            query_fields.append(('...', f'({omitted} more fields truncated)'))
+        
+        log.debug("Widget %d query fields: %s", widget_idx, query_fields)
+        
+        frame = widget_spec.get('frame') or _ED
+        encodings = widget_spec.get('encodings') or _ED
+        
+        # Get meaningful title from frame
+        widget_title = frame.get('title', f'{widget_type_raw} Widget')
+        
+        # Determine widget type and extract key information
+        entry = _TYPE_TABLE.get(widget_type_raw)
+        if entry is not None:
+            widget_type, extractor = entry
+            encoded_fields = extractor(encodings)
+        else:
+            widget_type = _describe_unknown(widget_type_raw, widget, widget_idx)
+            encoded_fields = _NO_ENCODED_FIELDS
+        
+        widget_summaries.append(WidgetInfo(widget_title, page_name, widget_type, tuple(query_fields), *encoded_fields))
         
-        return error_display, None
+        if len(widget_summaries) > _MAX_WIDGETS:
+            break
+    
+    referenced_datasets.discard(None)
+    return widget_summaries, frozenset(referenced_datasets)
+
+
+def analyze_dashboard_metrics(dashboard_config, llm_client):
+    """
+    Analyze dashboard widgets and explain how each metric is calculated.
+    
+    Args:
+        dashboard_config: Dashboard configuration dictionary
+        llm_client: OpenAI LLM client
+        
+    Returns:
+        tuple: (display_component, analysis_text, job_key) - job_key is set when the
+        analysis is still streaming and has to be polled with get_analysis_progress
+    
+    Errors propagate to the calling callback, which logs them and formats the alert.
+    """
+    # Extract serialized dashboard (config wrapper, bare serialized dict, or JSON string)
+    serialized = dashboard_config
+    if type(serialized) is dict:
+        serialized = serialized.get('serialized_dashboard', serialized)
+    
+    # Ensure serialized is a dict (parse if it's a string)
+    if type(serialized) is str:
+        serialized = orjson.loads(serialized)
+    
+    # Return the cached analysis if this exact dashboard config was analyzed before
+    cache_key = _config_cache_key(serialized)
+    with _ANALYSIS_CACHE_LOCK:
+        cached_text = _ANALYSIS_CACHE.get(cache_key)
+        if cached_text is not None:
+            _ANALYSIS_CACHE.move_to_end(cache_key)
+        job = _JOBS.get(cache_key)
+        inflight = _job_in_flight(job)
+    if cached_text is not None:
+        print(f"⚡ Metrics analysis cache hit ({cache_key[:8]})")
+        return _build_display(cached_text), cached_text, None
+    
+    # Same config already being analyzed (double-click or another user) - share that LLM call
+    if inflight:
+        print(f"⏳ Joining in-flight metrics analysis ({cache_key[:8]})")
+        return _build_streaming_display("".join(job['chunks'])), None, cache_key
+    
+    # Extract all pages and datasets
+    pages = serialized.get('pages') or _EL
+    datasets = serialized.get('datasets') or _EL
+    
+    print(f"Analyzing dashboard: {len(pages)} pages, {len(datasets)} datasets")
+    
+    with _ANALYSIS_CACHE_LOCK:
+        parsed = _PARSED_CACHE.get(cache_key)
+        if parsed is not None:
+            _PARSED_CACHE.move_to_end(cache_key)
+    if parsed is None:
+        parsed = _parse_widgets(pages)
+        with _ANALYSIS_CACHE_LOCK:
+            _PARSED_CACHE[cache_key] = parsed
+            while len(_PARSED_CACHE) > _ANALYSIS_CACHE_SIZE:
+                _PARSED_CACHE.popitem(last=False)
+    widget_summaries, referenced_datasets = parsed
+    
+    if len(widget_summaries) > _MAX_WIDGETS:
+        print(f"⚠️ Dashboard exceeds {_MAX_WIDGETS} metric widgets - skipping analysis")
+        return dbc.Alert([
+            html.Strong(f"⚠️ Dashboard has more than {_MAX_WIDGETS} metric widgets"),
+            html.Br(),
+            html.Small(f"Metrics analysis is capped at {_MAX_WIDGETS} widgets. Please narrow the scope (e.g. split the dashboard into smaller ones).")
+        ], color="warning"), None, None
+    
+    print(f"✅ Total widgets extracted: {len(widget_summaries)}")
+    
+    # Check if no widgets found
+    if len(widget_summaries) == 0:
+        print(f"ERROR: No widgets found ({len(pages)} pages, {len(datasets)} datasets)")
+        # Dump first 500 chars of serialized config for debugging
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("No widgets found. Config preview: %s", str(serialized)[:500])
+        
+        error_msg = dbc.Alert([
+            html.Strong("⚠️ No metric widgets found in this dashboard"),
+            html.Br(),
+            html.Small("The dashboard configuration doesn't contain any metric widgets (charts, counters). Tables and filters are not analyzed."),
+            html.Br(),
+            html.Small("Check the app logs for the dashboard structure."),
+            html.Br(),
+            html.Small(f"Debug: Found {len(pages)} pages, {len(datasets)} datasets")
+        ], color="warning")
+        return error_msg, None, None
+    
+    # Same widgets/SQL analyzed before under a different layout - reuse it and promote to L1
+    fingerprint = _fingerprint(widget_summaries, datasets, referenced_datasets)
+    with _ANALYSIS_CACHE_LOCK:
+        cached_text = _ANALYSIS_CACHE.get(fingerprint)
+    if cached_text is not None:
+        print(f"⚡ Metrics analysis fingerprint cache hit ({fingerprint[3:11]})")
+        _cache_analysis((cache_key, fingerprint), cached_text)
+        return _build_display(cached_text), cached_text, None
+    
+    prompt = _build_prompt(widget_summaries, datasets, referenced_datasets)
+    max_tokens = _max_tokens_for(len(widget_summaries))
+    
+    # The LLM call streams on the bounded executor (at most _LLM_MAX_CONCURRENCY
+    # analyses in flight) and the panel polls the job for partial markdown
+    print(f"Analyzing dashboard metrics with LLM...")
+    _start_analysis(cache_key, fingerprint, prompt, llm_client, max_tokens)
+    
+    return _build_streaming_display(""), None, cache_key
+
+
+def _build_error_alert(error):
+    """Alert shown in the metrics panel when an analysis fails"""
+    return dbc.Alert([
+        html.Strong("❌ Error analyzing metrics"),
+        html.Br(),
+        html.Small(f"Error: {error}")
+    ], color="danger")
 
 
 def register_metrics_discovery_callbacks(app, llm_client):
@@ -301,43 +584,75 @@ def register_metrics_discovery_callbacks(app, llm_client):
     
     Args:
         app: Dash app instance
-        llm_client: OpenAI LLM client for metrics analysis
+        llm_client: OpenAI LLM client for metrics analysis. Shared across calls, so it
+            should be built once with a keepalive httpx.Client (see app.py)
     """
     
     @callback(
         [Output('metrics-discovery-content', 'children'),
-         Output('metrics-full-analysis', 'data')],
+         Output('metrics-full-analysis', 'data'),
+         Output('metrics-analysis-job', 'data'),
+         Output('metrics-discovery-stream', 'children'),
+         Output('metrics-stream-interval', 'disabled')],
         Input('existing-metrics-discovery-btn', 'n_clicks'),
         State('existing-dashboard-config', 'data'),
         prevent_initial_call=True
     )
-    def update_metrics_discovery_panel(n_clicks, dashboard_config):
+    def update_metrics_discovery_panel(n_clicks, config_ref):
         """Analyze dashboard metrics and update side panel"""
         
         if not n_clicks:
-            return no_update, no_update
+            return no_update, no_update, no_update, no_update, no_update
         
         # Check if dashboard is loaded
+        dashboard_config = get_cached_dashboard_config(config_ref)
         if not dashboard_config:
-            return dbc.Alert("⚠️ No dashboard loaded", color="warning"), None
+            return dbc.Alert("⚠️ No dashboard loaded", color="warning"), None, None, None, True
         
         try:
             # Check if LLM client is available
             if not llm_client:
-                return dbc.Alert("⚠️ LLM client not available for metrics analysis", color="warning"), None
+                return dbc.Alert("⚠️ LLM client not available for metrics analysis", color="warning"), None, None, None, True
             
             # Analyze dashboard metrics
-            display_component, analysis_text = analyze_dashboard_metrics(dashboard_config, llm_client)
-            return display_component, analysis_text
+            display_component, analysis_text, job_key = analyze_dashboard_metrics(dashboard_config, llm_client)
+            if job_key is None:
+                return display_component, analysis_text, None, None, True
+            
+            # Analysis is streaming - show progress above the (emptied) content area and start polling
+            return html.Div(), None, job_key, display_component, False
             
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return dbc.Alert([
-                html.Strong("❌ Error analyzing metrics"),
-                html.Br(),
-                html.Small(f"Error: {str(e)}")
-            ], color="danger"), None
+            log.exception("Metrics analysis failed")
+            return _build_error_alert(e), None, None, None, True
+    
+    
+    @callback(
+        [Output('metrics-discovery-stream', 'children', allow_duplicate=True),
+         Output('metrics-discovery-content', 'children', allow_duplicate=True),
+         Output('metrics-full-analysis', 'data', allow_duplicate=True),
+         Output('metrics-stream-interval', 'disabled', allow_duplicate=True)],
+        Input('metrics-stream-interval', 'n_intervals'),
+        State('metrics-analysis-job', 'data'),
+        prevent_initial_call=True
+    )
+    def stream_metrics_analysis(n_intervals, job_key):
+        """Render the partial analysis while the LLM streams and the final one when it completes"""
+        
+        if not job_key:
+            return no_update, no_update, no_update, True
+        
+        done, analysis_text, error = get_analysis_progress(job_key)
+        
+        if error:
+            log.error("Metrics analysis failed: %s", error)
+            return None, _build_error_alert(error), None, True
+        
+        if done:
+            print(f"✅ Metrics analysis complete!")
+            return None, _build_display(analysis_text), analysis_text, True
+        
+        return _build_streaming_display(analysis_text), no_update, no_update, False
     
     
     @callback(
@@ -354,19 +669,7 @@ def register_metrics_discovery_callbacks(app, llm_client):
         
         # If no search term, show full analysis
         if not search_term or not search_term.strip():
-            return html.Div([
-                dcc.Markdown(
-                    full_analysis,
-                    className="metrics-analysis-content",
-                    style={
-                        'height': '750px',
-                        'overflowY': 'auto',
-                        'fontSize': '0.875rem',
-                        'lineHeight': '1.5',
-                        'padding': '10px'
-                    }
-                )
-            ])
+            return _build_display(full_analysis)
         
         # Filter the analysis by search term (case-insensitive)
         search_term_lower = search_term.lower().strip()
@@ -404,19 +707,7 @@ def register_metrics_discovery_callbacks(app, llm_client):
         # Combine filtered sections
         filtered_text = '\n\n'.join(matching_sections)
         
-        return html.Div([
-            dcc.Markdown(
-                filtered_text,
-                className="metrics-analysis-content",
-                style={
-                    'height': '750px',
-                    'overflowY': 'auto',
-                    'fontSize': '0.875rem',
-                    'lineHeight': '1.5',
-                    'padding': '10px'
-                }
-            )
-        ])
+        return _build_display(filtered_text)
     
     
     print("✅ Metrics discovery callbacks registered successfully")
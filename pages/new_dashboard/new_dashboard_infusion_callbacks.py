@@ -8,18 +8,234 @@ Handles post-generation design infusion for new dashboards, including:
 """
 
 from dash import callback, Output, Input, State, no_update, callback_context, html
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-import json
+import orjson
 import time
-import copy
+import hashlib
+import functools
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+from utils.dashboard_config_cache import store_dashboard_config, get_cached_dashboard_config
 from dashboard_management_functions.design_infusion import (
+    DESIGN_LLM_TIMEOUT_SECONDS,
     extract_design_from_image,
     generate_design_with_analysis,
     refine_design_from_feedback
 )
 
 
+# Parsed serialized_dashboard JSON strings keyed by content hash (least recently used evicted first).
+# The parsed dicts are shared between callbacks, so callers must not mutate them.
+_PARSED_SERIALIZED_SIZE = 32
+_PARSED_SERIALIZED = OrderedDict()
+_PARSED_SERIALIZED_LOCK = threading.Lock()
+
+
+def _parse_serialized(serialized):
+    """
+    Return serialized_dashboard as a dict, reusing earlier parses of the same JSON string
+    
+    Args:
+        serialized: serialized_dashboard from the dashboard config (dict or JSON string)
+        
+    Returns:
+        dict: Parsed serialized dashboard (read-only)
+    """
+    if not isinstance(serialized, str):
+        return serialized
+    
+    key = hashlib.blake2b(serialized.encode(), digest_size=16).digest()
+    with _PARSED_SERIALIZED_LOCK:
+        parsed = _PARSED_SERIALIZED.get(key)
+        if parsed is not None:
+            _PARSED_SERIALIZED.move_to_end(key)
+            return parsed
+    
+    parsed = orjson.loads(serialized)
+    with _PARSED_SERIALIZED_LOCK:
+        _PARSED_SERIALIZED[key] = parsed
+        while len(_PARSED_SERIALIZED) > _PARSED_SERIALIZED_SIZE:
+            _PARSED_SERIALIZED.popitem(last=False)
+    return parsed
+
+
+# Design LLM calls run on a small shared pool so at most _LLM_MAX_CONCURRENCY of them are
+# in flight across all users. The callbacks only submit the call and return; the stream poll
+# gives up on a job after _LLM_TIMEOUT_SECONDS.
+_LLM_MAX_CONCURRENCY = 4
+_LLM_TIMEOUT_SECONDS = DESIGN_LLM_TIMEOUT_SECONDS
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=_LLM_MAX_CONCURRENCY, thread_name_prefix='infusion-llm')
+
+# Streaming design jobs keyed by job ID (oldest finished job evicted first). Each job holds the executor
+# future, the LLM response text received so far and what the poll needs to finish the step.
+_DESIGN_JOBS_SIZE = 16
+_DESIGN_JOBS = OrderedDict()
+_DESIGN_JOBS_LOCK = threading.Lock()
+
+
+def _start_design_job(kind, fn, args, context=None):
+    """
+    Submit a streaming design LLM call to the shared pool
+    
+    Args:
+        kind: 'generate' or 'refine' - selects how the poll applies the result
+        fn: Design function accepting a chunks keyword (generate_design_with_analysis, refine_design_from_feedback)
+        args: Positional arguments for fn
+        context: Extra values the poll needs once the result is in (e.g. the original prompt)
+        
+    Returns:
+        str: Job ID to keep in the new-dashboard-design-job store
+    """
+    chunks = []
+    job_id = uuid.uuid4().hex
+    job = {
+        'kind': kind,
+        'chunks': chunks,
+        'shown': -1,
+        'context': context or {},
+        'started': time.monotonic(),
+        'future': _LLM_EXECUTOR.submit(fn, *args, chunks=chunks)
+    }
+    with _DESIGN_JOBS_LOCK:
+        _DESIGN_JOBS[job_id] = job
+        # Evict the oldest finished jobs (running jobs are always kept so pollers can finish)
+        for key in [k for k, j in _DESIGN_JOBS.items() if j['future'].done()]:
+            if len(_DESIGN_JOBS) <= _DESIGN_JOBS_SIZE:
+                break
+            del _DESIGN_JOBS[key]
+    return job_id
+
+
+_STREAM_STYLE = {
+    'whiteSpace': 'pre-wrap',
+    'fontSize': '0.8rem',
+    'maxHeight': '300px',
+    'overflowY': 'auto',
+    'backgroundColor': '#f8f9fa',
+    'padding': '10px',
+    'borderRadius': '5px'
+}
+
+
+def _build_streaming_display(partial):
+    """Reasoning panel content while the design LLM response is still streaming"""
+    return html.Div([
+        html.Small("⏳ AI is analyzing your dashboard and writing its design reasoning...", className="text-muted"),
+        html.Pre(partial, style=_STREAM_STYLE, className="mt-2 mb-0") if partial else None
+    ])
+
+
+# Light-mode theme colors captured as the previous design for refinement, with their defaults
+_PREV_DESIGN_DEFAULTS = (
+    ('canvasBackgroundColor', '#FAFAFB'),
+    ('widgetBackgroundColor', '#FFFFFF'),
+    ('widgetBorderColor', '#E0E0E0'),
+    ('fontColor', '#11171C'),
+)
+
+
+# Outputs of the infusion router by name. The handlers return {output name: value} dicts
+# and _spread orders them into the router's output list.
+_ROUTER_OUTPUTS = {
+    'analysis_display': Output('new-dashboard-design-analysis-display', 'children'),
+    'reasoning_display': Output('new-dashboard-design-reasoning-display', 'children'),
+    'validation_section': Output('new-dashboard-design-validation-section', 'style'),
+    'analysis_text': Output('new-dashboard-design-analysis-text', 'data'),
+    'reasoning_text': Output('new-dashboard-design-reasoning-text', 'data'),
+    'ui_settings': Output('new-dashboard-design-generated-ui-settings', 'data'),
+    'original_prompt': Output('new-dashboard-original-design-prompt', 'data'),
+    'previous_design': Output('new-dashboard-previous-design-data', 'data'),
+    'status': Output('post-gen-infusion-status', 'children'),
+    'embed_refresh': Output('new-dashboard-embed-refresh', 'data'),
+    'modal_open': Output('infusion-modal', 'is_open', allow_duplicate=True),
+    'config': Output('current-dashboard-config', 'data', allow_duplicate=True),
+    'design_job': Output('new-dashboard-design-job', 'data'),
+    'stream_disabled': Output('new-dashboard-design-stream-interval', 'disabled'),
+    'dashboard_id': Output('deployed-dashboard-id', 'data', allow_duplicate=True),
+    'prompt': Output('post-gen-infusion-prompt', 'value'),
+    'refinement_open': Output('new-dashboard-refinement-collapse', 'is_open', allow_duplicate=True),
+    'upload_contents': Output('post-gen-infusion-upload', 'contents'),
+    'generate_disabled': Output('post-gen-generate-design-btn', 'disabled'),
+    'validate_disabled': Output('new-dashboard-validate-design-btn', 'disabled'),
+    'refine_disabled': Output('new-dashboard-apply-refinement-btn', 'disabled'),
+}
+
+# Outputs of the stream poll by name (same names as the router outputs they duplicate)
+_POLL_OUTPUTS = {
+    'analysis_display': Output('new-dashboard-design-analysis-display', 'children', allow_duplicate=True),
+    'reasoning_display': Output('new-dashboard-design-reasoning-display', 'children', allow_duplicate=True),
+    'validation_section': Output('new-dashboard-design-validation-section', 'style', allow_duplicate=True),
+    'analysis_text': Output('new-dashboard-design-analysis-text', 'data', allow_duplicate=True),
+    'reasoning_text': Output('new-dashboard-design-reasoning-text', 'data', allow_duplicate=True),
+    'ui_settings': Output('new-dashboard-design-generated-ui-settings', 'data', allow_duplicate=True),
+    'original_prompt': Output('new-dashboard-original-design-prompt', 'data', allow_duplicate=True),
+    'previous_design': Output('new-dashboard-previous-design-data', 'data', allow_duplicate=True),
+    'status': Output('post-gen-infusion-status', 'children', allow_duplicate=True),
+    'refinement_open': Output('new-dashboard-refinement-collapse', 'is_open', allow_duplicate=True),
+    'stream_disabled': Output('new-dashboard-design-stream-interval', 'disabled', allow_duplicate=True),
+    'stream_panel': Output('new-dashboard-design-stream', 'children'),
+    'generate_disabled': Output('post-gen-generate-design-btn', 'disabled', allow_duplicate=True),
+    'validate_disabled': Output('new-dashboard-validate-design-btn', 'disabled', allow_duplicate=True),
+    'refine_disabled': Output('new-dashboard-apply-refinement-btn', 'disabled', allow_duplicate=True),
+}
+
+
+def _spread(values, outputs):
+    """
+    Order a handler's outputs as a callback's output list, no_update for the ones it didn't set
+    
+    Args:
+        values: {output name: value} returned by a handler
+        outputs: The callback's {output name: Output} (_ROUTER_OUTPUTS or _POLL_OUTPUTS)
+        
+    Returns:
+        tuple: One value per callback output
+    """
+    unknown = values.keys() - outputs.keys()
+    if unknown:
+        raise KeyError(f"Not outputs of this callback: {sorted(unknown)}")
+    return tuple(values.get(name, no_update) for name in outputs)
+
+
+# Design outputs of a handler that clears the design panel and leaves the preview,
+# modal and config untouched (built once instead of on every early return)
+_HIDDEN = {'display': 'none'}
+_EMPTY_RESPONSE = {
+    'analysis_display': "",
+    'reasoning_display': "",
+    'validation_section': _HIDDEN,
+    'analysis_text': None,
+    'reasoning_text': None,
+    'ui_settings': None,
+    'original_prompt': None,
+    'previous_design': None,
+    'status': "",
+}
+
+
+def _with_alert(alert):
+    """_EMPTY_RESPONSE with alert shown in the design analysis display"""
+    return {**_EMPTY_RESPONSE, 'analysis_display': alert}
+
+
+# The workflow buttons stay disabled from job submission until the stream poll finishes the job,
+# so repeat clicks don't queue duplicate LLM calls behind it
+_BUTTONS_LOCKED = {'generate_disabled': True, 'validate_disabled': True, 'refine_disabled': True}
+
+# Stream poll outputs once a job is finished: stop polling, clear the partial response, unlock the buttons
+_POLL_DONE = {
+    'stream_disabled': True,
+    'stream_panel': "",
+    'generate_disabled': False,
+    'validate_disabled': False,
+    'refine_disabled': False,
+}
+
+
 def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_client, llm_client):
     """
     Register all infusion callbacks for the new dashboard page (post-generation).
@@ -31,47 +247,24 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
         llm_client: LLM client for design generation
     """
     
-    @callback(
-        [Output('new-dashboard-design-analysis-display', 'children'),
-         Output('new-dashboard-design-reasoning-display', 'children'),
-         Output('new-dashboard-design-validation-section', 'style'),
-         Output('new-dashboard-design-analysis-text', 'data'),
-         Output('new-dashboard-design-reasoning-text', 'data'),
-         Output('new-dashboard-design-generated-ui-settings', 'data'),
-         Output('new-dashboard-original-design-prompt', 'data'),
-         Output('new-dashboard-previous-design-data', 'data'),
-         Output('post-gen-infusion-status', 'children'),
-         Output('dashboard-preview', 'children', allow_duplicate=True),
-         Output('infusion-modal', 'is_open', allow_duplicate=True),
-         Output('current-dashboard-config', 'data', allow_duplicate=True)],
-        [Input('post-gen-infusion-upload', 'contents'),
-         Input('post-gen-generate-design-btn', 'n_clicks')],
-        [State('post-gen-infusion-upload', 'filename'),
-         State('post-gen-infusion-prompt', 'value'),
-         State('deployed-dashboard-id', 'data'),
-         State('current-dashboard-config', 'data'),
-         State('current-dashboard-name', 'data')],
-        prevent_initial_call=True
-    )
-    def generate_design_for_new_dashboard(contents, prompt_btn_clicks, filename, prompt_text, dashboard_id, dashboard_config, dashboard_name):
+    @functools.lru_cache(maxsize=256)
+    def _embed_url_cached(dashboard_id):
+        """Base embed URL of a dashboard (stable per ID; the iframe reload adds the cache-buster)"""
+        return dashboard_manager.get_embed_url(dashboard_id)
+    
+    def _handle_design(trigger_id, contents, filename, prompt_text, dashboard_id, dashboard_config, dashboard_name):
         """Generate design with analysis and reasoning for NEW dashboard (after generation)"""
         
-        # Check what triggered the callback
-        if not callback_context.triggered:
-            return "", "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
-        
-        trigger_id = callback_context.triggered[0]['prop_id'].split('.')[0]
-        
         # Validate that we have dashboard data
         if not dashboard_id or not dashboard_config:
             error_msg = dbc.Alert("⚠️ Missing dashboard data", color="warning")
-            return error_msg, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+            return _with_alert(error_msg)
         
         # Handle image upload path separately (legacy direct application)
         if trigger_id == 'post-gen-infusion-upload':
             # Image upload path - immediate application
             if not contents:
-                return "", "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+                raise PreventUpdate
             
             try:
                 print(f"📷 Processing image upload for NEW dashboard - immediate application")
@@ -79,47 +272,41 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
                 
                 if design_data is None:
                     print(f"❌ Image extraction failed")
-                    return result_display, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+                    return _with_alert(result_display)
                 
                 if not design_data or 'uiSettings' not in design_data:
                     error_msg = dbc.Alert("⚠️ Failed to extract design elements from image", color="warning")
-                    return error_msg, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+                    return _with_alert(error_msg)
                 
                 print(f"✅ Design extracted from image successfully")
                 
                 # Apply the design immediately
-                serialized = dashboard_config.get('serialized_dashboard', {})
-                if isinstance(serialized, str):
-                    serialized = json.loads(serialized)
-                
-                updated_config = copy.deepcopy(serialized)
+                serialized = _parse_serialized(dashboard_config.get('serialized_dashboard', {}))
                 
                 # Preserve the original Genie Space setting before replacing uiSettings
                 original_genie_space = None
-                if 'uiSettings' in updated_config:
-                    original_genie_space = updated_config['uiSettings'].get('genieSpace')
+                if 'uiSettings' in serialized:
+                    original_genie_space = serialized['uiSettings'].get('genieSpace')
                     print(f"📌 Preserving original Genie Space: {original_genie_space}")
-                    del updated_config['uiSettings']
                 
                 # Apply new design uiSettings
-                updated_config['uiSettings'] = design_data['uiSettings']
+                new_ui_settings = dict(design_data['uiSettings'])
                 
                 # Restore the original Genie Space setting
                 if original_genie_space:
-                    updated_config['uiSettings']['genieSpace'] = original_genie_space
+                    new_ui_settings['genieSpace'] = original_genie_space
                     print(f"✅ Restored Genie Space: isEnabled={original_genie_space.get('isEnabled')}")
                 
+                # Only uiSettings changes, so a shallow copy of the top level is enough
+                # (pages/datasets are shared with the freshly parsed config instead of deep-copied)
+                updated_config = {**serialized, 'uiSettings': new_ui_settings}
+                
                 # Update dashboard
                 dashboard_manager.update_dashboard(dashboard_id, updated_config)
-                new_embed_url = dashboard_manager.get_embed_url(dashboard_id)
-                
-                # Add cache-busting
-                cache_buster = f"?_refresh={int(time.time() * 1000)}"
-                new_embed_url_with_refresh = new_embed_url + cache_buster
                 
-                # Construct dashboard URL
-                workspace_url = workspace_client.config.host
-                dashboard_url = f"{workspace_url}/dashboardsv3/{dashboard_id}"
+                # The preview card is already on the page, only its iframe has to reload.
+                # The browser builds the cache-busted src (clientside callback below).
+                embed_refresh = {'url': _embed_url_cached(dashboard_id), 'refreshed': time.time_ns()}
                 
                 # Extract Genie Space setting from updated config
                 ui_settings_data = updated_config.get('uiSettings', {})
@@ -128,53 +315,6 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
                 
                 print(f"📊 After image infusion - uiSettings.genieSpace: isEnabled={genie_enabled}, enablementMode={genie_space.get('enablementMode', 'N/A')}")
                 
-                # Create updated preview card with URL | ID | Genie toggle
-                preview_card = dbc.Card([
-                    dbc.CardHeader([
-                        dbc.Row([
-                            dbc.Col([
-                                html.H4(f"Generated Dashboard: {dashboard_name}"),
-                                # URL, ID, and Genie Toggle
-                                html.Div([
-                                    html.A(
-                                        "URL",
-                                        href=dashboard_url,
-                                        target="_blank",
-                                        className="text-decoration-none me-3",
-                                        style={'fontSize': '13px', 'color': '#0066cc', 'fontWeight': '500'}
-                                    ),
-                                    html.Span(" | ", style={'fontSize': '13px', 'color': '#6c757d'}),
-                                    html.Span(f"ID: {dashboard_id}", className="me-3", style={'fontSize': '13px', 'color': '#6c757d'}),
-                                    html.Span(" | ", style={'fontSize': '13px', 'color': '#6c757d'}),
-                                    html.Span("Genie AI: ", style={'fontSize': '13px', 'color': '#6c757d', 'marginRight': '5px'}),
-                                    dbc.Switch(
-                                        id='new-dashboard-genie-toggle',
-                                        value=genie_enabled,
-                                        className="d-inline-block",
-                                        style={'transform': 'scale(0.8)', 'verticalAlign': 'middle'}
-                                    )
-                                ], style={'marginTop': '5px'})
-                            ], width=7),
-                            dbc.Col([
-                                dbc.Button("Apply Infusion", id="apply-infusion-btn", color="primary", size="sm", className="me-2"),
-                                dbc.Button("Delete Dashboard", id="delete-dashboard-btn", color="danger", size="sm")
-                            ], width=5, className="text-end")
-                        ], align="center")
-                    ]),
-                    dbc.CardBody([
-                        html.Iframe(
-                            id='new-dashboard-iframe',
-                            src=new_embed_url_with_refresh,
-                            style={
-                                'width': '100%',
-                                'height': '800px',
-                                'border': '1px solid #ddd',
-                                'borderRadius': '5px'
-                            }
-                        )
-                    ])
-                ])
-                
                 # Update stored config
                 full_updated_config = {
                     'serialized_dashboard': updated_config,
@@ -183,7 +323,12 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
                 
                 print(f"✅ Image-based design applied! Closing modal and refreshing preview.")
                 
-                return "", "", {'display': 'none'}, None, None, None, None, None, "", preview_card, False, full_updated_config
+                return {
+                    **_EMPTY_RESPONSE,
+                    'embed_refresh': embed_refresh,
+                    'modal_open': False,
+                    'config': store_dashboard_config(dashboard_id, full_updated_config)
+                }
                 
             except Exception as e:
                 import traceback
@@ -193,145 +338,87 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
                     html.Br(),
                     html.Small(f"Error: {str(e)}")
                 ], color="danger")
-                return error_msg, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+                return _with_alert(error_msg)
         
         # Handle text prompt path (intelligent workflow)
         if trigger_id == 'post-gen-generate-design-btn':
             if not prompt_text or not prompt_text.strip():
                 error_msg = dbc.Alert("⚠️ Please enter a design description", color="warning")
-                return error_msg, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+                return _with_alert(error_msg)
             
-            try:
-                print(f"🎨 [INTELLIGENT] Analyzing NEW dashboard and generating design with reasoning")
-                print(f"   Dashboard: {dashboard_id}")
-                print(f"   Prompt: {prompt_text[:50]}...")
-                
-                # Call the intelligent function
-                analysis_display, reasoning_display, ui_settings, analysis_txt, reasoning_txt = generate_design_with_analysis(
-                    prompt_text,
-                    dashboard_config,
-                    llm_client
-                )
-                
-                if not ui_settings or 'uiSettings' not in ui_settings:
-                    if analysis_display and hasattr(analysis_display, 'children'):
-                        return analysis_display, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
-                    else:
-                        error_msg = dbc.Alert([
-                            html.Strong("⚠️ Failed to generate design"),
-                            html.Br(),
-                            html.Small("Check the console/terminal for detailed error information.")
-                        ], color="warning")
-                        return error_msg, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
-                
-                print(f"✅ Design generated with analysis and reasoning")
-                
-                # Extract previous design for refinement
-                serialized = dashboard_config.get('serialized_dashboard', {})
-                if isinstance(serialized, str):
-                    serialized = json.loads(serialized)
-                
-                previous_theme = serialized.get('uiSettings', {}).get('theme', {})
-                previous_design = {
-                    'canvasBackgroundColor': previous_theme.get('canvasBackgroundColor', {}).get('light', '#FAFAFB'),
-                    'widgetBackgroundColor': previous_theme.get('widgetBackgroundColor', {}).get('light', '#FFFFFF'),
-                    'widgetBorderColor': previous_theme.get('widgetBorderColor', {}).get('light', '#E0E0E0'),
-                    'fontColor': previous_theme.get('fontColor', {}).get('light', '#11171C'),
-                    'visualizationColors': previous_theme.get('visualizationColors', []),
-                    'fontFamily': previous_theme.get('fontFamily', 'Arial')
-                }
-                
-                # Show validation section
-                validation_style = {'display': 'block'}
-                
-                return (
-                    "",  # Don't show analysis display
-                    reasoning_display,
-                    validation_style,
-                    analysis_txt,
-                    reasoning_txt,
-                    ui_settings,
-                    prompt_text,  # Store original prompt
-                    previous_design,  # Store previous design
-                    "",  # Clear status
-                    no_update,  # Don't update preview yet
-                    no_update,  # Don't close modal yet
-                    no_update  # Don't update config yet
-                )
-                
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                error_msg = dbc.Alert([
-                    html.Strong("❌ Error during design generation"),
-                    html.Br(),
-                    html.Small(f"Error: {str(e)}")
-                ], color="danger")
-                return error_msg, "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+            print(f"🎨 [INTELLIGENT] Analyzing NEW dashboard and generating design with reasoning")
+            print(f"   Dashboard: {dashboard_id}")
+            print(f"   Prompt: {prompt_text[:50]}...")
+            
+            # Extract previous design for refinement
+            serialized = _parse_serialized(dashboard_config.get('serialized_dashboard', {}))
+            
+            previous_theme = serialized.get('uiSettings', {}).get('theme', {})
+            previous_design = {key: previous_theme.get(key, {}).get('light', default)
+                               for key, default in _PREV_DESIGN_DEFAULTS}
+            previous_design['visualizationColors'] = previous_theme.get('visualizationColors', [])
+            previous_design['fontFamily'] = previous_theme.get('fontFamily', 'Arial')
+            
+            # The LLM call streams on the shared pool; stream_new_dashboard_design shows the
+            # partial response and fills in the design outputs once it completes
+            job_id = _start_design_job(
+                'generate',
+                generate_design_with_analysis,
+                (prompt_text, dashboard_config, llm_client),
+                {'prompt_text': prompt_text, 'previous_design': previous_design}
+            )
+            
+            return {
+                'analysis_display': "",
+                'reasoning_display': "",
+                'validation_section': _HIDDEN,
+                'status': "",
+                'design_job': job_id,
+                'stream_disabled': False,  # Start polling the stream
+                **_BUTTONS_LOCKED
+            }
         
         # No valid trigger
-        return "", "", {'display': 'none'}, None, None, None, None, None, "", no_update, no_update, no_update
+        raise PreventUpdate
 
 
-    @callback(
-        [Output('dashboard-preview', 'children', allow_duplicate=True),
-         Output('deployed-dashboard-id', 'data', allow_duplicate=True),
-         Output('current-dashboard-config', 'data', allow_duplicate=True),
-         Output('infusion-modal', 'is_open', allow_duplicate=True),
-         Output('post-gen-infusion-prompt', 'value', allow_duplicate=True),
-         Output('new-dashboard-design-validation-section', 'style', allow_duplicate=True),
-         Output('post-gen-infusion-status', 'children', allow_duplicate=True)],
-        Input('new-dashboard-validate-design-btn', 'n_clicks'),
-        [State('new-dashboard-design-generated-ui-settings', 'data'),
-         State('deployed-dashboard-id', 'data'),
-         State('current-dashboard-config', 'data'),
-         State('current-dashboard-name', 'data')],
-        prevent_initial_call=True
-    )
-    def apply_validated_design_to_new_dashboard(n_clicks, ui_settings, dashboard_id, dashboard_config, dashboard_name):
+    def _handle_validate(ui_settings, dashboard_id, dashboard_config, dashboard_name):
         """Apply the validated design to the new dashboard"""
-        if not n_clicks or not ui_settings or not dashboard_id:
-            return no_update, no_update, no_update, no_update, no_update, no_update, no_update
+        if not ui_settings or not dashboard_id:
+            raise PreventUpdate
         
         try:
             print(f"✅ [VALIDATION] Applying validated design to NEW dashboard {dashboard_id}")
             
             # Extract serialized_dashboard
-            serialized = dashboard_config.get('serialized_dashboard', {})
-            if isinstance(serialized, str):
-                serialized = json.loads(serialized)
-            
-            updated_config = copy.deepcopy(serialized)
+            serialized = _parse_serialized(dashboard_config.get('serialized_dashboard', {}))
             
             # Preserve the original Genie Space setting before replacing uiSettings
             original_genie_space = None
-            if 'uiSettings' in updated_config:
-                original_genie_space = updated_config['uiSettings'].get('genieSpace')
+            if 'uiSettings' in serialized:
+                original_genie_space = serialized['uiSettings'].get('genieSpace')
                 print(f"📌 Preserving original Genie Space: {original_genie_space}")
-                del updated_config['uiSettings']
             
             # Apply new design uiSettings
-            updated_config['uiSettings'] = ui_settings['uiSettings']
+            new_ui_settings = dict(ui_settings['uiSettings'])
             
             # Restore the original Genie Space setting
             if original_genie_space:
-                updated_config['uiSettings']['genieSpace'] = original_genie_space
+                new_ui_settings['genieSpace'] = original_genie_space
                 print(f"✅ Restored Genie Space: isEnabled={original_genie_space.get('isEnabled')}")
             
+            # Only uiSettings changes, so a shallow copy of the top level is enough
+            # (pages/datasets are shared with the freshly parsed config instead of deep-copied)
+            updated_config = {**serialized, 'uiSettings': new_ui_settings}
+            
             print(f"✅ uiSettings applied to config")
             
             # Update dashboard
             print(f"🔄 Updating dashboard...")
             updated_dashboard_id = dashboard_manager.update_dashboard(dashboard_id, updated_config)
-            new_embed_url = dashboard_manager.get_embed_url(updated_dashboard_id)
             
-            # Add cache-busting
-            cache_buster = f"?_refresh={int(time.time() * 1000)}"
-            new_embed_url_with_refresh = new_embed_url + cache_buster
-            
-            # Construct dashboard URL
-            workspace_url = workspace_client.config.host
-            dashboard_url = f"{workspace_url}/dashboardsv3/{updated_dashboard_id}"
+            # Only the iframe of the existing preview card has to reload (clientside callback below)
+            embed_refresh = {'url': _embed_url_cached(updated_dashboard_id), 'refreshed': time.time_ns()}
             
             # Extract Genie Space setting from updated config
             ui_settings_data = updated_config.get('uiSettings', {})
@@ -340,53 +427,6 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
             
             print(f"📊 After infusion - uiSettings.genieSpace: isEnabled={genie_enabled}, enablementMode={genie_space.get('enablementMode', 'N/A')}")
             
-            # Create preview with URL | ID | Genie toggle (same format as initial generation)
-            preview_card = dbc.Card([
-                dbc.CardHeader([
-                    dbc.Row([
-                        dbc.Col([
-                            html.H4(f"Generated Dashboard: {dashboard_name}"),
-                            # URL, ID, and Genie Toggle
-                            html.Div([
-                                html.A(
-                                    "URL",
-                                    href=dashboard_url,
-                                    target="_blank",
-                                    className="text-decoration-none me-3",
-                                    style={'fontSize': '13px', 'color': '#0066cc', 'fontWeight': '500'}
-                                ),
-                                html.Span(" | ", style={'fontSize': '13px', 'color': '#6c757d'}),
-                                html.Span(f"ID: {updated_dashboard_id}", className="me-3", style={'fontSize': '13px', 'color': '#6c757d'}),
-                                html.Span(" | ", style={'fontSize': '13px', 'color': '#6c757d'}),
-                                html.Span("Genie AI: ", style={'fontSize': '13px', 'color': '#6c757d', 'marginRight': '5px'}),
-                                dbc.Switch(
-                                    id='new-dashboard-genie-toggle',
-                                    value=genie_enabled,
-                                    className="d-inline-block",
-                                    style={'transform': 'scale(0.8)', 'verticalAlign': 'middle'}
-                                )
-                            ], style={'marginTop': '5px'})
-                        ], width=7),
-                        dbc.Col([
-                            dbc.Button("Apply Infusion", id="apply-infusion-btn", color="primary", size="sm", className="me-2"),
-                            dbc.Button("Delete Dashboard", id="delete-dashboard-btn", color="danger", size="sm")
-                        ], width=5, className="text-end")
-                    ], align="center")
-                ]),
-                dbc.CardBody([
-                    html.Iframe(
-                        id='new-dashboard-iframe',
-                        src=new_embed_url_with_refresh,
-                        style={
-                            'width': '100%',
-                            'height': '800px',
-                            'border': '1px solid #ddd',
-                            'borderRadius': '5px'
-                        }
-                    )
-                ])
-            ])
-            
             # Store updated config
             full_updated_config = {
                 'serialized_dashboard': updated_config,
@@ -396,13 +436,39 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
             success_msg = dbc.Alert("✅ Design applied successfully!", color="success")
             
             # Close modal, clear prompt, hide validation section
-            return preview_card, updated_dashboard_id, full_updated_config, False, "", {'display': 'none'}, success_msg
+            return {
+                'embed_refresh': embed_refresh,
+                'dashboard_id': updated_dashboard_id,
+                'config': store_dashboard_config(updated_dashboard_id, full_updated_config),
+                'modal_open': False,
+                'prompt': "",
+                'validation_section': _HIDDEN,
+                'status': success_msg
+            }
             
         except Exception as e:
             import traceback
             traceback.print_exc()
             error_msg = dbc.Alert(f"❌ Error applying design: {str(e)}", color="danger")
-            return no_update, no_update, no_update, no_update, no_update, no_update, error_msg
+            return {'status': error_msg}
+
+
+    # Reload the preview iframe in the browser after a design was applied. Runs clientside so
+    # the server only returns the embed URL instead of re-rendering the whole preview card.
+    app.clientside_callback(
+        """
+        function(embedRefresh) {
+            if (!embedRefresh || !embedRefresh.url) {
+                return window.dash_clientside.no_update;
+            }
+            var separator = embedRefresh.url.indexOf('?') === -1 ? '?' : '&';
+            return embedRefresh.url + separator + '_refresh=' + embedRefresh.refreshed;
+        }
+        """,
+        Output('new-dashboard-iframe', 'src', allow_duplicate=True),
+        Input('new-dashboard-embed-refresh', 'data'),
+        prevent_initial_call=True
+    )
 
 
     @callback(
@@ -418,56 +484,177 @@ def register_new_dashboard_infusion_callbacks(app, dashboard_manager, workspace_
         return is_open
 
 
+    def _handle_refine(feedback, original_prompt, previous_reasoning, previous_design, dashboard_config):
+        """Start refining the design based on user feedback for new dashboard"""
+        if not feedback or not feedback.strip():
+            raise PreventUpdate
+        
+        print(f"🔄 [REFINEMENT] Applying feedback for NEW dashboard: {feedback[:50]}...")
+        
+        job_id = _start_design_job(
+            'refine',
+            refine_design_from_feedback,
+            (original_prompt, feedback, previous_reasoning, previous_design, dashboard_config, llm_client)
+        )
+        
+        return {'status': "", 'design_job': job_id, 'stream_disabled': False, **_BUTTONS_LOCKED}
+    
+    
+    def _finish_generate(result, context):
+        """Design outputs for a completed generate_design_with_analysis call"""
+        analysis_display, reasoning_display, ui_settings, analysis_txt, reasoning_txt = result
+        
+        if not ui_settings or 'uiSettings' not in ui_settings:
+            if analysis_display and hasattr(analysis_display, 'children'):
+                return _with_alert(analysis_display)
+            error_msg = dbc.Alert([
+                html.Strong("⚠️ Failed to generate design"),
+                html.Br(),
+                html.Small("Check the console/terminal for detailed error information.")
+            ], color="warning")
+            return _with_alert(error_msg)
+        
+        print(f"✅ Design generated with analysis and reasoning")
+        
+        return {
+            'analysis_display': "",  # Don't show analysis display
+            'reasoning_display': reasoning_display,
+            'validation_section': {'display': 'block'},  # Show validation section
+            'analysis_text': analysis_txt,
+            'reasoning_text': reasoning_txt,
+            'ui_settings': ui_settings,
+            'original_prompt': context['prompt_text'],  # Store original prompt
+            'previous_design': context['previous_design'],  # Store previous design
+            'status': ""  # Clear status
+        }
+    
+    
+    def _finish_refine(result):
+        """Design outputs for a completed refinement"""
+        refined_reasoning, refined_ui_settings, refined_txt = result
+        
+        if not refined_ui_settings or 'uiSettings' not in refined_ui_settings:
+            error_msg = dbc.Alert("⚠️ Failed to refine design", color="warning")
+            return {'reasoning_display': error_msg, 'status': ""}
+        
+        print(f"✅ Design refined successfully for NEW dashboard")
+        
+        success_msg = dbc.Alert("✅ Design refined! Review and validate or refine again.", color="info")
+        
+        # Update reasoning display, close refinement section
+        return {
+            'reasoning_display': refined_reasoning,
+            'reasoning_text': refined_txt,
+            'ui_settings': refined_ui_settings,
+            'refinement_open': False,
+            'status': success_msg
+        }
+    
+    
+    def _failed_job_response(kind, message):
+        """Poll outputs showing a failed or timed-out design job and stopping the stream"""
+        if kind == 'generate':
+            error_msg = dbc.Alert([
+                html.Strong("❌ Error during design generation"),
+                html.Br(),
+                html.Small(f"Error: {message}")
+            ], color="danger")
+            return {**_with_alert(error_msg), **_POLL_DONE}
+        
+        error_msg = dbc.Alert(f"❌ Refinement error: {message}", color="danger")
+        return {'reasoning_display': error_msg, 'status': "", **_POLL_DONE}
+    
+    
     @callback(
-        [Output('new-dashboard-design-reasoning-display', 'children', allow_duplicate=True),
-         Output('new-dashboard-design-reasoning-text', 'data', allow_duplicate=True),
-         Output('new-dashboard-design-generated-ui-settings', 'data', allow_duplicate=True),
-         Output('new-dashboard-refinement-collapse', 'is_open', allow_duplicate=True),
-         Output('post-gen-infusion-status', 'children', allow_duplicate=True)],
-        Input('new-dashboard-apply-refinement-btn', 'n_clicks'),
-        [State('new-dashboard-design-refinement-prompt', 'value'),
+        list(_ROUTER_OUTPUTS.values()),
+        [Input('post-gen-infusion-upload', 'contents'),
+         Input('post-gen-generate-design-btn', 'n_clicks'),
+         Input('new-dashboard-validate-design-btn', 'n_clicks'),
+         Input('new-dashboard-apply-refinement-btn', 'n_clicks')],
+        [State('post-gen-infusion-upload', 'filename'),
+         State('post-gen-infusion-prompt', 'value'),
+         State('deployed-dashboard-id', 'data'),
+         State('current-dashboard-config', 'data'),
+         State('current-dashboard-name', 'data'),
+         State('new-dashboard-design-generated-ui-settings', 'data'),
+         State('new-dashboard-design-refinement-prompt', 'value'),
          State('new-dashboard-original-design-prompt', 'data'),
          State('new-dashboard-design-reasoning-text', 'data'),
-         State('new-dashboard-previous-design-data', 'data'),
-         State('current-dashboard-config', 'data')],
+         State('new-dashboard-previous-design-data', 'data')],
         prevent_initial_call=True
     )
-    def apply_design_refinement_to_new_dashboard(n_clicks, feedback, original_prompt, previous_reasoning, previous_design, dashboard_config):
-        """Refine design based on user feedback for new dashboard"""
-        if not n_clicks or not feedback or not feedback.strip():
-            return no_update, no_update, no_update, no_update, no_update
+    def route_new_dashboard_infusion(contents, generate_clicks, validate_clicks, refine_clicks,
+                                     filename, prompt_text, dashboard_id, config_ref, dashboard_name,
+                                     ui_settings, feedback, original_prompt, previous_reasoning, previous_design):
+        """Single entry point for the generate -> validate -> refine infusion workflow"""
+        trigger_id = callback_context.triggered_id
+        dashboard_config = get_cached_dashboard_config(config_ref)
         
-        try:
-            print(f"🔄 [REFINEMENT] Applying feedback for NEW dashboard: {feedback[:50]}...")
-            
-            # Call refinement function
-            refined_reasoning, refined_ui_settings, refined_txt = refine_design_from_feedback(
-                original_prompt,
-                feedback,
-                previous_reasoning,
-                previous_design,
-                dashboard_config,
-                llm_client
-            )
-            
-            if not refined_ui_settings or 'uiSettings' not in refined_ui_settings:
-                error_msg = dbc.Alert("⚠️ Failed to refine design", color="warning")
-                return error_msg, no_update, no_update, no_update, ""
-            
-            print(f"✅ Design refined successfully for NEW dashboard")
-            
-            success_msg = dbc.Alert("✅ Design refined! Review and validate or refine again.", color="info")
-            
-            # Update reasoning display, close refinement section
-            return refined_reasoning, refined_txt, refined_ui_settings, False, success_msg
+        if trigger_id in ('post-gen-infusion-upload', 'post-gen-generate-design-btn'):
+            # The upload's contents is an Input of this router, so a processed image would be sent
+            # back with every later generate/validate/refine click - clear it once it's been used
+            response = _handle_design(trigger_id, contents, filename, prompt_text, dashboard_id, dashboard_config, dashboard_name)
+            if contents:
+                response = {**response, 'upload_contents': None}
+            return _spread(response, _ROUTER_OUTPUTS)
+        
+        if trigger_id == 'new-dashboard-validate-design-btn' and validate_clicks:
+            return _spread(_handle_validate(ui_settings, dashboard_id, dashboard_config, dashboard_name), _ROUTER_OUTPUTS)
+        
+        if trigger_id == 'new-dashboard-apply-refinement-btn' and refine_clicks:
+            return _spread(_handle_refine(feedback, original_prompt, previous_reasoning, previous_design, dashboard_config), _ROUTER_OUTPUTS)
+        
+        raise PreventUpdate
+    
+    
+    @callback(
+        list(_POLL_OUTPUTS.values()),
+        Input('new-dashboard-design-stream-interval', 'n_intervals'),
+        State('new-dashboard-design-job', 'data'),
+        prevent_initial_call=True
+    )
+    def stream_new_dashboard_design(n_intervals, job_id):
+        """Show the design LLM response as it streams and apply the result once it completes"""
+        with _DESIGN_JOBS_LOCK:
+            job = _DESIGN_JOBS.get(job_id)
+        
+        if job is None:
+            # The app restarted (running jobs are never evicted) - nothing left to poll
+            print(f"⚠️ Design job {job_id} not found - it expired")
+            expired_msg = dbc.Alert("⚠️ Design job expired, please retry", color="warning")
+            return _spread({'status': expired_msg, **_POLL_DONE}, _POLL_OUTPUTS)
+        
+        future = job['future']
+        if not future.done():
+            if time.monotonic() - job['started'] <= _LLM_TIMEOUT_SECONDS:
+                # Only re-render the partial response when new text has arrived
+                received = len(job['chunks'])
+                if received == job['shown']:
+                    raise PreventUpdate
+                job['shown'] = received
+                return _spread({'stream_panel': _build_streaming_display("".join(job['chunks']))}, _POLL_OUTPUTS)
             
+            # The request itself times out after DESIGN_LLM_TIMEOUT_SECONDS without a response;
+            # a call that keeps streaming still holds its worker, so only stop polling it here
+            with _DESIGN_JOBS_LOCK:
+                _DESIGN_JOBS.pop(job_id, None)
+            print(f"❌ Design LLM call did not finish within {_LLM_TIMEOUT_SECONDS}s")
+            return _spread(_failed_job_response(job['kind'], f"LLM design call did not finish within {_LLM_TIMEOUT_SECONDS}s"), _POLL_OUTPUTS)
+        
+        with _DESIGN_JOBS_LOCK:
+            _DESIGN_JOBS.pop(job_id, None)
+        
+        try:
+            result = future.result()
+            if job['kind'] == 'generate':
+                return _spread({**_finish_generate(result, job['context']), **_POLL_DONE}, _POLL_OUTPUTS)
+            return _spread({**_finish_refine(result), **_POLL_DONE}, _POLL_OUTPUTS)
         except Exception as e:
             import traceback
             traceback.print_exc()
-            error_msg = dbc.Alert(f"❌ Refinement error: {str(e)}", color="danger")
-            return error_msg, no_update, no_update, no_update, ""
-    
-    
+            return _spread(_failed_job_response(job['kind'], str(e)), _POLL_OUTPUTS)
+
+
     # ============================================================================
     # MODAL CONTROL CALLBACKS
     # ============================================================================
@@ -4,10 +4,250 @@ New Dashboard Page Layout
 This module contains all the UI components for creating a new dashboard.
 """
 
+import traceback
+from functools import lru_cache
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 
 
+# Style of the embedded dashboard iframe in the deployed-dashboard preview card
+_IFRAME_STYLE = {
+    'width': '100%',
+    'height': '800px',
+    'border': '1px solid #ddd',
+    'borderRadius': '5px'
+}
+
+# Returned by deploy_dashboard when there is no config or dashboard name to deploy
+_MISSING_CONFIG_ALERT = dbc.Alert("Missing configuration or name", color="warning")
+
+# Returned by delete_dashboard_callback when no dashboard has been deployed
+_NO_DASHBOARD_ALERT = dbc.Alert("No dashboard to delete", color="warning")
+
+
+# Design Infusion card of the AI generator panel (static: image upload + style prompt)
+_DESIGN_INFUSION_CARD = dbc.Card([
+    dbc.CardBody([
+        dbc.Row([
+            dbc.Col([
+                html.H6("Design Infusion (Optional)", className="mb-0"),
+                html.Small("Extract colors and fonts from an image or describe your style", className="text-muted")
+            ], width=8),
+            dbc.Col([
+                dbc.Button("Design Options", id="infusion-toggle-btn", color="info", size="sm", outline=True, className="float-end")
+            ], width=4)
+        ]),
+        dbc.Collapse([
+            # Options Side by Side
+            dbc.Row([
+                # Option 1: Upload Image
+                dbc.Col([
+                    html.Label("Option 1: Upload an Image", className="fw-bold mb-2"),
+                    html.P("Upload a picture and the AI will extract colors and fonts from it.", className="text-muted small mb-2"),
+                    dcc.Upload(
+                        id='infusion-image-upload',
+                        children=html.Div([
+                            'Drag and Drop or ',
+                            html.A('Select Image', style={'cursor': 'pointer', 'textDecoration': 'underline'})
+                        ]),
+                        style={
+                            'width': '100%',
+                            'height': '100px',
+                            'lineHeight': '100px',
+                            'borderWidth': '2px',
+                            'borderStyle': 'dashed',
+                            'borderRadius': '10px',
+                            'textAlign': 'center',
+                            'cursor': 'pointer',
+                            'backgroundColor': '#f8f9fa'
+                        },
+                        multiple=False
+                    ),
+                    dcc.Loading(
+                        id="infusion-loading",
+                        type="default",
+                        children=html.Div(id='infusion-result', className="mt-2")
+                    )
+                ], width=6),
+                                    
+                # Option 2: Text Prompt
+                dbc.Col([
+                    html.Label("Option 2: Describe Your Style", className="fw-bold mb-2"),
+                    html.P("Describe the style you want (e.g., 'Modern minimalist').", className="text-muted small mb-2"),
+                    dbc.Textarea(
+                        id='pre-generation-infusion-prompt',
+                        placeholder="Example: Modern and impactful style...",
+                        style={'width': '100%', 'minHeight': '80px'},
+                        className="mb-2"
+                    ),
+                    dbc.Button("Generate Design from Prompt", id="pre-generation-design-from-prompt-btn", color="primary", size="sm"),
+                    dcc.Loading(
+                        id="pre-generation-infusion-loading",
+                        type="default",
+                        children=html.Div(id='pre-generation-infusion-result', className="mt-2")
+                    )
+                ], width=6)
+            ])
+        ], id="infusion-collapse", is_open=False, className="mt-3")
+    ])
+], className="mb-3", style={'backgroundColor': '#f8f9fa'})
+
+
+def _build_ai_generator_panel():
+    """
+    Build the AI dashboard generator panel (shown once a Unity Catalog table is confirmed)
+    
+    The panel is part of the static page layout; confirming a table only fills in the
+    table name, column count and column badges placeholders.
+    
+    Returns:
+        dbc.Card: AI dashboard generator panel
+    """
+    return dbc.Card([
+        dbc.CardHeader(html.H4("AI-Powered Dashboard Generator")),
+        dbc.CardBody([
+            dbc.Row([
+                dbc.Col([
+                    dbc.Alert([
+                        html.Strong("Table loaded successfully!"),
+                        html.Br(),
+                        html.Small(["Table: ", html.Span(id='ai-selected-table-name')]),
+                        html.Br(),
+                        html.Small(["Columns detected: ", html.Span(id='ai-columns-count')])
+                    ], color="success", className="mb-3")
+                ], width=8)  # Changed from 6 to 8 to match prompt textarea width
+            ]),
+            
+            # Design Infusion Section
+            dbc.Row([
+                dbc.Col([
+                    _DESIGN_INFUSION_CARD
+                ], width=8)
+            ]),
+            
+            dbc.Row([
+                dbc.Col([
+                    html.Label("Describe your dashboard needs:", className="fw-bold mb-2"),
+                    html.P(
+                        "",
+                        className="text-muted small mb-3"
+                    ),
+                    dcc.Textarea(
+                        id='ai-dashboard-prompt',
+                        placeholder='Example: "Create a dashboard showing key metrics and trends for this data"',
+                        style={'width': '100%', 'height': '100px'},
+                        className="mb-3"
+                    )
+                ], width=8)
+            ]),
+            
+            # Display available columns with types
+            html.Details([
+                html.Summary("Available Columns & Types", style={'cursor': 'pointer', 'fontWeight': 'bold'}),
+                html.Div([
+                    html.Div(id='ai-columns-badges', className="mt-2")
+                ])
+            ], className="mb-3"),
+            
+            html.Div([
+                dbc.Button(
+                    "Generate Dashboard",
+                    id="generate-ai-dashboard-btn",
+                    color="success",
+                    size="md",
+                    className="mt-3"
+                )
+            ], className="text-center")
+            # Note: ai-generation-status, progress, reasoning, widgets are now in the initial layout
+        ])
+    ], className="mb-4")
+
+
+@lru_cache(maxsize=64)
+def _build_badges(table_name, columns_tuple):
+    """
+    Build the "Available Columns & Types" badges for a table (memoized per table and columns)
+    
+    Args:
+        table_name: Full table name (catalog.schema.table)
+        columns_tuple: Tuple of (column name, column type) pairs
+        
+    Returns:
+        tuple: dbc.Badge components, one per column
+    """
+    return tuple(
+        dbc.Badge(f"{name}: {col_type}", color="light", text_color="dark", className="me-2 mb-2")
+        for name, col_type in columns_tuple
+    )
+
+
+# ============================================================================
+# STATIC LAYOUT PIECES (built once at import, reused by get_new_dashboard_layout)
+# ============================================================================
+
+_HEADER_ROW = dbc.Row([
+    dbc.Col([
+        html.H3("Create New Dashboard", className="text-center mb-3 mt-3"),
+    ])
+])
+
+# AI Dashboard Generator Section
+_AI_GENERATOR_ROW = dbc.Row([
+    dbc.Col([
+        html.Div(id='ai-dashboard-generator-section'),
+        html.Div(_build_ai_generator_panel(), id='ai-dashboard-generator-panel', style={'display': 'none'}),
+        # Always include these elements to prevent callback errors when switching pages
+        html.Div(id='ai-generation-status'),
+        html.Div(id='ai-generation-progress'),
+        html.Div(id='ai-generation-reasoning'),
+        html.Div(id='ai-generation-widgets')
+    ], width=8)  # Reduced from 12 to 8 (approximately 65%)
+])
+
+# Full-width placeholder rows filled in by the widget builder callbacks
+_PLACEHOLDER_ROWS = [
+    dbc.Row([
+        dbc.Col([
+            html.Div(id=placeholder_id)
+        ], width=12)
+    ])
+    for placeholder_id in (
+        'widget-selector-section',  # Widget Selector Section (appears after columns extracted)
+        'table-widget-section',  # Table Widget Configuration Section
+        'widget-json',  # Table Widget JSON Display
+        'filter-widget-section',  # Filter Widgets Section
+        'filter-widgets-display',  # Filter Widgets Display
+        'dataset-filters-display',  # Dataset Filters Display
+        'bar-chart-widget-section',  # Bar Chart Widgets Section
+        'bar-chart-widgets-display',  # Bar Chart Widgets Display
+        'line-chart-widget-section',  # Line Chart Widgets Section
+        'line-chart-widgets-display',  # Line Chart Widgets Display
+        'pivot-widget-section',  # Pivot Widgets Section
+        'pivot-widgets-display',  # Pivot Widgets Display
+        'add-widget-section',  # Add to Dashboard button and final config
+        'dashboard-config-display',  # Final Dashboard Configuration
+    )
+]
+
+# Deploy Dashboard Section
+_DEPLOY_ROW = dbc.Row([
+    dbc.Col([
+        html.Div(id='deploy-section-wrapper', children=[
+            # Always render the dashboard name input (hidden initially)
+            dbc.Input(id='deploy-dashboard-name', placeholder="Enter dashboard name...", value="My Dashboard", debounce=True, style={'display': 'none'}, className=""),
+            html.Div(id='deploy-section')
+        ])
+    ], width=12)
+])
+
+# Dashboard Preview
+_PREVIEW_ROW = dbc.Row([
+    dbc.Col([
+        html.Div(id='dashboard-preview')
+    ], width=12)
+])
+
+
 def get_new_dashboard_layout(unity_catalog="christophe_chieu", unity_schema="certified_tables"):
     """
     Returns the layout for the New Dashboard page
@@ -20,11 +260,7 @@ def get_new_dashboard_layout(unity_catalog="christophe_chieu", unity_schema="cer
     UNITY_SCHEMA = unity_schema
     
     return html.Div([
-        dbc.Row([
-            dbc.Col([
-                html.H3("Create New Dashboard", className="text-center mb-3 mt-3"),
-            ])
-        ]),
+        _HEADER_ROW,
         
         # Table Inspector Section (NEW)
         dbc.Row([
@@ -34,10 +270,14 @@ def get_new_dashboard_layout(unity_catalog="christophe_chieu", unity_schema="cer
                     dbc.CardBody([
                         dbc.Row([
                             dbc.Col([
-                                html.Label(f"Browse tables from {UNITY_CATALOG}.{UNITY_SCHEMA}:", className="fw-bold mb-2"),
+                                html.Div([
+                                    html.Label(f"Browse tables from {UNITY_CATALOG}.{UNITY_SCHEMA}:", className="fw-bold mb-2"),
+                                    dbc.Button("🔄", id='uc-table-refresh-btn', color="link", size="sm",
+                                               className="mb-2 p-0 ms-2", title="Reload table list")
+                                ], className="d-flex align-items-center"),
                                 dcc.Dropdown(
                                     id='uc-table-dropdown',
-                                    placeholder="Select a table to inspect...",
+                                    placeholder="Select or type to search a table to inspect...",
                                     className="mb-3"
                                 )
                             ], width=5)  # Reduced from 6 to 5 (approximately 40%)
@@ -48,133 +288,10 @@ def get_new_dashboard_layout(unity_catalog="christophe_chieu", unity_schema="cer
             ], width=12)
         ]),
         
-        # AI Dashboard Generator Section
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='ai-dashboard-generator-section'),
-                # Always include these elements to prevent callback errors when switching pages
-                html.Div(id='ai-generation-status'),
-                html.Div(id='ai-generation-progress'),
-                html.Div(id='ai-generation-reasoning'),
-                html.Div(id='ai-generation-widgets')
-            ], width=8)  # Reduced from 12 to 8 (approximately 65%)
-        ]),
-        
-        # Widget Selector Section (appears after columns extracted)
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='widget-selector-section')
-            ], width=12)
-        ]),
-        
-        # Table Widget Configuration Section
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='table-widget-section')
-            ], width=12)
-        ]),
-        
-        # Table Widget JSON Display
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='widget-json')
-            ], width=12)
-        ]),
-        
-        # Filter Widgets Section
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='filter-widget-section')
-            ], width=12)
-        ]),
-        
-        # Filter Widgets Display
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='filter-widgets-display')
-            ], width=12)
-        ]),
-        
-        # Dataset Filters Display
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='dataset-filters-display')
-            ], width=12)
-        ]),
-        
-        # Bar Chart Widgets Section
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='bar-chart-widget-section')
-            ], width=12)
-        ]),
-        
-        # Bar Chart Widgets Display
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='bar-chart-widgets-display')
-            ], width=12)
-        ]),
-        
-        # Line Chart Widgets Section
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='line-chart-widget-section')
-            ], width=12)
-        ]),
-        
-        # Line Chart Widgets Display
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='line-chart-widgets-display')
-            ], width=12)
-        ]),
-        
-        # Pivot Widgets Section
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='pivot-widget-section')
-            ], width=12)
-        ]),
-        
-        # Pivot Widgets Display
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='pivot-widgets-display')
-            ], width=12)
-        ]),
-        
-        # Add to Dashboard button and final config
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='add-widget-section')
-            ], width=12)
-        ]),
-        
-        # Final Dashboard Configuration
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='dashboard-config-display')
-            ], width=12)
-        ]),
-        
-        # Deploy Dashboard Section
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='deploy-section-wrapper', children=[
-                    # Always render the dashboard name input (hidden initially)
-                    dbc.Input(id='deploy-dashboard-name', placeholder="Enter dashboard name...", value="My Dashboard", style={'display': 'none'}, className=""),
-                    html.Div(id='deploy-section')
-                ])
-            ], width=12)
-        ]),
-        
-        # Dashboard Preview
-        dbc.Row([
-            dbc.Col([
-                html.Div(id='dashboard-preview')
-            ], width=12)
-        ])
+        _AI_GENERATOR_ROW,
+        *_PLACEHOLDER_ROWS,
+        _DEPLOY_ROW,
+        _PREVIEW_ROW
     ])
 
 
@@ -187,96 +304,252 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
         datasets: Dictionary of available datasets
         llm_client: OpenAI client for LLM calls
         dashboard_manager: DashboardManager instance
-        ai_progress_store: Shared dict for AI progress tracking
-        ai_results_store: Shared dict for AI results
+        ai_progress_store: Shared SessionStore of session_id -> GenState for AI progress tracking
+        ai_results_store: Shared SessionStore for AI results
         workspace_client: Databricks workspace client
         warehouse_id: Warehouse ID for SQL execution
         unity_catalog: Unity Catalog name
         unity_schema: Unity Catalog schema name
     """
-    import threading
     import uuid
     import time
     import json
     import copy
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
     from utils.query_permission_checker import test_dashboard_queries_for_permissions
-    from utils import list_tables_from_schema, get_table_columns
-    from dash import callback, Output, Input, State, no_update, html
+    from utils import list_tables_cached, get_table_columns_cached, clear_table_metadata_cache
+    from dash import callback, Output, Input, State, Patch, no_update, html, ctx
+    from dash.exceptions import PreventUpdate
     import dash_bootstrap_components as dbc
+    from flask import Response
     from widgets import extract_columns_with_llm
-    from dashboard_management_functions import generate_dashboard_background
+    from utils.dashboard_config_cache import store_dashboard_config, get_cached_dashboard_config
+    from dashboard_management_functions import generate_dashboard_background, GenState
+    from dashboard_management_functions.ai_dashboard_generator import MAX_PROGRESS_STEPS, MAX_WIDGET_DETAILS
     
     UNITY_CATALOG = unity_catalog
     UNITY_SCHEMA = unity_schema
     
+    # Tables whose SELECT permission test passed recently (table -> time.monotonic() of the pass);
+    # confirming the same table again within PERMISSION_TTL_SECONDS skips the warehouse query
+    PERMISSION_TTL_SECONDS = 300
+    permission_passed_at = {}
+    permission_passed_at_lock = threading.Lock()
+    
+    # The table dropdown only ever receives this many options; typing filters the full
+    # (cached) table list server-side instead of rendering every table in the browser
+    MAX_TABLE_OPTIONS = 50
+    
+    # (tables, lowercased labels, value -> option) for the current cached table list, rebuilt
+    # only when list_tables_cached hands back a different list (new listing or refresh). The
+    # tuple is replaced in a single assignment, so concurrent sessions never see labels of one
+    # listing paired with the options of another.
+    table_search_index = (None, (), {})
+    
+    def get_table_search_index(tables):
+        """Search index (tables, labels, by_value) for the cached option list (built once per listing)"""
+        nonlocal table_search_index
+        index = table_search_index
+        if index[0] is not tables:
+            index = (
+                tables,
+                tuple(table['label'].lower() for table in tables),
+                {table['value']: table for table in tables}
+            )
+            table_search_index = index
+        return index
+    
+    # Repeated Delete clicks on the same dashboard within this window (double-clicks, impatient
+    # re-clicks while the first request is in flight) are dropped instead of issuing another
+    # Databricks delete call (dashboard_id -> time.monotonic() of the last accepted click;
+    # entries past the window are pruned on each accepted click, so deleted IDs don't pile up)
+    DELETE_DEBOUNCE_SECONDS = 2.0
+    last_delete_click = {}
+    last_delete_click_lock = threading.Lock()
+    
+    # Dashboard generations share a bounded pool instead of starting a thread per click; the
+    # futures let the poller notice a generation that ended without recording a status
+    generation_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='ai-gen')
+    generation_futures = {}
+    
+    # The progress poll backs off while nothing changes, so the generation timeout is measured
+    # in time (session -> time.monotonic() at start) rather than in interval ticks
+    GENERATION_TIMEOUT_SECONDS = 150
+    generation_started_at = {}
+    
+    # Finished sessions whose results are never picked up (tab closed, page switched) are
+    # dropped from the progress/results stores this long after the generation ends
+    FINISHED_SESSION_TTL_SECONDS = 300
+    
+    # Sessions nobody has polled or streamed for this long are treated as abandoned (tab closed)
+    # and dropped from the stores; every poll / stream read renews the lease
+    SESSION_IDLE_SECONDS = 600
+    
+    def touch_session(session_id):
+        """Renew the stores' lease on a session that still has a reader"""
+        ai_progress_store.touch(session_id, SESSION_IDLE_SECONDS)
+        ai_results_store.touch(session_id, SESSION_IDLE_SECONDS)
+    
+    def sweep_abandoned_generations():
+        """Forget bookkeeping for sessions whose progress entry has already expired"""
+        for stale_id in [sid for sid in list(generation_futures) if sid not in ai_progress_store]:
+            forget_generation(stale_id)
+    
+    def forget_generation(session_id):
+        """Drop the bookkeeping for a finished generation session"""
+        generation_futures.pop(session_id, None)
+        generation_started_at.pop(session_id, None)
+    
+    def finalize_session(session_id):
+        """Drop a finished session from both stores along with its bookkeeping"""
+        ai_progress_store.pop(session_id, None)
+        ai_results_store.pop(session_id, None)
+        forget_generation(session_id)
+    
+    def build_widget_delta(session_id, progress_state, last_widget_delta):
+        """
+        Widget rationales the browser hasn't rendered yet, for the ai-widget-delta store
+        
+        Args:
+            session_id: Generation session ID
+            progress_state: The session's GenState
+            last_widget_delta: Previous ai-widget-delta value (its 'total' is the browser's cursor)
+            
+        Returns:
+            dict with session, total, items and reset, or no_update when nothing is new
+        """
+        sent_total = 0
+        if last_widget_delta and last_widget_delta.get('session') == session_id:
+            sent_total = last_widget_delta.get('total', 0)
+        items, total, reset = progress_state.items_since('widget_details', sent_total)
+        if not items and not reset:
+            return no_update
+        return {'session': session_id, 'total': total, 'items': items, 'reset': reset}
+    
+    def build_snapshot_update(session_id, progress_data, steps_cursor):
+        """
+        ai-progress-snapshot value for a running session
+        
+        Once the browser holds this session's snapshot, only the steps appended since (and the
+        reasoning, when it changed) are sent as a Patch instead of the whole step list. The
+        generator replaces the session's initializing state, so the cursor also records the
+        state's generation and a new state always gets a full snapshot.
+        
+        Args:
+            session_id: Generation session ID
+            progress_data: GenState.snapshot() of the session
+            steps_cursor: Previous ai-steps-cursor value (what the browser's snapshot holds)
+            
+        Returns:
+            tuple: (full snapshot dict / Patch / no_update, new ai-steps-cursor value or no_update)
+        """
+        steps = progress_data['steps']
+        steps_total = progress_data['steps_total']
+        reasoning = progress_data['reasoning']
+        generation = progress_data['generation']
+        cursor = {'session': session_id, 'generation': generation, 'total': steps_total,
+                  'held': len(steps), 'reasoning': reasoning}
+        
+        if (steps_cursor and steps_cursor.get('session') == session_id
+                and steps_cursor.get('generation') == generation):
+            new_count = steps_total - steps_cursor['total']
+            held = steps_cursor['held'] + new_count
+            # Fall back to a full snapshot when the browser would miss steps or exceed the cap
+            if 0 <= new_count <= len(steps) and held <= MAX_PROGRESS_STEPS:
+                if not new_count and reasoning == steps_cursor['reasoning']:
+                    return no_update, no_update
+                patch = Patch()
+                if new_count:
+                    patch['steps'].extend(steps[len(steps) - new_count:])
+                if reasoning != steps_cursor['reasoning']:
+                    patch['reasoning'] = reasoning
+                cursor['held'] = held
+                return patch, cursor
+        
+        return {'status': 'running', 'steps': steps, 'reasoning': reasoning}, cursor
+    
     # ============================================================================
     # UNITY CATALOG TABLE INSPECTOR CALLBACKS
     # ============================================================================
     
     @callback(
         Output('uc-table-dropdown', 'options'),
-        Input('uc-table-dropdown', 'id'),  # Triggered on page load
+        [Input('uc-table-dropdown', 'search_value'),  # Also fires on page load
+         Input('uc-table-refresh-btn', 'n_clicks')],
+        State('uc-table-dropdown', 'value'),
         prevent_initial_call=False
     )
-    def populate_table_dropdown(_):
-        """Populate the Unity Catalog table dropdown"""
+    def populate_table_dropdown(search_value, refresh_clicks, selected_table):
+        """Populate the Unity Catalog table dropdown with the tables matching the search text"""
+        refresh = ctx.triggered_id == 'uc-table-refresh-btn'
+        if refresh:
+            # Reload everything: table list, column lookups and permission results
+            clear_table_metadata_cache()
+            with permission_passed_at_lock:
+                permission_passed_at.clear()
+        
         try:
-            tables = list_tables_from_schema(
+            tables = list_tables_cached(
                 workspace_client,
                 catalog=UNITY_CATALOG,
-                schema=UNITY_SCHEMA
+                schema=UNITY_SCHEMA,
+                refresh=refresh
             )
-            return tables
+            
+            tables, labels, by_value = get_table_search_index(tables)
+            
+            if search_value:
+                search_lower = search_value.lower()
+                options = []
+                for label, table in zip(labels, tables):
+                    if search_lower in label:
+                        options.append(table)
+                        if len(options) == MAX_TABLE_OPTIONS:
+                            break
+            else:
+                options = tables[:MAX_TABLE_OPTIONS]
+            
+            # Dash clears the selection if its option disappears from the list
+            selected_option = by_value.get(selected_table) if selected_table else None
+            if selected_option is not None and selected_option not in options:
+                options.append(selected_option)
+            
+            return options
         except Exception as e:
             print(f"Error populating table dropdown: {e}")
             return []
     
     
     @callback(
-        Output('uc-table-columns-display', 'children'),
+        [Output('uc-table-columns-display', 'children'),
+         Output('uc-columns-cache', 'data')],
         Input('uc-table-dropdown', 'value'),
         prevent_initial_call=True
     )
     def display_table_columns(selected_table):
         """Display columns for the selected Unity Catalog table with descriptions"""
         if not selected_table:
-            return ""
+            return "", None
         
         try:
-            columns, sql_query, table_comment, is_metric_view = get_table_columns(workspace_client, selected_table)
+            columns, sql_query, table_comment, is_metric_view = get_table_columns_cached(workspace_client, selected_table)
             
             if not columns:
-                return dbc.Alert("⚠️ Could not retrieve columns from this table", color="warning")
+                return dbc.Alert("⚠️ Could not retrieve columns from this table", color="warning"), None
+            
+            # Keep the columns for confirm_uc_table_selection so confirming doesn't fetch them again
+            columns_cache = {'table': selected_table, 'columns': columns, 'is_metric_view': is_metric_view}
             
             # Add metric view indicator if applicable
             if is_metric_view:
                 print(f"📊 Metric View detected: {selected_table}")
                 metric_view_badge = dbc.Badge("Metric View", color="primary", className="ms-2")
             
-            # Store columns data in a dcc.Store for filtering
+            # Store columns data in a dcc.Store - the column cards are rendered (and filtered)
+            # from it in the browser by render_column_cards
             columns_store = dcc.Store(id='uc-columns-store', data=columns)
             
-            # Create column cards for display
-            column_cards = []
-            for col in columns:
-                # Determine badge color based on measure vs dimension
-                if col.get('is_measure', False):
-                    type_badge = dbc.Badge("MEASURE", color="warning", className="ms-2", style={'fontSize': '11px'})
-                else:
-                    type_badge = dbc.Badge(col['type'], color="info", className="ms-2", style={'fontSize': '11px'})
-                
-                column_cards.append(
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.Div([
-                                html.Strong(col['name'], style={'fontSize': '14px'}),
-                                type_badge
-                            ], className="mb-2"),
-                            html.P(col['comment'], style={'fontSize': '12px', 'color': '#6C757D', 'marginBottom': '0'})
-                        ], style={'padding': '10px'})
-                    ], className="mb-2", style={'border': '1px solid #dee2e6'})
-                )
-            
             return dbc.Row([
                 dbc.Col([
                     dbc.Card([
@@ -310,7 +583,6 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
                             # Columns Display (scrollable)
                             html.Div(
                                 id='filtered-columns-display',
-                                children=column_cards,
                                 style={'maxHeight': '400px', 'overflowY': 'auto', 'paddingRight': '10px'}
                             ),
                             
@@ -332,70 +604,75 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
                 
                 # Hidden store for columns data
                 columns_store
-            ])
+            ]), columns_cache
             
         except Exception as e:
             print(f"Error displaying columns: {e}")
-            return dbc.Alert(f"❌ Error: {str(e)}", color="danger")
+            return dbc.Alert(f"❌ Error: {str(e)}", color="danger"), None
     
     
-    @callback(
+    # Column cards are built in the browser from uc-columns-store, so neither the initial
+    # render nor each search keystroke sends a component tree per column over the wire
+    app.clientside_callback(
+        """
+        function(searchText, columns) {
+            if (!columns) {
+                return [[], ""];
+            }
+            var search = (searchText || "").toLowerCase();
+            var shown = search ? columns.filter(function(col) {
+                return col.name.toLowerCase().indexOf(search) !== -1;
+            }) : columns;
+            var cards = shown.map(function(col) {
+                var badge = {
+                    namespace: "dash_bootstrap_components", type: "Badge",
+                    props: {
+                        children: col.is_measure ? "MEASURE" : col.type,
+                        color: col.is_measure ? "warning" : "info",
+                        className: "ms-2", style: {fontSize: "11px"}
+                    }
+                };
+                return {
+                    namespace: "dash_bootstrap_components", type: "Card",
+                    props: {className: "mb-2", style: {border: "1px solid #dee2e6"}, children: {
+                        namespace: "dash_bootstrap_components", type: "CardBody",
+                        props: {style: {padding: "10px"}, children: [
+                            {namespace: "dash_html_components", type: "Div", props: {className: "mb-2", children: [
+                                {namespace: "dash_html_components", type: "Strong", props: {children: col.name, style: {fontSize: "14px"}}},
+                                badge
+                            ]}},
+                            {namespace: "dash_html_components", type: "P", props: {
+                                children: col.comment,
+                                style: {fontSize: "12px", color: "#6C757D", marginBottom: "0"}
+                            }}
+                        ]}
+                    }}
+                };
+            });
+            // Show count if filtered
+            var countText = search ? "(showing " + shown.length + " of " + columns.length + ")" : "";
+            return [cards, countText];
+        }
+        """,
         [Output('filtered-columns-display', 'children'),
          Output('filtered-column-count', 'children')],
         [Input('column-search-input', 'value'),
-         Input('uc-columns-store', 'data')],
-        prevent_initial_call=True
+         Input('uc-columns-store', 'data')]
     )
-    def filter_columns_by_search(search_text, columns_data):
-        """Filter columns based on search input"""
-        if not columns_data:
-            return [], ""
-        
-        # If no search text, show all columns
-        if not search_text:
-            filtered_columns = columns_data
-        else:
-            # Filter columns by name (case-insensitive)
-            search_lower = search_text.lower()
-            filtered_columns = [
-                col for col in columns_data 
-                if search_lower in col['name'].lower()
-            ]
-        
-        # Create column cards for filtered results
-        column_cards = []
-        for col in filtered_columns:
-            # Determine badge color based on measure vs dimension
-            if col.get('is_measure', False):
-                type_badge = dbc.Badge("MEASURE", color="warning", className="ms-2", style={'fontSize': '11px'})
-            else:
-                type_badge = dbc.Badge(col['type'], color="info", className="ms-2", style={'fontSize': '11px'})
-            
-            column_cards.append(
-                dbc.Card([
-                    dbc.CardBody([
-                        html.Div([
-                            html.Strong(col['name'], style={'fontSize': '14px'}),
-                            type_badge
-                        ], className="mb-2"),
-                        html.P(col['comment'], style={'fontSize': '12px', 'color': '#6C757D', 'marginBottom': '0'})
-                    ], style={'padding': '10px'})
-                ], className="mb-2", style={'border': '1px solid #dee2e6'})
-            )
-        
-        # Show count if filtered
-        count_text = f"(showing {len(filtered_columns)} of {len(columns_data)})" if search_text else ""
-        
-        return column_cards, count_text
     
     
     @callback(
         [Output('extracted-columns', 'data', allow_duplicate=True),
          Output('extracted-columns-types', 'data', allow_duplicate=True),
          Output('uc-dataset-store', 'data'),
-         Output('ai-dashboard-generator-section', 'children', allow_duplicate=True)],
+         Output('ai-dashboard-generator-section', 'children', allow_duplicate=True),
+         Output('ai-dashboard-generator-panel', 'style'),
+         Output('ai-selected-table-name', 'children'),
+         Output('ai-columns-count', 'children'),
+         Output('ai-columns-badges', 'children')],
         Input('uc-table-confirm-btn', 'n_clicks'),
-        State('uc-table-dropdown', 'value'),
+        [State('uc-table-dropdown', 'value'),
+         State('uc-columns-cache', 'data')],
         prevent_initial_call=True,
         running=[
             (Output('ai-dashboard-generator-section', 'children'), 
@@ -408,22 +685,63 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
              "")
         ]
     )
-    def confirm_uc_table_selection(n_clicks, selected_table):
+    def confirm_uc_table_selection(n_clicks, selected_table, columns_cache):
         """
         Confirm UC table selection and proceed to AI dashboard generation
         """
         if not n_clicks or not selected_table:
-            return no_update, no_update, no_update, no_update
+            return no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update
         
         try:
             from utils import create_dataset_from_table
             
-            # Get columns with types, comments, and metric view info
-            columns_info, sql_query, table_comment, is_metric_view = get_table_columns(workspace_client, selected_table)
+            # Columns, permission test and dataset creation are independent round-trips -
+            # run them concurrently so confirming waits for the slowest one, not their sum
+            cached_columns = columns_cache if columns_cache and columns_cache.get('table') == selected_table else None
+            with permission_passed_at_lock:
+                passed_at = permission_passed_at.get(selected_table)
+            permission_recent = passed_at is not None and time.monotonic() - passed_at < PERMISSION_TTL_SECONDS
+            
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix='uc-confirm') as confirm_executor:
+                columns_future = None
+                if not cached_columns:
+                    # Get columns with types, comments, and metric view info
+                    columns_future = confirm_executor.submit(get_table_columns_cached, workspace_client, selected_table)
+                
+                # TEST QUERY PERMISSIONS: Test if user has access to the table (failures are never cached)
+                permission_future = None
+                if permission_recent:
+                    print(f"⚡ Permission check passed recently for table: {selected_table} - skipping test query")
+                else:
+                    print(f"🔒 Testing permissions for table: {selected_table}")
+                    test_query = f"SELECT * FROM {selected_table} LIMIT 1"
+                    permission_future = confirm_executor.submit(
+                        test_dashboard_queries_for_permissions,
+                        [{'name': selected_table, 'query': test_query}],
+                        workspace_client,
+                        warehouse_id
+                    )
+                
+                # Create dataset from UC table
+                dataset_future = confirm_executor.submit(create_dataset_from_table, workspace_client, selected_table)
+                
+                if cached_columns:
+                    # Reuse the columns display_table_columns already fetched for this table
+                    columns_info = cached_columns.get('columns')
+                    is_metric_view = cached_columns.get('is_metric_view', False)
+                else:
+                    columns_info, sql_query, table_comment, is_metric_view = columns_future.result()
+                
+                if permission_future is not None:
+                    permission_check_success, permission_error_alert = permission_future.result()
+                else:
+                    permission_check_success, permission_error_alert = True, None
+                
+                dataset = dataset_future.result()
             
             if not columns_info:
                 error_alert = dbc.Alert("❌ Could not retrieve columns from table", color="danger")
-                return no_update, no_update, no_update, error_alert
+                return no_update, no_update, no_update, error_alert, {'display': 'none'}, no_update, no_update, no_update
             
             # Log metric view info
             if is_metric_view:
@@ -431,165 +749,37 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
                 dimension_count = len(columns_info) - measure_count
                 print(f"📊 Metric View: {measure_count} measures, {dimension_count} dimensions")
             
-            # TEST QUERY PERMISSIONS: Test if user has access to the table
-            print(f"🔒 Testing permissions for table: {selected_table}")
-            test_query = f"SELECT * FROM {selected_table} LIMIT 1"
-            
-            permission_check_success, permission_error_alert = test_dashboard_queries_for_permissions(
-                [{'name': selected_table, 'query': test_query}],
-                workspace_client,
-                warehouse_id
-            )
-            
             if not permission_check_success:
                 # Permission check failed - return error
                 print(f"❌ Permission check failed for table: {selected_table}")
-                return no_update, no_update, no_update, permission_error_alert
+                return no_update, no_update, no_update, permission_error_alert, {'display': 'none'}, no_update, no_update, no_update
             
-            print(f"✅ Permission check passed for table: {selected_table}")
+            if not permission_recent:
+                now = time.monotonic()
+                with permission_passed_at_lock:
+                    # Drop passes that have expired so the map only holds tables confirmed recently
+                    for stale_table in [key for key, passed_at in permission_passed_at.items() if now - passed_at >= PERMISSION_TTL_SECONDS]:
+                        del permission_passed_at[stale_table]
+                    permission_passed_at[selected_table] = now
+                print(f"✅ Permission check passed for table: {selected_table}")
             
             # Extract column names and types
             column_names = [col['name'] for col in columns_info]
             columns_with_types = columns_info  # Store full column info with types
             
-            # Create dataset from UC table
-            dataset = create_dataset_from_table(workspace_client, selected_table)
-            
-            # Create AI dashboard generator section
-            ai_section = dbc.Card([
-                dbc.CardHeader(html.H4("AI-Powered Dashboard Generator")),
-                dbc.CardBody([
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Alert([
-                                html.Strong("Table loaded successfully!"),
-                                html.Br(),
-                                html.Small(f"Table: {selected_table}"),
-                                html.Br(),
-                                html.Small(f"Columns detected: {len(column_names)}")
-                            ], color="success", className="mb-3")
-                        ], width=8)  # Changed from 6 to 8 to match prompt textarea width
-                    ]),
-                    
-                    # Design Infusion Section
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Card([
-                                dbc.CardBody([
-                                    dbc.Row([
-                                        dbc.Col([
-                                            html.H6("Design Infusion (Optional)", className="mb-0"),
-                                            html.Small("Extract colors and fonts from an image or describe your style", className="text-muted")
-                                        ], width=8),
-                                        dbc.Col([
-                                            dbc.Button("Design Options", id="infusion-toggle-btn", color="info", size="sm", outline=True, className="float-end")
-                                        ], width=4)
-                                    ]),
-                                    dbc.Collapse([
-                                        # Options Side by Side
-                                        dbc.Row([
-                                            # Option 1: Upload Image
-                                            dbc.Col([
-                                                html.Label("Option 1: Upload an Image", className="fw-bold mb-2"),
-                                                html.P("Upload a picture and the AI will extract colors and fonts from it.", className="text-muted small mb-2"),
-                                                dcc.Upload(
-                                                    id='infusion-image-upload',
-                                                    children=html.Div([
-                                                        'Drag and Drop or ',
-                                                        html.A('Select Image', style={'cursor': 'pointer', 'textDecoration': 'underline'})
-                                                    ]),
-                                                    style={
-                                                        'width': '100%',
-                                                        'height': '100px',
-                                                        'lineHeight': '100px',
-                                                        'borderWidth': '2px',
-                                                        'borderStyle': 'dashed',
-                                                        'borderRadius': '10px',
-                                                        'textAlign': 'center',
-                                                        'cursor': 'pointer',
-                                                        'backgroundColor': '#f8f9fa'
-                                                    },
-                                                    multiple=False
-                                                ),
-                                                dcc.Loading(
-                                                    id="infusion-loading",
-                                                    type="default",
-                                                    children=html.Div(id='infusion-result', className="mt-2")
-                                                )
-                                            ], width=6),
-                                            
-                                            # Option 2: Text Prompt
-                                            dbc.Col([
-                                                html.Label("Option 2: Describe Your Style", className="fw-bold mb-2"),
-                                                html.P("Describe the style you want (e.g., 'Modern minimalist').", className="text-muted small mb-2"),
-                                                dbc.Textarea(
-                                                    id='pre-generation-infusion-prompt',
-                                                    placeholder="Example: Modern and impactful style...",
-                                                    style={'width': '100%', 'minHeight': '80px'},
-                                                    className="mb-2"
-                                                ),
-                                                dbc.Button("Generate Design from Prompt", id="pre-generation-design-from-prompt-btn", color="primary", size="sm"),
-                                                dcc.Loading(
-                                                    id="pre-generation-infusion-loading",
-                                                    type="default",
-                                                    children=html.Div(id='pre-generation-infusion-result', className="mt-2")
-                                                )
-                                            ], width=6)
-                                        ])
-                                    ], id="infusion-collapse", is_open=False, className="mt-3")
-                                ])
-                            ], className="mb-3", style={'backgroundColor': '#f8f9fa'})
-                        ], width=8)
-                    ]),
-                    
-                    dbc.Row([
-                        dbc.Col([
-                            html.Label("Describe your dashboard needs:", className="fw-bold mb-2"),
-                            html.P(
-                                "",
-                                className="text-muted small mb-3"
-                            ),
-                            dcc.Textarea(
-                                id='ai-dashboard-prompt',
-                                placeholder='Example: "Create a dashboard showing key metrics and trends for this data"',
-                                style={'width': '100%', 'height': '100px'},
-                                className="mb-3"
-                            )
-                        ], width=8)
-                    ]),
-                    
-                    # Display available columns with types
-                    html.Details([
-                        html.Summary("Available Columns & Types", style={'cursor': 'pointer', 'fontWeight': 'bold'}),
-                        html.Div([
-                            html.Div([
-                                dbc.Badge(f"{col['name']}: {col['type']}", color="light", text_color="dark", className="me-2 mb-2")
-                                for col in columns_info
-                            ], className="mt-2")
-                        ])
-                    ], className="mb-3"),
-                    
-                    html.Div([
-                        dbc.Button(
-                            "Generate Dashboard",
-                            id="generate-ai-dashboard-btn",
-                            color="success",
-                            size="md",
-                            className="mt-3"
-                        )
-                    ], className="text-center")
-                    # Note: ai-generation-status, progress, reasoning, widgets are now in the initial layout
-                ])
-            ], className="mb-4")
+            # The generator panel is static layout - only fill in the table-specific parts
+            column_badges = list(_build_badges(
+                selected_table,
+                tuple((col['name'], col['type']) for col in columns_info)
+            ))
             
-            return column_names, columns_with_types, dataset, ai_section
+            return column_names, columns_with_types, dataset, "", {'display': 'block'}, selected_table, len(column_names), column_badges
             
         except Exception as e:
             print(f"Error confirming UC table: {e}")
-            import traceback
             traceback.print_exc()
             error_alert = dbc.Alert(f"❌ Error: {str(e)}", color="danger")
-            return no_update, no_update, no_update, error_alert
+            return no_update, no_update, no_update, error_alert, {'display': 'none'}, no_update, no_update, no_update
     
     # ============================================================================
     # DATASET AND COLUMN EXTRACTION CALLBACKS
@@ -644,34 +834,36 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
         
         # Create unique session ID
         session_id = str(uuid.uuid4())
+        sweep_abandoned_generations()
         
         # Initialize progress store immediately
-        ai_progress_store[session_id] = {
-            'status': 'initializing',
-            'steps': ['🚀 Initializing AI dashboard generation...'],
-            'reasoning': '',
-            'widget_details': []
-        }
+        ai_progress_store[session_id] = GenState(
+            status='initializing',
+            steps=['🚀 Initializing AI dashboard generation...']
+        )
         
-        # Start background thread
-        thread = threading.Thread(
-            target=generate_dashboard_background,
-            args=(
-                session_id,
-                prompt,
-                all_columns,
-                columns_types,
-                dataset_value,
-                dataset,
-                llm_client,
-                dashboard_manager,
-                ai_progress_store,
-                ai_results_store,
-                infusion_data
-            ),
-            daemon=True
+        # Run the generation on the shared pool
+        generation_started_at[session_id] = time.monotonic()
+        generation_futures[session_id] = generation_executor.submit(
+            generate_dashboard_background,
+            session_id,
+            prompt,
+            all_columns,
+            columns_types,
+            dataset_value,
+            dataset,
+            llm_client,
+            dashboard_manager,
+            ai_progress_store,
+            ai_results_store,
+            infusion_data
         )
-        thread.start()
+        
+        def expire_finished_session(_future, session_id=session_id):
+            ai_progress_store.expire(session_id, FINISHED_SESSION_TTL_SECONDS)
+            ai_results_store.expire(session_id, FINISHED_SESSION_TTL_SECONDS)
+        
+        generation_futures[session_id].add_done_callback(expire_finished_session)
         
         # Show initial progress
         initial_progress = dbc.Card([
@@ -681,164 +873,264 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
             ])
         ], className="mb-2")
         
-        # Enable the interval to start polling
-        return session_id, False, "", initial_progress, "", ""
+        # Progress is pushed over the SSE stream below; the interval stays off unless
+        # the browser has to fall back to polling (or to pick up the final results)
+        return session_id, True, "", initial_progress, "", ""
+    
+    
+    # ============================================================================
+    # AI GENERATION PROGRESS STREAM (Server-Sent Events)
+    # ============================================================================
+    
+    # Seconds between keep-alive comments on an idle stream (lets a closed tab end the stream)
+    PROGRESS_KEEPALIVE_SECONDS = 10
+    
+    @app.server.route(f"{app.config.routes_pathname_prefix}ai/progress/<session_id>")
+    def stream_ai_generation_progress(session_id):
+        """
+        Push progress deltas for one generation session as text/event-stream
+        
+        Each message carries the new version plus only what changed since the previous
+        message (new steps, new widget details, reasoning once it arrives). A final
+        'done' event tells the browser to fetch the results through the poll callback.
+        """
+        def events():
+            sent_state = None
+            sent_version = None
+            sent_totals = {'steps': 0, 'widget_details': 0}
+            sent_reasoning = ''
+            idle_seconds = 0.0
+            
+            while True:
+                state = ai_progress_store.get(session_id)
+                started_at = generation_started_at.get(session_id)
+                if state is None or started_at is None or time.monotonic() - started_at >= GENERATION_TIMEOUT_SECONDS:
+                    break
+                
+                touch_session(session_id)
+                
+                # The generator replaces the initializing entry once it starts - resend everything
+                if state is not sent_state:
+                    sent_state, sent_version, sent_reasoning = state, None, ''
+                
+                snapshot = state.wait_for_change(sent_version, timeout=0.5)
+                if snapshot is None:
+                    idle_seconds += 0.5
+                    if idle_seconds >= PROGRESS_KEEPALIVE_SECONDS:
+                        idle_seconds = 0.0
+                        yield ": keep-alive\n\n"
+                    continue
+                idle_seconds = 0.0
+                
+                if snapshot['status'] in ('completed', 'error'):
+                    break
+                
+                delta = {'version': snapshot['version']}
+                
+                # Lists are capped server-side, so send a full reset when the new items no
+                # longer line up with what the browser has (first message, or items dropped)
+                for key in ('steps', 'widget_details'):
+                    items = snapshot[key]
+                    new_count = snapshot[f'{key}_total'] - sent_totals[key]
+                    if sent_version is None or new_count > len(items):
+                        delta[f'{key}_reset'] = True
+                        delta[key] = items
+                    else:
+                        delta[key] = items[len(items) - new_count:]
+                    delta[f'{key}_total'] = sent_totals[key] = snapshot[f'{key}_total']
+                
+                if snapshot['reasoning'] != sent_reasoning:
+                    delta['reasoning'] = snapshot['reasoning']
+                
+                sent_version = snapshot['version']
+                sent_reasoning = snapshot['reasoning']
+                
+                yield f"data: {app.server.json.dumps(delta)}\n\n"
+            
+            yield "event: done\ndata: {}\n\n"
+        
+        return Response(
+            events(),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
+    
+    # Subscribe to the stream for each new session: deltas are folded into ai-progress-snapshot
+    # (rendered clientside); on 'done' or a stream error the interval is switched on so the poll
+    # callback picks up the results / keeps polling
+    app.clientside_callback(
+        """
+        function(sessionId) {
+            var dc = window.dash_clientside;
+            if (window._aiProgressSource) {
+                window._aiProgressSource.close();
+                window._aiProgressSource = null;
+            }
+            if (!sessionId) {
+                return dc.no_update;
+            }
+            if (typeof EventSource === 'undefined') {
+                return false;
+            }
+            var source = new EventSource('""" + app.config.requests_pathname_prefix + """ai/progress/' + encodeURIComponent(sessionId));
+            var snapshot = {status: 'running', steps: [], reasoning: ''};
+            var finish = function() {
+                source.close();
+                if (window._aiProgressSource === source) {
+                    window._aiProgressSource = null;
+                    dc.set_props('ai-progress-interval', {disabled: false});
+                }
+            };
+            source.onmessage = function(event) {
+                var delta = JSON.parse(event.data);
+                var steps = delta.steps_reset ? delta.steps : snapshot.steps.concat(delta.steps);
+                snapshot = {
+                    status: 'running',
+                    steps: steps.slice(-""" + str(MAX_PROGRESS_STEPS) + """),
+                    reasoning: delta.reasoning !== undefined ? delta.reasoning : snapshot.reasoning
+                };
+                dc.set_props('ai-progress-snapshot', {data: snapshot});
+                if (delta.widget_details_reset || delta.widget_details.length) {
+                    dc.set_props('ai-widget-delta', {data: {
+                        session: sessionId,
+                        total: delta.widget_details_total,
+                        items: delta.widget_details,
+                        reset: !!delta.widget_details_reset
+                    }});
+                }
+                dc.set_props('ai-last-update', {data: delta.version});
+            };
+            source.addEventListener('done', finish);
+            source.onerror = finish;
+            window._aiProgressSource = source;
+            return dc.no_update;
+        }
+        """,
+        Output('ai-progress-interval', 'disabled', allow_duplicate=True),
+        Input('ai-generation-session', 'data'),
+        prevent_initial_call=True
+    )
+    
+    
+    # Adaptive polling: 500ms while progress keeps changing, doubling up to 5s once the
+    # version in ai-last-update has been unchanged for 5 ticks, back to 500ms on change.
+    # The interval has no max_intervals cap (n_intervals keeps counting across generations);
+    # it is stopped through 'disabled' by the poll, the snapshot watcher and the server timeout
+    app.clientside_callback(
+        """
+        function(nIntervals, sessionId, version, backoff) {
+            var fastMs = 500;
+            if (!backoff || backoff.session !== sessionId || backoff.version !== version) {
+                var interval = (backoff && backoff.interval !== fastMs) ? fastMs : window.dash_clientside.no_update;
+                return [interval, {session: sessionId, version: version, idle: 0, interval: fastMs}];
+            }
+            var idle = backoff.idle + 1;
+            var nextMs = idle >= 5 ? Math.min(fastMs * Math.pow(2, idle - 4), 5000) : fastMs;
+            return [
+                nextMs !== backoff.interval ? nextMs : window.dash_clientside.no_update,
+                {session: sessionId, version: version, idle: idle, interval: nextMs}
+            ];
+        }
+        """,
+        [Output('ai-progress-interval', 'interval'),
+         Output('ai-poll-backoff', 'data')],
+        [Input('ai-progress-interval', 'n_intervals'),
+         Input('ai-generation-session', 'data')],
+        [State('ai-last-update', 'data'),
+         State('ai-poll-backoff', 'data')],
+        prevent_initial_call=True
+    )
     
     
+    # Canonical poll responses, built once: POLL_SKIP leaves every output alone and
+    # POLL_KEEP_POLLING only keeps the interval enabled (ai-last-update is read as State
+    # only, so leaving it untouched is the same as writing back the value it already holds)
+    POLL_SKIP = (no_update,) * 10
+    POLL_KEEP_POLLING = (no_update,) * 4 + (False,) + (no_update,) * 5
+    POLL_STOP = (no_update,) * 4 + (True,) + (no_update,) * 5
+    
     @callback(
         [Output('ai-generation-status', 'children'),
-         Output('ai-generation-progress', 'children'),
-         Output('ai-generation-reasoning', 'children'),
-         Output('ai-generation-widgets', 'children'),
+         Output('ai-progress-snapshot', 'data'),
          Output('dashboard-preview', 'children', allow_duplicate=True),
          Output('deployed-dashboard-id', 'data', allow_duplicate=True),
          Output('ai-progress-interval', 'disabled', allow_duplicate=True),
          Output('ai-last-update', 'data'),
          Output('current-dashboard-config', 'data'),
-         Output('current-dashboard-name', 'data')],
+         Output('current-dashboard-name', 'data'),
+         Output('ai-widget-delta', 'data'),
+         Output('ai-steps-cursor', 'data')],
         Input('ai-progress-interval', 'n_intervals'),
         [State('ai-generation-session', 'data'),
          State('ai-last-update', 'data'),
-         State('ai-generation-reasoning', 'children'),
-         State('ai-generation-widgets', 'children'),
+         State('ai-widget-delta', 'data'),
+         State('ai-steps-cursor', 'data'),
          State('active-page', 'data')],
         prevent_initial_call=True
     )
-    def poll_ai_generation_progress(n_intervals, session_id, last_update, current_reasoning, current_widgets, active_page):
-        """Poll for AI generation progress and update UI"""
+    def poll_ai_generation_progress(n_intervals, session_id, last_update, last_widget_delta, steps_cursor, active_page):
+        """Poll for AI generation progress and publish it to ai-progress-snapshot (rendered clientside)"""
         try:
             print(f"🔄 Poll callback fired (interval #{n_intervals}), session: {session_id}, active_page: {active_page}")
             
             # If we're not on the new dashboard page, don't update anything
             if active_page != 'new-dashboard':
                 print(f"   ⏭️ Skipping poll - not on new dashboard page")
-                return no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update
-            
-            # Check for timeout (max_intervals reached)
-            if n_intervals and n_intervals >= 300:
-                print(f"   ⏰ Timeout reached")
-                error = dbc.Alert("⚠️ Dashboard generation timed out after 2.5 minutes", color="warning")
-                return error, "", no_update, no_update, "", None, True, None, None, None
+                return POLL_SKIP
             
             # Validate session
             if not session_id:
                 print(f"   ⚠️ No session ID")
-                return "", "", no_update, no_update, no_update, no_update, True, None, None, None
+                return "", {'status': 'idle'}, no_update, no_update, True, None, None, None, no_update, None
+            
+            # Check for timeout
+            started_at = generation_started_at.get(session_id)
+            if started_at is not None and time.monotonic() - started_at >= GENERATION_TIMEOUT_SECONDS:
+                print(f"   ⏰ Timeout reached")
+                forget_generation(session_id)
+                error = dbc.Alert("⚠️ Dashboard generation timed out after 2.5 minutes", color="warning")
+                return error, {'status': 'error'}, "", None, True, None, None, None, no_update, None
             
             # Check if session exists (might not be initialized yet)
-            if session_id not in ai_progress_store:
+            progress_state = ai_progress_store.get(session_id)
+            if progress_state is None:
+                # A session that already reported progress (last_update set) and is gone from
+                # both stores was cleaned up or expired - nothing will ever show up, stop polling
+                if last_update is not None and session_id not in ai_results_store:
+                    print(f"   🛑 Session {session_id} no longer in the stores - stopping poll")
+                    return POLL_STOP
                 # Session not ready yet OR already completed and cleaned up
                 print(f"   ⏭️ Session not in progress store - returning no_update (session might be completed)")
-                return no_update, no_update, no_update, no_update, no_update, no_update, False, last_update, no_update, no_update
-            
-            progress_data = ai_progress_store.get(session_id, {})
-            status_value = progress_data.get('status', 'running')
+                return POLL_KEEP_POLLING
             
-            # Create a hash of current progress to check if anything changed
-            current_hash = hash(str(progress_data.get('steps', [])) + str(progress_data.get('reasoning', '')) + str(progress_data.get('widget_details', [])))
+            touch_session(session_id)
+            status_value = progress_state.status
             
-            # If nothing changed, don't update UI
-            if last_update == current_hash and status_value == 'running':
-                return no_update, no_update, no_update, no_update, no_update, no_update, False, last_update, no_update, no_update
+            # The generation task finished without marking the session completed or errored
+            future = generation_futures.get(session_id)
+            if future is not None and future.done() and status_value not in ('completed', 'error'):
+                error = future.exception() or "no result was recorded"
+                print(f"❌ Dashboard generation for session {session_id} ended unexpectedly: {error}")
+                finalize_session(session_id)
+                error_alert = dbc.Alert(f"❌ Dashboard generation stopped unexpectedly: {error}", color="danger")
+                return error_alert, {'status': 'error'}, "", None, True, None, None, None, no_update, None
             
-            # Build progress display
-            progress_steps = progress_data.get('steps', [])
-            reasoning = progress_data.get('reasoning', '')
-            widget_details = progress_data.get('widget_details', [])
+            # If nothing changed, don't update UI (the generator bumps the version on every progress write)
+            if last_update == progress_state.version and status_value == 'running':
+                return POLL_KEEP_POLLING
             
-            # Create progress display (only steps with spinner - no reasoning/widgets)
-            progress_elements = []
-            for idx, step in enumerate(progress_steps):
-                progress_elements.append(
-                    html.Div(
-                        step, 
-                        style={
-                            "marginBottom": "8px", 
-                            "fontSize": "14px",
-                            "opacity": "1"
-                        }
-                    )
-                )
+            # Consistent copy taken under the session's lock
+            progress_data = progress_state.snapshot(include_widget_details=False)
+            status_value = progress_data['status']
+            current_version = progress_data['version']
             
-            progress_container = dbc.Card([
-                dbc.CardHeader([
-                    dbc.Spinner(size="sm", color="primary", spinner_class_name="me-2"),
-                    html.Strong("Generating Dashboard...", style={"fontSize": "15px"})
-                ]),
-                dbc.CardBody(progress_elements, style={"maxHeight": "300px", "overflowY": "auto"})
-            ], className="mb-2")
-            
-            # Handle reasoning display (only update if new reasoning available)
-            reasoning_output = no_update
-            if reasoning and (not current_reasoning or not isinstance(current_reasoning, dict)):
-                # Parse reasoning into sections for better readability
-                # Look for numbered patterns like (1), (2), (3), (4) or sentences
-                import re
-                
-                # Try to split by numbered sections
-                sections = re.split(r'\(\d+\)', reasoning)
-                
-                if len(sections) > 1:
-                    # Found numbered sections - format each as a bullet point
-                    reasoning_elements = []
-                    for i, section in enumerate(sections[1:], 1):  # Skip first empty element
-                        section_text = section.strip()
-                        if section_text:
-                            reasoning_elements.append(
-                                html.Div([
-                                    html.Strong(f"• ", style={"color": "#2272B4"}),
-                                    html.Span(section_text)
-                                ], style={"fontSize": "13px", "color": "#555", "marginBottom": "12px", "lineHeight": "1.6"})
-                            )
-                else:
-                    # No numbered sections - split by sentences and format as bullet points
-                    sentences = reasoning.split('. ')
-                    reasoning_elements = []
-                    for sentence in sentences:
-                        sentence_text = sentence.strip()
-                        if sentence_text:
-                            if not sentence_text.endswith('.'):
-                                sentence_text += '.'
-                            reasoning_elements.append(
-                                html.Div([
-                                    html.Strong(f"• ", style={"color": "#2272B4"}),
-                                    html.Span(sentence_text)
-                                ], style={"fontSize": "13px", "color": "#555", "marginBottom": "12px", "lineHeight": "1.6"})
-                            )
-                
-                reasoning_output = dbc.Card([
-                    dbc.CardHeader(html.Strong("AI Reasoning", style={"fontSize": "15px"})),
-                    dbc.CardBody(reasoning_elements if reasoning_elements else [
-                        html.P(reasoning, style={"fontSize": "13px", "color": "#555", "margin": "0", "lineHeight": "1.6"})
-                    ])
-                ], className="mb-2", style={"marginTop": "10px"})
+            # Everything the progress/reasoning renderers need, as plain data (patched with
+            # just the new steps once the browser holds this session's snapshot)
+            snapshot, new_steps_cursor = build_snapshot_update(session_id, progress_data, steps_cursor)
             
-            # Handle widget details display (append-style)
-            widgets_output = no_update
-            if widget_details:
-                # Check if we have new widget details to append
-                current_count = 0
-                if current_widgets and isinstance(current_widgets, dict) and current_widgets.get('children'):
-                    try:
-                        # Get count of existing items
-                        card_body = current_widgets['children'][1] if len(current_widgets['children']) > 1 else {}
-                        ul = card_body.get('props', {}).get('children', [{}])[0]
-                        if isinstance(ul, dict) and ul.get('props', {}).get('children'):
-                            current_count = len(ul['props']['children'])
-                    except:
-                        current_count = 0
-                
-                # Only update if we have new items
-                if len(widget_details) > current_count:
-                    widgets_output = dbc.Card([
-                        dbc.CardHeader(html.Strong("Widget Selection Rationale", style={"fontSize": "15px"})),
-                        dbc.CardBody([
-                            html.Ul([
-                                html.Li(detail, style={"fontSize": "13px", "lineHeight": "1.6"}) 
-                                for detail in widget_details
-                            ], style={"marginBottom": "0"})
-                        ])
-                    ], className="mb-2", style={"marginTop": "10px"})
+            # Widget rationales are appended clientside - only send the ones the browser hasn't seen
+            widget_delta = build_widget_delta(session_id, progress_state, last_widget_delta)
             
             # Check if completed or errored
             if status_value == 'completed':
@@ -849,7 +1141,7 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
                 if not results or not results.get('preview'):
                     print(f"⚠️ Warning: Completed but results incomplete. Session: {session_id}, Results: {results.keys() if results else 'None'}")
                     # Don't delete stores yet - keep polling to allow more time
-                    return no_update, no_update, no_update, no_update, no_update, no_update, False, last_update, no_update, no_update
+                    return POLL_KEEP_POLLING
                 
                 print(f"✅ Dashboard generation completed successfully. Session: {session_id}, Dashboard ID: {results.get('dashboard_id')}")
                 
@@ -865,18 +1157,15 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
                     # DON'T clean up stores immediately - keep them for a few more polls
                     # Mark a "cleanup time" to delete later (prevents race condition)
                     import time as time_module
-                    if 'cleanup_time' not in ai_progress_store[session_id]:
-                        ai_progress_store[session_id]['cleanup_time'] = time_module.time() + 2  # Keep for 2 more seconds
+                    if progress_state.cleanup_time is None:
+                        progress_state.cleanup_time = time_module.time() + 2  # Keep for 2 more seconds
                         print(f"⏰ Scheduled cleanup for session {session_id} in 2 seconds")
                     
                     # Only clean up if enough time has passed
-                    cleanup_time = ai_progress_store[session_id].get('cleanup_time', 0)
+                    cleanup_time = progress_state.cleanup_time
                     if time_module.time() >= cleanup_time:
                         print(f"🧹 Cleanup time reached, deleting stores for session {session_id}")
-                        if session_id in ai_progress_store:
-                            del ai_progress_store[session_id]
-                        if session_id in ai_results_store:
-                            del ai_results_store[session_id]
+                        finalize_session(session_id)
                     else:
                         print(f"⏳ Cleanup delayed, keeping stores for {cleanup_time - time_module.time():.1f}s more")
                     
@@ -884,52 +1173,204 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
                     
                     return_values = (
                         results.get('status', ""),  # ai-generation-status
-                        "",  # ai-generation-progress
-                        no_update,  # ai-generation-reasoning
-                        no_update,  # ai-generation-widgets
+                        {'status': 'completed'},  # ai-progress-snapshot (clears the progress card)
                         preview,  # dashboard-preview
                         dashboard_id,  # deployed-dashboard-id
                         True,  # ai-progress-interval (disabled)
                         None,  # ai-last-update
-                        dashboard_config,  # current-dashboard-config
-                        dashboard_name  # current-dashboard-name
+                        store_dashboard_config(dashboard_id, dashboard_config) if dashboard_config else None,  # current-dashboard-config
+                        dashboard_name,  # current-dashboard-name
+                        no_update,  # ai-widget-delta
+                        None  # ai-steps-cursor
                     )
                     
                     print(f"✅ Successfully prepared return values, returning to Dash...")
                     print(f"   📊 Return values summary:")
                     print(f"      - Status: {type(return_values[0]).__name__}")
-                    print(f"      - Progress: Empty string")
-                    print(f"      - Preview: {type(return_values[4]).__name__}")
-                    print(f"      - Dashboard ID: {return_values[5]}")
-                    print(f"      - Interval disabled: {return_values[6]}")
+                    print(f"      - Snapshot: {return_values[1]}")
+                    print(f"      - Preview: {type(return_values[2]).__name__}")
+                    print(f"      - Dashboard ID: {return_values[3]}")
+                    print(f"      - Interval disabled: {return_values[4]}")
                     return return_values
                     
                 except Exception as return_error:
                     print(f"❌ Error preparing return values: {return_error}")
-                    import traceback
                     traceback.print_exc()
                     # Return error state
-                    return dbc.Alert(f"Error displaying results: {str(return_error)}", color="danger"), "", no_update, no_update, "", None, True, None, None, None
+                    return dbc.Alert(f"Error displaying results: {str(return_error)}", color="danger"), {'status': 'error'}, "", None, True, None, None, None, no_update, None
             
             elif status_value == 'error':
                 # Get error message and disable polling
                 results = ai_results_store.get(session_id, {})
                 # Clean up stores
-                if session_id in ai_progress_store:
-                    del ai_progress_store[session_id]
-                if session_id in ai_results_store:
-                    del ai_results_store[session_id]
-                return results.get('status', ""), "", no_update, no_update, "", None, True, None, None, None
+                finalize_session(session_id)
+                return results.get('status', ""), {'status': 'error'}, "", None, True, None, None, None, no_update, None
             
             # Still running - show progress and keep polling
-            return "", progress_container, reasoning_output, widgets_output, no_update, no_update, False, current_hash, no_update, no_update
+            return "", snapshot, no_update, no_update, False, current_version, no_update, no_update, widget_delta, new_steps_cursor
         
         except Exception as e:
             # Log error but don't crash - keep polling
             print(f"Error in poll callback: {e}")
-            import traceback
             traceback.print_exc()
-            return no_update, no_update, no_update, no_update, no_update, no_update, False, last_update, no_update, no_update
+            return POLL_KEEP_POLLING
+    
+    
+    # Stop the poll interval in the browser as soon as the snapshot reports a finished
+    # (or abandoned) generation, without waiting on another server round-trip
+    app.clientside_callback(
+        """
+        function(snapshot, sessionId) {
+            if (!sessionId || (snapshot && snapshot.status !== 'running')) {
+                return true;
+            }
+            return window.dash_clientside.no_update;
+        }
+        """,
+        Output('ai-progress-interval', 'disabled', allow_duplicate=True),
+        Input('ai-progress-snapshot', 'data'),
+        State('ai-generation-session', 'data'),
+        prevent_initial_call=True
+    )
+    
+    
+    # Progress, reasoning and widget rationale are rendered in the browser from
+    # ai-progress-snapshot, so each poll tick writes one store instead of three component trees
+    app.clientside_callback(
+        """
+        function(snapshot) {
+            if (!snapshot) {
+                return window.dash_clientside.no_update;
+            }
+            if (snapshot.status !== 'running') {
+                return "";
+            }
+            var steps = (snapshot.steps || []).map(function(step) {
+                return {namespace: "dash_html_components", type: "Div", props: {
+                    children: step, style: {marginBottom: "8px", fontSize: "14px", opacity: "1"}
+                }};
+            });
+            return {namespace: "dash_bootstrap_components", type: "Card", props: {className: "mb-2", children: [
+                {namespace: "dash_bootstrap_components", type: "CardHeader", props: {children: [
+                    {namespace: "dash_bootstrap_components", type: "Spinner", props: {size: "sm", color: "primary", spinner_class_name: "me-2"}},
+                    {namespace: "dash_html_components", type: "Strong", props: {children: "Generating Dashboard...", style: {fontSize: "15px"}}}
+                ]}},
+                {namespace: "dash_bootstrap_components", type: "CardBody", props: {
+                    children: steps, style: {maxHeight: "300px", overflowY: "auto"}
+                }}
+            ]}};
+        }
+        """,
+        Output('ai-generation-progress', 'children', allow_duplicate=True),
+        Input('ai-progress-snapshot', 'data'),
+        prevent_initial_call=True
+    )
+    
+    
+    app.clientside_callback(
+        """
+        function(snapshot) {
+            var reasoning = (snapshot && snapshot.reasoning) || '';
+            // The reasoning is written once per generation but every snapshot carries it -
+            // only rebuild the card when the text changes (a new session starts out empty)
+            if (reasoning === window._aiRenderedReasoning) {
+                return window.dash_clientside.no_update;
+            }
+            window._aiRenderedReasoning = reasoning;
+            if (!reasoning) {
+                return window.dash_clientside.no_update;
+            }
+            // Split on numbered sections like (1), (2) ... or fall back to sentences
+            var sections = reasoning.split(/\\(\\d+\\)/);
+            var items = [];
+            if (sections.length > 1) {
+                sections.slice(1).forEach(function(section) {
+                    var text = section.trim();
+                    if (text) { items.push(text); }
+                });
+            } else {
+                reasoning.split('. ').forEach(function(sentence) {
+                    var text = sentence.trim();
+                    if (text) { items.push(text.endsWith('.') ? text : text + '.'); }
+                });
+            }
+            var bullets = items.map(function(text) {
+                return {namespace: "dash_html_components", type: "Div", props: {
+                    style: {fontSize: "13px", color: "#555", marginBottom: "12px", lineHeight: "1.6"},
+                    children: [
+                        {namespace: "dash_html_components", type: "Strong", props: {children: "• ", style: {color: "#2272B4"}}},
+                        {namespace: "dash_html_components", type: "Span", props: {children: text}}
+                    ]
+                }};
+            });
+            if (!bullets.length) {
+                bullets = [{namespace: "dash_html_components", type: "P", props: {
+                    children: reasoning, style: {fontSize: "13px", color: "#555", margin: "0", lineHeight: "1.6"}
+                }}];
+            }
+            return {namespace: "dash_bootstrap_components", type: "Card", props: {
+                className: "mb-2", style: {marginTop: "10px"}, children: [
+                    {namespace: "dash_bootstrap_components", type: "CardHeader", props: {children:
+                        {namespace: "dash_html_components", type: "Strong", props: {children: "AI Reasoning", style: {fontSize: "15px"}}}
+                    }},
+                    {namespace: "dash_bootstrap_components", type: "CardBody", props: {children: bullets}}
+                ]
+            }};
+        }
+        """,
+        Output('ai-generation-reasoning', 'children', allow_duplicate=True),
+        Input('ai-progress-snapshot', 'data'),
+        prevent_initial_call=True
+    )
+    
+    
+    # Widget rationales arrive as deltas (ai-widget-delta) and are appended to the rendered
+    # list, so each new rationale adds one <li> instead of re-sending and re-diffing the list
+    app.clientside_callback(
+        """
+        (function() {
+            // Static parts of the rationale card, created once when the callback is registered;
+            // the styles are shared by every rendered item, so they are frozen against mutation
+            var LI_STYLE = Object.freeze({fontSize: "13px", lineHeight: "1.6"});
+            var UL_STYLE = Object.freeze({marginBottom: "0"});
+            var CARD_STYLE = Object.freeze({marginTop: "10px"});
+            var WIDGET_HEADER = {namespace: "dash_bootstrap_components", type: "CardHeader", props: {children:
+                {namespace: "dash_html_components", type: "Strong", props: {children: "Widget Selection Rationale", style: {fontSize: "15px"}}}
+            }};
+            function makeLi(detail) {
+                return {namespace: "dash_html_components", type: "Li", props: {children: detail, style: LI_STYLE}};
+            }
+            
+            return function(delta, current) {
+                if (!delta || (!delta.reset && !delta.items.length)) {
+                    return window.dash_clientside.no_update;
+                }
+                if (!delta.items.length) {
+                    return "";
+                }
+                var items = delta.items.map(makeLi);
+                // Card > [CardHeader, CardBody > Ul > [Li...]] as built below
+                var body = current && current.props && current.props.children && current.props.children[1];
+                var list = body && body.props && body.props.children;
+                if (!delta.reset && list && Array.isArray(list.props.children)) {
+                    items = list.props.children.concat(items).slice(-""" + str(MAX_WIDGET_DETAILS) + """);
+                }
+                return {namespace: "dash_bootstrap_components", type: "Card", props: {
+                    className: "mb-2", style: CARD_STYLE, children: [
+                        WIDGET_HEADER,
+                        {namespace: "dash_bootstrap_components", type: "CardBody", props: {children:
+                            {namespace: "dash_html_components", type: "Ul", props: {children: items, style: UL_STYLE}}
+                        }}
+                    ]
+                }};
+            };
+        })()
+        """,
+        Output('ai-generation-widgets', 'children', allow_duplicate=True),
+        Input('ai-widget-delta', 'data'),
+        State('ai-generation-widgets', 'children'),
+        prevent_initial_call=True
+    )
     
     
     @callback(
@@ -938,13 +1379,16 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
         Input('deploy-btn', 'n_clicks'),
         [State('dashboard-config', 'data'),
          State('deploy-dashboard-name', 'value')],
-        prevent_initial_call=True
+        prevent_initial_call=True,
+        # The create call blocks for a few seconds - keep the button disabled meanwhile so
+        # repeated clicks don't queue up duplicate deployments
+        running=[(Output('deploy-btn', 'disabled'), True, False)]
     )
     def deploy_dashboard(n_clicks, config, dashboard_name):
         if not n_clicks or n_clicks == 0:
             return "", None
         if not config or not dashboard_name:
-            return dbc.Alert("Missing configuration or name", color="warning"), None
+            return _MISSING_CONFIG_ALERT, None
         
         try:
             # Create dashboard in Databricks
@@ -969,12 +1413,7 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
                 dbc.CardBody([
                     html.Iframe(
                         src=embed_url,
-                        style={
-                            'width': '100%',
-                            'height': '800px',
-                            'border': '1px solid #ddd',
-                            'borderRadius': '5px'
-                        }
+                        style=_IFRAME_STYLE
                     )
                 ])
             ])
@@ -1002,15 +1441,25 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
         """Callback to delete dashboard from Databricks (New Dashboard page)"""
         # If we're not on the new dashboard page, don't do anything
         if active_page != 'new-dashboard':
-            return no_update, no_update, no_update, no_update, no_update, no_update
+            raise PreventUpdate
         
         # Only proceed if button was actually clicked
-        if not n_clicks or n_clicks < 1:
-            from dash.exceptions import PreventUpdate
+        if not ctx.triggered_id or not n_clicks:
             raise PreventUpdate
         
         if not dashboard_id:
-            return dbc.Alert("No dashboard to delete", color="warning"), None, "", "", "", ""
+            # Nothing was deployed, so there is no generation output to clear - only send the alert
+            return _NO_DASHBOARD_ALERT, no_update, no_update, no_update, no_update, no_update
+        
+        # Debounce: check-and-set under the lock so two concurrent requests can't both pass
+        now = time.monotonic()
+        with last_delete_click_lock:
+            if now - last_delete_click.get(dashboard_id, float('-inf')) < DELETE_DEBOUNCE_SECONDS:
+                print(f"⏭️ Ignoring repeated delete click for dashboard {dashboard_id}")
+                raise PreventUpdate
+            for stale_id in [key for key, clicked_at in last_delete_click.items() if now - clicked_at >= DELETE_DEBOUNCE_SECONDS]:
+                del last_delete_click[stale_id]
+            last_delete_click[dashboard_id] = now
         
         # Delete dashboard from Databricks only (no Unity Catalog)
         success, message = dashboard_manager.delete_dashboard(
@@ -1086,10 +1535,12 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
          State('current-dashboard-name', 'data')],
         prevent_initial_call=True
     )
-    def toggle_new_dashboard_genie(genie_enabled, dashboard_id, dashboard_config, dashboard_name):
+    def toggle_new_dashboard_genie(genie_enabled, dashboard_id, config_ref, dashboard_name):
         """
         Toggle Genie Space enablement for newly generated dashboard and refresh display
         """
+        dashboard_config = get_cached_dashboard_config(config_ref)
+        
         try:
             print(f"🔘 Genie Space toggle callback triggered! Value: {genie_enabled}")
             print(f"   Dashboard ID: {dashboard_id}")
@@ -1152,11 +1603,10 @@ def register_new_dashboard_callbacks(app, datasets, llm_client, dashboard_manage
             }
             
             print(f"🎉 Genie Space toggle completed successfully, refreshing iframe")
-            return new_embed_url_with_refresh, updated_dashboard_config
+            return new_embed_url_with_refresh, store_dashboard_config(dashboard_id, updated_dashboard_config)
             
         except Exception as e:
             print(f"❌ Error toggling Genie Space: {e}")
-            import traceback
             traceback.print_exc()
             return no_update, no_update
     
\ No newline at end of file
@@ -7,14 +7,28 @@ This package contains utility functions for the dashboard application.
 from .query_permission_checker import test_dashboard_queries_for_permissions
 from .table_inspector import (
     list_tables_from_schema,
+    list_tables_cached,
     get_table_columns,
+    get_table_columns_cached,
+    clear_table_metadata_cache,
     create_dataset_from_table
 )
+from .dashboard_config_cache import (
+    store_dashboard_config,
+    get_cached_dashboard_config
+)
+from .session_store import SessionStore
 
 __all__ = [
     'test_dashboard_queries_for_permissions',
     'list_tables_from_schema',
+    'list_tables_cached',
     'get_table_columns',
-    'create_dataset_from_table'
+    'get_table_columns_cached',
+    'clear_table_metadata_cache',
+    'create_dataset_from_table',
+    'store_dashboard_config',
+    'get_cached_dashboard_config',
+    'SessionStore'
 ]
 
@@ -0,0 +1,67 @@
+"""
+Dashboard Config Cache Module
+
+Keeps full dashboard configurations server-side so the browser only has to hold
+a small reference ({'dashboard_id', 'version'}) in its dcc.Store. Large
+serialized dashboards are no longer sent client <-> server on every callback.
+"""
+
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+# Maximum number of dashboard config versions kept in memory (least recently used are evicted)
+MAX_CACHED_CONFIGS = 64
+
+_config_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+_cache_lock = threading.Lock()
+_version_counter = itertools.count(1)
+
+
+def store_dashboard_config(dashboard_id: str, dashboard_config: Dict) -> Dict:
+    """
+    Store a dashboard configuration server-side
+
+    Args:
+        dashboard_id: Dashboard ID the configuration belongs to
+        dashboard_config: Full dashboard configuration (serialized_dashboard, display_name, ...)
+
+    Returns:
+        Lightweight reference to put in a dcc.Store: {'dashboard_id': ..., 'version': ...}
+    """
+    version = next(_version_counter)
+
+    with _cache_lock:
+        _config_cache[(dashboard_id, version)] = dashboard_config
+        while len(_config_cache) > MAX_CACHED_CONFIGS:
+            _config_cache.popitem(last=False)
+
+    return {'dashboard_id': dashboard_id, 'version': version}
+
+
+def get_cached_dashboard_config(config_ref: Optional[Dict]) -> Optional[Dict]:
+    """
+    Resolve a reference returned by store_dashboard_config
+
+    Args:
+        config_ref: Reference read from a dcc.Store (may be None)
+
+    Returns:
+        Full dashboard configuration, or None if there is no reference or it was evicted
+    """
+    if not config_ref:
+        return None
+
+    key = (config_ref.get('dashboard_id'), config_ref.get('version'))
+
+    with _cache_lock:
+        dashboard_config = _config_cache.get(key)
+        if dashboard_config is not None:
+            _config_cache.move_to_end(key)
+
+    if dashboard_config is None:
+        print(f"⚠️ Dashboard config {key} not found in server-side cache (evicted or app restarted)")
+
+    return dashboard_config
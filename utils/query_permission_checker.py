@@ -173,7 +173,7 @@ def test_dashboard_queries_for_permissions(dashboard_queries, workspace_client,
                                 metadata = type_data.get('metadata', {})
                                 metric_view_type = metadata.get('metric_view.type', '')
                                 is_measure = (metric_view_type == 'measure')
-                            except:
+                            except (ValueError, TypeError, AttributeError):
                                 pass
                         
                         if is_measure and not first_measure:
@@ -0,0 +1,127 @@
+"""
+Session Store Module
+
+Bounded, thread-safe replacement for the plain dicts that track AI dashboard
+generation sessions (ai_progress_store / ai_results_store). Entries expire after
+a TTL and the least recently used ones are evicted once the store is full, so
+sessions whose browser went away before picking up the results don't pile up
+in the app process.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+# Maximum number of sessions kept per store (least recently used are evicted)
+MAX_SESSIONS = 256
+
+# Seconds a session entry lives after its last write
+SESSION_TTL_SECONDS = 1800
+
+_MISSING = object()
+
+
+class SessionStore:
+    """
+    Dict-like session_id -> value mapping with a size cap and per-entry expiry
+
+    Supports the operations the callbacks use on the old dicts: store[key] = value,
+    store[key], key in store, del store[key], get() and pop().
+    """
+
+    def __init__(self, maxsize: int = MAX_SESSIONS, ttl: float = SESSION_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, list]" = OrderedDict()  # key -> [expires_at, value]
+        self._lock = threading.Lock()
+
+    def _purge_expired_locked(self, now: float):
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def _live_entry_locked(self, key, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def __setitem__(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired_locked(now)
+            self._entries[key] = [now + self.ttl, value]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted_key, _ = self._entries.popitem(last=False)
+                print(f"🧹 Evicted session {evicted_key} from session store (store full)")
+
+    def __getitem__(self, key):
+        with self._lock:
+            entry = self._live_entry_locked(key, time.monotonic())
+        if entry is None:
+            raise KeyError(key)
+        return entry[1]
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._live_entry_locked(key, time.monotonic()) is not None
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge_expired_locked(time.monotonic())
+            return len(self._entries)
+
+    def get(self, key, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._live_entry_locked(key, time.monotonic())
+        return default if entry is None else entry[1]
+
+    def pop(self, key, default: Any = _MISSING) -> Any:
+        with self._lock:
+            entry = self._live_entry_locked(key, time.monotonic())
+            if entry is not None:
+                del self._entries[key]
+        if entry is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return entry[1]
+
+    def touch(self, key, lease: float):
+        """
+        Renew an entry's lease on behalf of a live reader (poll / progress stream)
+
+        Args:
+            key: Session ID
+            lease: Seconds from now the entry stays alive without another touch
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live_entry_locked(key, now)
+            if entry is not None:
+                entry[0] = now + lease
+
+    def expire(self, key, delay: float):
+        """
+        Shorten an entry's lifetime (e.g. once its generation has finished)
+
+        Args:
+            key: Session ID
+            delay: Seconds from now after which the entry is dropped
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live_entry_locked(key, now)
+            if entry is not None:
+                entry[0] = min(entry[0], now + delay)
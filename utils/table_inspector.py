@@ -4,8 +4,93 @@ Table Inspector Module
 Provides utilities to inspect Unity Catalog tables and extract their metadata.
 """
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from databricks.sdk import WorkspaceClient
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Tuple
+
+
+# Metadata lookups in flight, keyed by what they fetch. Concurrent sessions asking for the
+# same table list or table columns wait on one Unity Catalog call instead of each issuing it.
+_METADATA_TIMEOUT_SECONDS = 30
+_METADATA_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='uc-metadata')
+_inflight: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _discard_inflight(key: tuple, future: Future) -> None:
+    """Done-callback: forget a finished lookup (unless a newer one already replaced it)"""
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def _get_or_submit(key: tuple, fn: Callable, *args):
+    """
+    Run fn(*args) on the metadata pool, or join the identical lookup already in flight
+    
+    Args:
+        key: Identifies the lookup (e.g. ('columns', full_table_name))
+        fn: Metadata function to call
+        *args: Positional arguments for fn
+        
+    Returns:
+        Whatever fn returns (raises TimeoutError after _METADATA_TIMEOUT_SECONDS)
+    """
+    submitted = False
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _METADATA_EXECUTOR.submit(fn, *args)
+            _inflight[key] = future
+            submitted = True
+    
+    # Registered outside the lock: it runs immediately if the lookup already finished
+    if submitted:
+        future.add_done_callback(lambda done: _discard_inflight(key, done))
+    
+    return future.result(timeout=_METADATA_TIMEOUT_SECONDS)
+
+
+# list_tables_from_schema results per (catalog, schema). The table list rarely changes, so
+# page loads within _TABLES_TTL_SECONDS reuse it instead of another metastore round-trip.
+# At most _TABLES_CACHE_SIZE schemas are kept (least recently used evicted first).
+_TABLES_TTL_SECONDS = 60.0
+_TABLES_CACHE_SIZE = 16
+_tables_cache: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict[str, str]]]]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+# get_table_columns results per table. Inspecting a table and then confirming it (which also
+# builds the dataset) reads the same columns up to three times within a few seconds.
+# At most _COLUMNS_CACHE_SIZE tables are kept (least recently used evicted first).
+_COLUMNS_TTL_SECONDS = 300.0
+_COLUMNS_CACHE_SIZE = 128
+_columns_cache: "OrderedDict[str, Tuple[float, tuple]]" = OrderedDict()
+_columns_lock = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict, lock: threading.Lock, key, ttl_seconds: float):
+    """Fresh cached value for key (None if missing or expired; expired entries are dropped)"""
+    with lock:
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= ttl_seconds:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return cached[1]
+
+
+def _cache_put(cache: OrderedDict, lock: threading.Lock, key, value, max_size: int) -> None:
+    """Store value under key, evicting the least recently used entries beyond max_size"""
+    with lock:
+        cache[key] = (time.monotonic(), value)
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
 
 
 def list_tables_from_schema(workspace_client: WorkspaceClient, catalog: str, schema: str) -> List[Dict[str, str]]:
@@ -50,6 +135,68 @@ def list_tables_from_schema(workspace_client: WorkspaceClient, catalog: str, sch
         return []
 
 
+def list_tables_cached(workspace_client: WorkspaceClient, catalog: str, schema: str, refresh: bool = False) -> List[Dict[str, str]]:
+    """
+    List tables from a Unity Catalog schema, reusing a recent listing of the same schema
+    
+    Args:
+        workspace_client: Databricks workspace client
+        catalog: Catalog name
+        schema: Schema name
+        refresh: Ignore the cached listing and query Unity Catalog again
+        
+    Returns:
+        List of dropdown options, as returned by list_tables_from_schema
+    """
+    key = (catalog, schema)
+    
+    if not refresh:
+        cached = _cache_get(_tables_cache, _tables_lock, key, _TABLES_TTL_SECONDS)
+        if cached is not None:
+            return cached
+    
+    # Concurrent page loads wait for one metastore call
+    tables = _get_or_submit(('tables', catalog, schema), list_tables_from_schema, workspace_client, catalog, schema)
+    
+    # An empty list is also what a failed listing returns - don't keep it
+    if tables:
+        _cache_put(_tables_cache, _tables_lock, key, tables, _TABLES_CACHE_SIZE)
+    
+    return tables
+
+
+def get_table_columns_cached(workspace_client: WorkspaceClient, full_table_name: str) -> Tuple[List[Dict[str, str]], str, str, bool]:
+    """
+    get_table_columns, reusing a recent result or joining an identical lookup already in flight
+    
+    Args:
+        workspace_client: Databricks workspace client
+        full_table_name: Full table name in format 'catalog.schema.table'
+        
+    Returns:
+        Same tuple as get_table_columns
+    """
+    cached = _cache_get(_columns_cache, _columns_lock, full_table_name, _COLUMNS_TTL_SECONDS)
+    if cached is not None:
+        return cached
+    
+    result = _get_or_submit(('columns', full_table_name), get_table_columns, workspace_client, full_table_name)
+    
+    # Failed lookups come back with no columns - don't keep them
+    if result[0]:
+        _cache_put(_columns_cache, _columns_lock, full_table_name, result, _COLUMNS_CACHE_SIZE)
+    
+    return result
+
+
+def clear_table_metadata_cache() -> None:
+    """Drop cached table listings and column lookups so the next calls query Unity Catalog"""
+    with _tables_lock:
+        _tables_cache.clear()
+    with _columns_lock:
+        _columns_cache.clear()
+
+
 def get_table_columns(workspace_client: WorkspaceClient, full_table_name: str) -> Tuple[List[Dict[str, str]], str, str, bool]:
     """
     Get column information for a Unity Catalog table
@@ -98,7 +245,7 @@ def get_table_columns(workspace_client: WorkspaceClient, full_table_name: str) -
                             print(f"   📏 Measure column detected: {col.name}")
                         elif metric_view_type == 'dimension':
                             print(f"   📐 Dimension column: {col.name}")
-                    except:
+                    except (ValueError, TypeError, AttributeError):
                         pass
                 
                 columns.append({
@@ -133,7 +280,7 @@ def create_dataset_from_table(workspace_client: WorkspaceClient, full_table_name
         Dataset configuration dictionary matching Databricks dashboard format
     """
     try:
-        columns_info, sql_query, table_comment, is_metric_view = get_table_columns(workspace_client, full_table_name)
+        columns_info, sql_query, table_comment, is_metric_view = get_table_columns_cached(workspace_client, full_table_name)
         
         if not columns_info:
             return None
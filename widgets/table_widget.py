@@ -189,12 +189,32 @@ Return ONLY the JSON array, no explanations."""
                     "content": prompt
                 }
             ],
-            max_tokens=2000
+            max_tokens=2000,
+            stream=True
         )
         
-        llm_response = response.choices[0].message.content
+        # Stream the reply and stop reading as soon as a complete JSON array has arrived,
+        # instead of waiting for whatever the model appends after it
+        llm_response = ""
+        try:
+            for chunk in response:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                text = chunk.choices[0].delta.content
+                llm_response += text
+                if ']' not in text:
+                    continue
+                start_idx = llm_response.find('[')
+                if start_idx < 0:
+                    continue
+                try:
+                    return json.loads(llm_response[start_idx:llm_response.rfind(']') + 1])
+                except json.JSONDecodeError:
+                    continue  # A ']' inside the array (e.g. in a column name) - keep reading
+        finally:
+            response.close()
         
-        # Extract JSON array from response
+        # Extract JSON array from the full response
         start_idx = llm_response.find('[')
         end_idx = llm_response.rfind(']') + 1
         